@@ -0,0 +1,92 @@
+"""
+Compare how long the asyncio event loop is blocked while a large CSV is read
+by a CSVReader called directly from a coroutine, and by an AsyncCSVReader.
+A heartbeat task records the longest delay between its wake ups.
+
+Usage: python benchmarks/bench_async_read.py [num_rows] [chunk_size]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Coroutine, List, Tuple
+
+from csvio import AsyncCSVReader, CSVReader
+
+
+def write_sample_csv(path: str, num_rows: int) -> None:
+
+    with open(path, "w") as fh:
+
+        fh.write("id,name,value\n")
+
+        for r in range(num_rows):
+            fh.write(f'{r},"name {r}",{r * 7 % 1000}\n')
+
+
+async def heartbeat(delays: List[float], interval: float = 0.001) -> None:
+
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        delays.append(time.perf_counter() - start - interval)
+
+
+async def measure(
+    read: Callable[[], Coroutine[Any, Any, int]]
+) -> Tuple[int, float, float]:
+
+    delays: List[float] = []
+    task = asyncio.ensure_future(heartbeat(delays))
+    await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    num_rows = await read()
+    elapsed = time.perf_counter() - start
+
+    task.cancel()
+
+    return num_rows, elapsed, max(delays, default=elapsed)
+
+
+def main() -> None:
+
+    num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+
+        path = os.path.join(tmp_dir, "bench.csv")
+        write_sample_csv(path, num_rows)
+
+        async def read_blocking() -> int:
+            return CSVReader(path).num_rows
+
+        async def read_async() -> int:
+
+            count = 0
+
+            async for chunk in AsyncCSVReader(
+                path, chunk_size=chunk_size
+            ).iter_chunks():
+                count += len(chunk)
+
+            return count
+
+        print(f"rows={num_rows} chunk_size={chunk_size}")
+
+        for name, read in (
+            ("CSVReader", read_blocking),
+            ("AsyncCSVReader", read_async),
+        ):
+            count, elapsed, max_delay = asyncio.run(measure(read))
+            assert count == num_rows
+            print(
+                f"  {name + ':':<16}{elapsed:8.3f}s total, "
+                f"loop blocked up to {max_delay * 1000:8.2f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
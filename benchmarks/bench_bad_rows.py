@@ -0,0 +1,66 @@
+"""
+Compare the time taken to read a large CSV with the default handling of
+records that cannot be tokenized, and with each on_bad_row policy, on a CSV
+without bad records and on one where every 1000th record has an unbalanced
+quote.
+
+Usage: python benchmarks/bench_bad_rows.py [num_rows]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from csvio import CSVReader
+
+
+def write_sample_csv(path: str, num_rows: int, bad_every: int = 0) -> None:
+
+    with open(path, "w") as fh:
+
+        fh.write("id,name,value\n")
+
+        for r in range(num_rows):
+
+            if bad_every and r % bad_every == bad_every - 1:
+                fh.write(f'{r},"name {r}\n')
+            else:
+                fh.write(f'{r},"name {r}",{r * 7 % 1000}\n')
+
+
+def main() -> None:
+
+    num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    csv_kwargs = {"strict": True}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+
+        clean = os.path.join(tmp_dir, "clean.csv")
+        bad = os.path.join(tmp_dir, "bad.csv")
+
+        write_sample_csv(clean, num_rows)
+        write_sample_csv(bad, num_rows, 1000)
+
+        print(f"rows={num_rows}")
+
+        for title, path in (("clean", clean), ("bad every 1000", bad)):
+
+            print(title)
+
+            for policy in (None, "skip", "quarantine"):
+
+                start = time.perf_counter()
+                reader = CSVReader(
+                    path, csv_kwargs=csv_kwargs, on_bad_row=policy
+                )
+                elapsed = time.perf_counter() - start
+
+                rejected = reader.bad_rows and reader.bad_rows.error_count
+                print(
+                    f"  {str(policy) + ':':<12}{elapsed:8.3f}s, "
+                    f"{reader.num_rows} rows, {rejected or 0} rejected"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Compare the time taken by CSVReader to read a gzip, bz2 and xz compressed
+CSV by decompressing it on the fly, and by decompressing it to a temporary
+file first.
+
+Usage: python benchmarks/bench_compressed_read.py [num_rows]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from csvio import CSVReader, CSVWriter
+from csvio.utils.compression import compression_from_magic, open_file
+
+
+def main() -> None:
+
+    num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    fieldnames = ["id", "status", "name", "amount"]
+    rows = [
+        {"id": r, "status": f"s{r % 20}", "name": f"n{r}", "amount": r % 997}
+        for r in range(num_rows)
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+
+        print(f"rows={num_rows}")
+
+        for ext in ("gz", "bz2", "xz"):
+
+            path = os.path.join(tmp_dir, f"bench.csv.{ext}")
+
+            writer = CSVWriter(path, fieldnames=fieldnames)
+            writer.add_rows(rows)
+            writer.flush()
+
+            start = time.perf_counter()
+            CSVReader(path)
+            streamed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            plain_path = os.path.join(tmp_dir, "plain.csv")
+
+            with open_file(path, "r", compression_from_magic(path)) as src:
+                with open(plain_path, "w") as dst:
+                    shutil.copyfileobj(src, dst)
+
+            CSVReader(plain_path)
+            decompressed = time.perf_counter() - start
+
+            print(
+                f"  {ext + ':':<5}streamed {streamed:6.3f}s  "
+                f"decompressed to disk {decompressed:6.3f}s  "
+                f"size {os.path.getsize(path) / 1e6:5.1f}MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
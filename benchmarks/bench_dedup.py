@@ -0,0 +1,98 @@
+"""
+Compare the time taken and the memory kept to deduplicate the rows of a
+large CSV by collecting the tuples of their values in a set, and with
+CSVReader(dedup=...) in exact and Bloom filter modes.
+
+Usage: python benchmarks/bench_dedup.py [num_rows]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Tuple
+
+from csvio import CSVReader
+from csvio.dedup import Deduplicator
+
+
+def write_sample_csv(path: str, num_rows: int) -> None:
+
+    with open(path, "w") as fh:
+
+        fh.write("id,name,value\n")
+
+        # Every fourth row repeats an earlier one.
+        for r in range(num_rows):
+            k = r if r % 4 else r // 2
+            fh.write(f'{k},"name {k}",{k * 7 % 1000}\n')
+
+
+def dedup_with_set(path: str) -> int:
+
+    seen = set()
+    count = 0
+
+    for row in CSVReader(path, lazy=True).iter_rows():
+
+        key = tuple(row.values())
+
+        if key not in seen:
+            seen.add(key)
+            count += 1
+
+    return count
+
+
+def dedup_with_reader(path: str, dedup: Deduplicator) -> int:
+
+    return sum(1 for _ in CSVReader(path, lazy=True, dedup=dedup).iter_rows())
+
+
+def measure(func: Callable[[], Any]) -> Tuple[float, float, Any]:
+
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, peak / (1 << 20), result
+
+
+def main() -> None:
+
+    num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+
+        path = os.path.join(tmp_dir, "bench.csv")
+        write_sample_csv(path, num_rows)
+
+        print(f"rows={num_rows}")
+
+        for name, func in (
+            ("set of tuples", lambda: dedup_with_set(path)),
+            (
+                "dedup exact",
+                lambda: dedup_with_reader(path, Deduplicator()),
+            ),
+            (
+                "dedup bloom",
+                lambda: dedup_with_reader(
+                    path, Deduplicator(mode="bloom", capacity=num_rows)
+                ),
+            ),
+        ):
+            elapsed, peak, count = measure(func)
+            print(
+                f"  {name + ':':<16}{elapsed:8.3f}s, peak {peak:8.1f} MiB, "
+                f"{count} unique rows"
+            )
+
+
+if __name__ == "__main__":
+    main()
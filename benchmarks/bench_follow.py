@@ -0,0 +1,58 @@
+"""
+Compare the time taken to pick up rows appended to a large CSV by
+constructing a new CSVReader, and by calling refresh on a reader constructed
+with follow=True.
+
+Usage: python benchmarks/bench_follow.py [num_rows] [num_appended]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from csvio import CSVReader
+
+
+def append_rows(path: str, start: int, num_rows: int) -> None:
+
+    with open(path, "a") as fh:
+
+        for r in range(start, start + num_rows):
+            fh.write(f'{r},"name {r}",{r * 7 % 1000}\n')
+
+
+def main() -> None:
+
+    num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    num_appended = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+
+        path = os.path.join(tmp_dir, "bench.csv")
+
+        with open(path, "w") as fh:
+            fh.write("id,name,amount\n")
+
+        append_rows(path, 0, num_rows)
+
+        follower = CSVReader(path, follow=True)
+        append_rows(path, num_rows, num_appended)
+
+        began = time.perf_counter()
+        reread = CSVReader(path)
+        rebuilt = time.perf_counter() - began
+
+        began = time.perf_counter()
+        appended = follower.refresh()
+        refreshed = time.perf_counter() - began
+
+        assert len(appended) == num_appended
+        assert follower.num_rows == reread.num_rows
+
+        print(f"rows={num_rows} appended={num_appended}")
+        print(f"new reader: {rebuilt * 1000:8.1f}ms")
+        print(f"refresh:    {refreshed * 1000:8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Compare the time taken and the peak memory used to count and sum the rows
+of each group of a CSV, by collecting the rows of each group with
+rows_from_column_key, and with group_by().agg() on a reader constructed with
+lazy=True, holding all the groups in memory and spilling them.
+
+Usage: python benchmarks/bench_group_by.py [num_rows] [num_groups]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, List
+
+from csvio import CSVReader
+
+
+def write_sample_csv(path: str, num_rows: int, num_groups: int) -> None:
+
+    with open(path, "w") as fh:
+
+        fh.write("id,group,amount,note\n")
+
+        for r in range(num_rows):
+            fh.write(f'{r},g{r * 7919 % num_groups},{r % 100},"note {r}"\n')
+
+
+def measure(name: str, aggregate: Callable[[], List[object]]) -> None:
+
+    start = time.perf_counter()
+    groups = aggregate()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    aggregate()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"  {name + ':':<30}{elapsed:8.3f}s  peak "
+        f"{peak / 1024 / 1024:8.1f} MiB  groups={len(groups)}"
+    )
+
+
+def main() -> None:
+
+    num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    num_groups = int(sys.argv[2]) if len(sys.argv) > 2 else 50_000
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+
+        path = os.path.join(tmp_dir, "bench.csv")
+        write_sample_csv(path, num_rows, num_groups)
+
+        print(f"rows={num_rows} groups={num_groups}")
+
+        def collected() -> List[object]:
+            return [
+                (group, len(rows), sum(int(row["amount"]) for row in rows))
+                for group, rows in CSVReader(path)
+                .rows_from_column_key("group")
+                .items()
+            ]
+
+        def streamed(max_groups: int) -> Callable[[], List[object]]:
+            return lambda: list(
+                CSVReader(path, lazy=True)
+                .group_by("group", max_groups=max_groups, tmp_dir=tmp_dir)
+                .agg(count=True, sum="amount")
+            )
+
+        measure("rows_from_column_key", collected)
+        measure("group_by().agg()", streamed(num_groups))
+        measure("group_by().agg() spilled", streamed(num_groups // 10))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Compare the time taken to look up the rows of a CSV by the value of a column
+with repeated calls to rows_from_column_key, and with a hash index created
+once with create_index, and to find the rows whose values are in a range with
+a scan of all the rows, and with a sorted index created once with
+create_sorted_index.
+
+Usage: python benchmarks/bench_index_lookup.py [num_rows] [num_lookups]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from csvio import CSVReader
+
+
+def write_sample_csv(path: str, num_rows: int) -> None:
+
+    with open(path, "w") as fh:
+
+        fh.write("id,status,amount\n")
+
+        for r in range(num_rows):
+            fh.write(f"{r},s{r % 50},{r * 7 % 1000}\n")
+
+
+def main() -> None:
+
+    num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    num_lookups = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+
+        path = os.path.join(tmp_dir, "bench.csv")
+        write_sample_csv(path, num_rows)
+
+        reader = CSVReader(path)
+        keys = [f"s{i % 50}" for i in range(num_lookups)]
+
+        start = time.perf_counter()
+
+        for key in keys:
+            reader.rows_from_column_key("status")[key]
+
+        scans = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index = reader.create_index("status")
+
+        for key in keys:
+            index[key]
+
+        indexed = time.perf_counter() - start
+
+        start = time.perf_counter()
+
+        for i in range(num_lookups):
+            low = i * 7 % 900
+            [
+                row
+                for row in reader.rows
+                if low <= int(row["amount"]) < low + 10
+            ]
+
+        range_scans = time.perf_counter() - start
+
+        start = time.perf_counter()
+        sorted_index = reader.create_sorted_index("amount", key=int)
+
+        for i in range(num_lookups):
+            low = i * 7 % 900
+            sorted_index.range(low, low + 10, include_high=False)
+
+        sorted_indexed = time.perf_counter() - start
+
+        print(f"rows={num_rows} lookups={num_lookups}")
+        print(f"rows_from_column_key: {scans:.3f}s")
+        print(f"create_index:         {indexed:.3f}s")
+        print(f"range scans:          {range_scans:.3f}s")
+        print(f"create_sorted_index:  {sorted_indexed:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Compare the time taken to read a directory of CSV shards with a CSVReader
+per shard, one after the other, and with MultiCSVReader using worker
+processes and threads.
+
+Usage: python benchmarks/bench_multi_read.py [num_shards] [rows_per_shard]
+"""
+import glob
+import os
+import sys
+import tempfile
+import time
+
+from csvio import CSVReader, MultiCSVReader
+
+
+def write_shards(directory: str, num_shards: int, rows_per_shard: int) -> None:
+
+    for shard in range(num_shards):
+
+        with open(os.path.join(directory, f"shard{shard:04}.csv"), "w") as fh:
+
+            fh.write("id,name,value\n")
+
+            for r in range(
+                shard * rows_per_shard, (shard + 1) * rows_per_shard
+            ):
+                fh.write(f'{r},"name {r}",{r * 7 % 1000}\n')
+
+
+def main() -> None:
+
+    num_shards = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rows_per_shard = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    workers = os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+
+        write_shards(tmp_dir, num_shards, rows_per_shard)
+
+        print(
+            f"shards={num_shards} rows_per_shard={rows_per_shard} "
+            f"workers={workers}"
+        )
+
+        def sequential() -> int:
+            return sum(
+                CSVReader(path).num_rows
+                for path in sorted(glob.glob(os.path.join(tmp_dir, "*.csv")))
+            )
+
+        for name, read in (
+            ("CSVReader per shard", sequential),
+            (
+                "MultiCSVReader processes",
+                lambda: sum(
+                    1 for _ in MultiCSVReader(tmp_dir, workers=workers)
+                ),
+            ),
+            (
+                "MultiCSVReader threads",
+                lambda: sum(
+                    1
+                    for _ in MultiCSVReader(
+                        tmp_dir, workers=workers, executor="thread"
+                    )
+                ),
+            ),
+        ):
+            start = time.perf_counter()
+            count = read()
+            elapsed = time.perf_counter() - start
+
+            assert count == num_shards * rows_per_shard
+            print(f"  {name + ':':<28}{elapsed:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Compare the best of three times taken to group the rows of a CSV in nested dictionaries by
+three columns with a chain of setdefault calls per row, as
+rows_to_nested_dicts used to, with rows_to_nested_dicts building the whole
+hierarchy or a lazy one, and with the rows grouped while they are read with
+CSVReader(index_columns=...), which also makes the later calls faster.
+
+Usage: python benchmarks/bench_nested_dicts.py [num_rows]
+"""
+import os
+import sys
+import tempfile
+import timeit
+from typing import Any, Callable, Dict, List
+
+from csvio import CSVReader
+from csvio.utils.types import RS
+
+COLUMNS = ["region", "store", "product"]
+
+
+def write_sample_csv(path: str, num_rows: int) -> None:
+
+    with open(path, "w") as fh:
+
+        fh.write("id,region,store,product,amount\n")
+
+        for r in range(num_rows):
+            fh.write(f"{r},r{r % 10},s{r % 200},p{r % 1000},{r % 97}\n")
+
+
+def setdefault_chains(rows: RS, column_order: List[str]) -> Dict[str, Any]:
+
+    ret_dict: Dict[str, Any] = {}
+
+    for row in rows:
+
+        temp_dict = ret_dict.setdefault(row[column_order[0]], {})
+
+        for column in column_order[1:-1]:
+            temp_dict = temp_dict.setdefault(row[column], {})
+
+        temp_dict.setdefault(row[column_order[-1]], []).append(row)
+
+    return ret_dict
+
+
+def measure(name: str, group: Callable[[], Any]) -> None:
+
+    elapsed = min(timeit.repeat(group, number=1, repeat=3))
+
+    print(f"  {name + ':':<34}{elapsed:8.3f}s")
+
+
+def main() -> None:
+
+    num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+
+        path = os.path.join(tmp_dir, "bench.csv")
+        write_sample_csv(path, num_rows)
+
+        reader = CSVReader(path)
+        indexed = CSVReader(path, index_columns=[COLUMNS])
+        expected = setdefault_chains(reader.rows, COLUMNS)
+
+        assert reader.rows_to_nested_dicts(COLUMNS) == expected
+        assert indexed.rows_to_nested_dicts(COLUMNS) == expected
+
+        print(f"rows={num_rows}")
+        print("grouping rows already read")
+
+        measure(
+            "setdefault chains",
+            lambda: setdefault_chains(reader.rows, COLUMNS),
+        )
+        measure(
+            "rows_to_nested_dicts",
+            lambda: reader.rows_to_nested_dicts(COLUMNS),
+        )
+        measure(
+            "rows_to_nested_dicts lazy, 1 leaf",
+            lambda: reader.rows_to_nested_dicts(COLUMNS, lazy=True)["r3"][
+                "s3"
+            ]["p3"],
+        )
+
+        measure(
+            "rows_to_nested_dicts, indexed",
+            lambda: indexed.rows_to_nested_dicts(COLUMNS),
+        )
+
+        print("reading and grouping rows")
+
+        measure(
+            "CSVReader + rows_to_nested_dicts",
+            lambda: CSVReader(path).rows_to_nested_dicts(COLUMNS),
+        )
+        measure(
+            "CSVReader(index_columns=...)",
+            lambda: CSVReader(
+                path, index_columns=[COLUMNS]
+            ).rows_to_nested_dicts(COLUMNS),
+        )
+
+
+if __name__ == "__main__":
+    main()
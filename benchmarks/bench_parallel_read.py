@@ -0,0 +1,89 @@
+"""
+Compare the time taken by CSVReader to read a large CSV with a single process
+and with multiple worker processes, without processors and with field
+processors applied to every field.
+
+Parsed rows are sent back from the worker processes to the reading process,
+and receiving them costs about as much as parsing them. The speedup is
+therefore close to linear in the number of cores only when the processors do
+significant work per row.
+
+Usage: python benchmarks/bench_parallel_read.py [num_rows] [max_workers]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from csvio import CSVReader
+from csvio.processors import FieldProcessor
+
+NUM_FIELDS = 20
+
+
+def write_sample_csv(path: str, num_rows: int) -> None:
+
+    with open(path, "w") as fh:
+
+        fh.write(",".join(f"f{i}" for i in range(NUM_FIELDS)) + "\n")
+
+        for r in range(num_rows):
+            fh.write(",".join(f"r{r}:v{i}" for i in range(NUM_FIELDS)))
+            fh.write(',"quoted\nvalue"\n' if r % 10 == 0 else "\n")
+
+
+def parse_value(value: str) -> float:
+
+    return sum(int(n) ** 0.5 for n in value[1:].split(":v"))
+
+
+def time_read(path: str, workers: int, processors: list) -> float:
+
+    reader = CSVReader(path, processors=processors, lazy=True, workers=workers)
+
+    start = time.perf_counter()
+    count = sum(1 for _ in reader.iter_rows())
+    elapsed = time.perf_counter() - start
+
+    print(f"workers={workers:<3} rows={count:<10} {elapsed:8.2f}s")
+
+    return elapsed
+
+
+def main() -> None:
+
+    num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    max_workers = (
+        int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+
+        path = os.path.join(tmp_dir, "bench.csv")
+        write_sample_csv(path, num_rows)
+
+        print(f"CSV size: {os.path.getsize(path) / 1e6:.1f} MB")
+
+        field_processor = FieldProcessor("bench")
+
+        for i in range(NUM_FIELDS):
+            field_processor.add_processor(f"f{i}", parse_value)
+
+        for title, processors in (
+            ("No processors", []),
+            ("Field processors", [field_processor]),
+        ):
+
+            print(title)
+
+            serial = time_read(path, 1, processors)
+            workers = 2
+
+            while workers <= max_workers:
+                elapsed = time_read(path, workers, processors)
+                print(f"{'':14}speedup: {serial / elapsed:.2f}x")
+                workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Compare the time and peak memory taken to compute statistics of the columns
+of a large CSV by loading its rows and making a pass per statistic, and with
+CSVReader.profile on a lazy reader.
+
+Usage: python benchmarks/bench_profile.py [num_rows]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Callable, Dict, Tuple
+
+from csvio import CSVReader
+
+SCHEMA = {"id": "int", "value": "float"}
+
+
+def write_sample_csv(path: str, num_rows: int) -> None:
+
+    with open(path, "w") as fh:
+
+        fh.write("id,name,value\n")
+
+        for r in range(num_rows):
+            fh.write(f'{r},"name {r % 5000}",{r * 7 % 1000 / 10}\n')
+
+
+def profile_loaded(path: str) -> Dict[str, Any]:
+
+    reader = CSVReader(path, schema=SCHEMA)
+    profile = {}
+
+    for column in reader.fieldnames:
+
+        values = [row[column] for row in reader.rows]
+        present = [v for v in values if v is not None and v != ""]
+        numbers = [v for v in present if isinstance(v, (int, float))]
+
+        profile[column] = (
+            values.count(None),
+            values.count(""),
+            min(present),
+            max(present),
+            statistics.mean(numbers) if numbers else None,
+            statistics.variance(numbers) if len(numbers) > 1 else None,
+            len(set(present)),
+            Counter(present).most_common(10),
+        )
+
+    return profile
+
+
+def measure(func: Callable[[], Any]) -> Tuple[float, float]:
+
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, peak / (1 << 20)
+
+
+def main() -> None:
+
+    num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+
+        path = os.path.join(tmp_dir, "bench.csv")
+        write_sample_csv(path, num_rows)
+
+        print(f"rows={num_rows}")
+
+        for name, func in (
+            ("loaded, one pass per statistic", lambda: profile_loaded(path)),
+            (
+                "CSVReader.profile",
+                lambda: CSVReader(path, lazy=True, schema=SCHEMA).profile(),
+            ),
+        ):
+            elapsed, peak = measure(func)
+            print(f"  {name + ':':<32}{elapsed:8.3f}s, peak {peak:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
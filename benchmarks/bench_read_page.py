@@ -0,0 +1,66 @@
+"""
+Compare the time taken to read a page of rows near the end of a CSV with and
+without an offset index, and to create the offset index.
+
+Usage: python benchmarks/bench_read_page.py [num_rows] [page_size]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from csvio import CSVReader
+
+
+def write_sample_csv(path: str, num_rows: int) -> None:
+
+    with open(path, "w") as fh:
+
+        fh.write("id,name,amount\n")
+
+        for r in range(num_rows):
+            fh.write(f'{r},"name {r}",{r * 7 % 1000}\n')
+
+
+def main() -> None:
+
+    num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    page_size = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+
+        path = os.path.join(tmp_dir, "bench.csv")
+        write_sample_csv(path, num_rows)
+
+        reader = CSVReader(path, lazy=True)
+        start = num_rows - 10 * page_size
+
+        began = time.perf_counter()
+        reader.read_page(start, page_size)
+        unindexed = time.perf_counter() - began
+
+        print(f"rows={num_rows} page_size={page_size}")
+        print(f"read_page without index: {unindexed * 1000:8.1f}ms")
+
+        for stride in (1, 64):
+
+            began = time.perf_counter()
+            reader.create_offset_index(stride=stride, persist=True)
+            created = time.perf_counter() - began
+
+            began = time.perf_counter()
+            reader.create_offset_index(stride=stride, persist=True)
+            loaded = time.perf_counter() - began
+
+            began = time.perf_counter()
+            reader.read_page(start, page_size)
+            indexed = time.perf_counter() - began
+
+            print(f"stride={stride}")
+            print(f"  create_offset_index:   {created * 1000:8.1f}ms")
+            print(f"  load saved index:      {loaded * 1000:8.1f}ms")
+            print(f"  read_page with index:  {indexed * 1000:8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Compare the time taken by CSVReader to read a CSV, and to load the same rows
+from a row cache, with dictionary rows, compact rows and columnar storage.
+
+Usage: python benchmarks/bench_row_cache.py [num_rows]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from csvio import CSVReader
+from csvio.processors import FieldProcessor
+from csvio.utils.cache import RowCache
+
+
+def write_sample_csv(path: str, num_rows: int) -> None:
+
+    with open(path, "w") as fh:
+
+        fh.write("id,status,name,amount\n")
+
+        for r in range(num_rows):
+            fh.write(f"{r},s{r % 20},name {r},{r * 7 % 1000}\n")
+
+
+def timed(path: str, **reader_kwargs: object) -> float:
+
+    start = time.perf_counter()
+    CSVReader(path, **reader_kwargs)  # type: ignore
+
+    return time.perf_counter() - start
+
+
+def main() -> None:
+
+    num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+
+        path = os.path.join(tmp_dir, "bench.csv")
+        write_sample_csv(path, num_rows)
+
+        cache = RowCache(os.path.join(tmp_dir, "cache"))
+        processor = FieldProcessor("bench_cache")
+        processor.add_processor("amount", int)
+
+        print(f"rows={num_rows}")
+
+        for name, kwargs in (
+            ("dict rows", {}),
+            ("compact rows", {"compact_rows": True}),
+            ("columnar", {"columnar": True}),
+        ):
+
+            kwargs = {"processors": [processor], **kwargs}
+            parsed = timed(path, **kwargs)
+            timed(path, cache=cache, **kwargs)
+            loaded = timed(path, cache=cache, **kwargs)
+
+            print(
+                f"  {name + ':':<14}parse {parsed:6.3f}s  "
+                f"cache load {loaded:6.3f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
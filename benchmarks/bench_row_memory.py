@@ -0,0 +1,82 @@
+"""
+Report the memory used per row by CSVReader with dictionary rows, compact
+rows, columnar storage and interned columns, both with the values read as text and with them
+converted to integers by a field processor.
+
+Usage: python benchmarks/bench_row_memory.py [num_rows] [num_fields]
+"""
+import os
+import sys
+import tempfile
+import tracemalloc
+
+from csvio import CSVReader
+from csvio.processors import FieldProcessor
+
+
+def write_sample_csv(path: str, num_rows: int, num_fields: int) -> None:
+
+    with open(path, "w") as fh:
+
+        fh.write(",".join(f"f{i}" for i in range(num_fields)) + "\n")
+
+        for r in range(num_rows):
+            fh.write(",".join(str(r * i % 997) for i in range(num_fields)))
+            fh.write("\n")
+
+
+def bytes_per_row(path: str, num_rows: int, **reader_kwargs: object) -> float:
+
+    tracemalloc.start()
+
+    reader = CSVReader(path, **reader_kwargs)  # type: ignore
+    current, _ = tracemalloc.get_traced_memory()
+
+    tracemalloc.stop()
+
+    assert reader.num_rows == num_rows
+
+    return current / num_rows
+
+
+def main() -> None:
+
+    num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    num_fields = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+
+        path = os.path.join(tmp_dir, "bench.csv")
+        write_sample_csv(path, num_rows, num_fields)
+
+        print(f"rows={num_rows} fields={num_fields}")
+
+        to_int = FieldProcessor("bench_int")
+
+        for i in range(num_fields):
+            to_int.add_processor(f"f{i}", int)
+
+        for title, processors in (("text", []), ("int", [to_int])):
+
+            dict_rows = bytes_per_row(path, num_rows, processors=processors)
+
+            print(f"{title} values")
+            print(f"  dict rows:    {dict_rows:8.1f} bytes/row")
+
+            for name, kwargs in (
+                ("compact rows", {"compact_rows": True}),
+                ("columnar", {"columnar": True}),
+                ("interned", {"intern_columns": True}),
+            ):
+
+                size = bytes_per_row(
+                    path, num_rows, processors=processors, **kwargs
+                )
+                print(
+                    f"  {name + ':':<14}{size:8.1f} bytes/row "
+                    f"({1 - size / dict_rows:.1%} saved)"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Compare the time taken to preview and sample a large CSV by loading all of
+its rows, and with CSVReader.head and CSVReader.sample on a lazy reader.
+
+Usage: python benchmarks/bench_sample.py [num_rows] [k]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Tuple
+
+from csvio import CSVReader
+
+
+def write_sample_csv(path: str, num_rows: int) -> None:
+
+    with open(path, "w") as fh:
+
+        fh.write("id,name,value\n")
+
+        for r in range(num_rows):
+            fh.write(f'{r},"name {r}",{r * 7 % 1000}\n')
+
+
+def measure(func: Callable[[], Any]) -> Tuple[float, float]:
+
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, peak / (1 << 20)
+
+
+def main() -> None:
+
+    num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    k = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+
+        path = os.path.join(tmp_dir, "bench.csv")
+        write_sample_csv(path, num_rows)
+
+        print(f"rows={num_rows} k={k}")
+
+        for name, func in (
+            ("load, rows[:k]", lambda: CSVReader(path).rows[:k]),
+            ("head(k)", lambda: CSVReader(path, lazy=True).head(k)),
+            (
+                "load, random.sample",
+                lambda: random.Random(1).sample(CSVReader(path).rows, k),
+            ),
+            ("sample(k)", lambda: CSVReader(path, lazy=True).sample(k, 1)),
+        ):
+            elapsed, peak = measure(func)
+            print(f"  {name + ':':<22}{elapsed:8.3f}s, peak {peak:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
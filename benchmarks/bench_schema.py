@@ -0,0 +1,64 @@
+"""
+Compare the time taken by CSVReader to convert the values of a CSV to
+numbers with a field processor, with an explicit schema, and with an
+inferred schema.
+
+Usage: python benchmarks/bench_schema.py [num_rows] [num_fields]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from csvio import CSVReader
+from csvio.processors import FieldProcessor
+
+
+def write_sample_csv(path: str, num_rows: int, num_fields: int) -> None:
+
+    with open(path, "w") as fh:
+
+        fh.write(",".join(f"f{i}" for i in range(num_fields)) + ",ratio\n")
+
+        for r in range(num_rows):
+            fh.write(",".join(str(r * i % 997) for i in range(num_fields)))
+            fh.write(f",{r / 7:.3f}\n")
+
+
+def timed(path: str, **reader_kwargs: object) -> float:
+
+    start = time.perf_counter()
+    CSVReader(path, **reader_kwargs)  # type: ignore
+
+    return time.perf_counter() - start
+
+
+def main() -> None:
+
+    num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    num_fields = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+
+        path = os.path.join(tmp_dir, "bench.csv")
+        write_sample_csv(path, num_rows, num_fields)
+
+        types = {f"f{i}": "int" for i in range(num_fields)}
+        types["ratio"] = "float"
+
+        processor = FieldProcessor("bench_schema")
+
+        for fieldname, type_ in types.items():
+            processor.add_processor(
+                fieldname, int if type_ == "int" else float
+            )
+
+        print(f"rows={num_rows} fields={num_fields + 1}")
+        print(f"text:            {timed(path):.3f}s")
+        print(f"field processor: {timed(path, processors=[processor]):.3f}s")
+        print(f"schema:          {timed(path, schema=types):.3f}s")
+        print(f"inferred schema: {timed(path, schema='infer'):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Compare the time taken and the peak memory used to sort a CSV by loading it
+with CSVReader, sorting the rows and writing them with CSVWriter, and with
+sort_csv using a memory budget that splits the rows into several runs.
+
+Usage: python benchmarks/bench_sort.py [num_rows] [memory_limit_mb]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable
+
+from csvio import CSVReader, CSVWriter, sort_csv
+
+
+def write_sample_csv(path: str, num_rows: int) -> None:
+
+    ids = list(range(num_rows))
+    random.Random(1).shuffle(ids)
+
+    with open(path, "w") as fh:
+
+        fh.write("id,name,value\n")
+
+        for r in ids:
+            fh.write(f'{r},"name {r % 1000}\nline two",{r * 7 % 1000}\n')
+
+
+def measure(sort: Callable[[], None]) -> None:
+
+    start = time.perf_counter()
+    sort()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    sort()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{elapsed:8.3f}s  peak {peak / 1024 / 1024:8.1f} MiB")
+
+
+def main() -> None:
+
+    num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    memory_limit = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+
+        path = os.path.join(tmp_dir, "bench.csv")
+        output = os.path.join(tmp_dir, "sorted.csv")
+        write_sample_csv(path, num_rows)
+
+        print(f"rows={num_rows} memory_limit={memory_limit} MiB")
+
+        def in_memory() -> None:
+            reader = CSVReader(path)
+            writer = CSVWriter(output, reader.fieldnames)
+            writer.add_rows(
+                sorted(reader.rows, key=lambda row: int(row["value"]))
+            )
+            writer.flush()
+
+        def external() -> None:
+            result = sort_csv(
+                path,
+                output,
+                key=["value"],
+                memory_limit=memory_limit * 1024 * 1024,
+                tmp_dir=tmp_dir,
+            )
+            assert result.rows == num_rows
+
+        print("  in memory: ", end="", flush=True)
+        measure(in_memory)
+        print("  sort_csv:  ", end="", flush=True)
+        measure(external)
+
+        values = [int(row["value"]) for row in CSVReader(output, lazy=True)]
+        assert values == sorted(values)
+
+
+if __name__ == "__main__":
+    main()
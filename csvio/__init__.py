@@ -22,5 +22,8 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 __version__ = "1.1.2"
+from .asyncreader import AsyncCSVReader
 from .csvreader import CSVReader
 from .csvwriter import CSVWriter
+from .multireader import MultiCSVReader
+from .sorting import sort_csv
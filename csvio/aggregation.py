@@ -0,0 +1,499 @@
+# MIT License
+#
+# csvio: A library for conveniently processing CSV files.
+#
+# Copyright (c) 2021 Salman Raza <raza.salman@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import os
+import pickle
+import tempfile
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .utils.types import FN, RS, R
+
+#: Aggregations supported by :py:meth:`GroupBy.agg`.
+AGGREGATIONS = ("count", "sum", "mean", "min", "max")
+
+#: Default maximum number of groups held in memory before they are spilled.
+MAX_GROUPS = 1000000
+
+#: Default number of partitions the spilled groups are split into.
+PARTITIONS = 16
+
+# Offsets of the accumulators of a column in the state of a group.
+_N, _SUM, _MIN, _MAX = range(4)
+_WIDTH = 4
+
+
+def _number(value: Any) -> Any:
+    """
+    :return: ``value`` converted to a number if it is text.
+
+    :raises ValueError: If ``value`` is text that is not a number.
+    """
+
+    if value.__class__ is not str:
+        return value
+
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+def _number_or_text(value: Any) -> Any:
+
+    try:
+        return _number(value)
+    except ValueError:
+        return value
+
+
+def _numbers_first(value: Any) -> Tuple[int, Any]:
+    """
+    :return: A key that orders numbers by their value before any text, in the
+        same way as :py:func:`~csvio.sorting.sort_csv`.
+    """
+
+    return (1, value) if value.__class__ is str else (0, value)
+
+
+class _Column:
+    """
+    The accumulators needed for the aggregations of a column.
+    """
+
+    __slots__ = ("name", "numeric", "minmax", "convert", "order")
+
+    def __init__(self, name: str, numeric: bool, minmax: bool) -> None:
+
+        self.name = name
+        self.numeric = numeric
+        self.minmax = minmax
+        self.convert: Optional[Callable[[Any], Any]] = None
+        self.order: Optional[Callable[[Any], Any]] = None
+
+        if numeric:
+            self.convert = _number
+        elif minmax:
+            self.convert = _number_or_text
+            self.order = _numbers_first
+
+
+class GroupBy:
+    """
+    Aggregate the values of the rows of a CSV by groups of rows with the same
+    values of the ``columns``, keeping only a few accumulators per group in
+    memory instead of the rows.
+
+    Instances are created by :py:meth:`~csvio.csvbase.CSVBase.group_by`.
+    The rows are read again by every call to :py:meth:`agg` or
+    :py:meth:`iter_agg`, streaming them from a reader constructed with
+    ``lazy=True``.
+
+    When more than ``max_groups`` groups are found, the accumulators of the
+    groups are spilled to ``partitions`` temporary files, choosing the file
+    of each group by the hash of its values, and the table of groups is
+    emptied. Once all the rows are read, the partial accumulators in each
+    file are combined, holding only the groups of one partition in memory.
+
+    :param rows: A function returning an iterable of the rows to aggregate.
+    :type rows: required
+
+    :param columns: Column headings of the columns whose values define the
+        groups.
+    :type columns: required
+
+    :param max_groups: Maximum number of groups held in memory.
+    :type max_groups: optional
+
+    :param partitions: Number of temporary files the groups are spilled to.
+    :type partitions: optional
+
+    :param tmp_dir: Directory of the temporary files. The default temporary
+        directory of :py:mod:`tempfile` if not provided.
+    :type tmp_dir: optional
+
+    :param fieldnames: Column headings of the rows, used to check the
+        columns that are grouped and aggregated.
+    :type fieldnames: optional
+    """
+
+    def __init__(
+        self,
+        rows: Callable[[], Iterable[R]],
+        columns: FN,
+        max_groups: int = MAX_GROUPS,
+        partitions: int = PARTITIONS,
+        tmp_dir: str = None,
+        fieldnames: FN = None,
+    ) -> None:
+
+        self.fieldnames = fieldnames
+        self.__check_columns(columns)
+
+        if not columns:
+            raise ValueError("At least one column is needed to group rows")
+
+        if max_groups < 1 or partitions < 1:
+            raise ValueError("max_groups and partitions must be positive")
+
+        self.rows = rows
+        self.columns = list(columns)
+        self.max_groups = max_groups
+        self.partitions = partitions
+        self.tmp_dir = tmp_dir
+
+        #: Number of times the groups were spilled by the last aggregation.
+        self.spills = 0
+
+    def __check_columns(self, columns: Iterable[str]) -> None:
+
+        if self.fieldnames is None:
+            return
+
+        missing = [c for c in columns if c not in self.fieldnames]
+
+        if missing:
+            raise ValueError(f"Columns not found in the CSV: {missing}")
+
+    def __columns(
+        self, aggregations: Dict[str, Union[bool, str, FN]]
+    ) -> Tuple[bool, List[_Column], List[Tuple[str, str, int]]]:
+        """
+        :return: Whether the rows of each group are counted, the columns to
+            accumulate, and the name, aggregation and column position of each
+            output value.
+        """
+
+        unsupported = [a for a in aggregations if a not in AGGREGATIONS]
+
+        if unsupported:
+            raise ValueError(f"Unsupported aggregations: {unsupported}")
+
+        count_rows = False
+        requested: Dict[str, List[str]] = {}
+        outputs: List[Tuple[str, str]] = []
+
+        for aggregation, columns in aggregations.items():
+
+            if columns is True and aggregation == "count":
+                count_rows = True
+                outputs.append(("count", ""))
+                continue
+
+            if isinstance(columns, str):
+                columns = [columns]
+            elif not isinstance(columns, list):
+                raise ValueError(
+                    f"Columns of {aggregation} must be a column heading or "
+                    "a list of column headings"
+                )
+
+            for column in columns:
+                requested.setdefault(column, []).append(aggregation)
+                outputs.append((aggregation, column))
+
+        self.__check_columns(requested)
+
+        accumulated = [
+            _Column(
+                column,
+                any(a in ("sum", "mean") for a in column_aggregations),
+                any(a in ("min", "max") for a in column_aggregations),
+            )
+            for column, column_aggregations in requested.items()
+        ]
+        positions = {column.name: i for i, column in enumerate(accumulated)}
+
+        return (
+            count_rows,
+            accumulated,
+            [
+                (
+                    f"{a}_{c}" if c else a,
+                    a,
+                    1 + _WIDTH * positions[c] if c else 0,
+                )
+                for a, c in outputs
+            ],
+        )
+
+    def __key(self) -> Callable[[R], Tuple[Any, ...]]:
+
+        columns = self.columns
+
+        def key(row: R) -> Tuple[Any, ...]:
+            return tuple([row[column] for column in columns])
+
+        return key
+
+    @staticmethod
+    def __update(state: List[Any], row: R, columns: List[_Column]) -> None:
+
+        state[0] += 1
+        base = 1
+
+        for column in columns:
+
+            value = row[column.name]
+
+            if value is not None and value != "":
+
+                state[base + _N] += 1
+
+                if column.convert is None:
+                    base += _WIDTH
+                    continue
+
+                value = column.convert(value)
+
+                if column.numeric:
+                    state[base + _SUM] += value
+
+                if column.minmax:
+
+                    low = state[base + _MIN]
+                    high = state[base + _MAX]
+                    order = column.order
+
+                    if low is None:
+                        state[base + _MIN] = state[base + _MAX] = value
+                    elif order is None:
+                        if value < low:
+                            state[base + _MIN] = value
+                        elif value > high:
+                            state[base + _MAX] = value
+                    else:
+                        key = order(value)
+
+                        if key < order(low):
+                            state[base + _MIN] = value
+                        elif key > order(high):
+                            state[base + _MAX] = value
+
+            base += _WIDTH
+
+    @staticmethod
+    def __combine(state: List[Any], other: List[Any]) -> None:
+
+        state[0] += other[0]
+
+        for base in range(1, len(state), _WIDTH):
+
+            state[base + _N] += other[base + _N]
+            state[base + _SUM] += other[base + _SUM]
+
+            for offset, better in ((_MIN, min), (_MAX, max)):
+
+                values = [
+                    v
+                    for v in (state[base + offset], other[base + offset])
+                    if v is not None
+                ]
+                state[base + offset] = (
+                    better(values, key=_numbers_first) if values else None
+                )
+
+    def __spill(
+        self, groups: Dict[Tuple[Any, ...], List[Any]], files: List[IO[bytes]]
+    ) -> None:
+
+        partitions: List[List[Tuple[Tuple[Any, ...], List[Any]]]] = [
+            [] for _ in files
+        ]
+
+        for item in groups.items():
+            partitions[hash(item[0]) % len(files)].append(item)
+
+        for fh, partition in zip(files, partitions):
+            if partition:
+                pickle.dump(partition, fh, pickle.HIGHEST_PROTOCOL)
+
+        groups.clear()
+        self.spills += 1
+
+    def __read_partition(
+        self, fh: IO[bytes]
+    ) -> Dict[Tuple[Any, ...], List[Any]]:
+
+        groups: Dict[Tuple[Any, ...], List[Any]] = {}
+        fh.seek(0)
+
+        while True:
+            try:
+                partition = pickle.load(fh)
+            except EOFError:
+                break
+
+            for key, state in partition:
+
+                current = groups.get(key)
+
+                if current is None:
+                    groups[key] = state
+                else:
+                    self.__combine(current, state)
+
+        return groups
+
+    def __groups(
+        self, columns: List[_Column]
+    ) -> Iterator[Tuple[Tuple[Any, ...], List[Any]]]:
+        """
+        Accumulate the values of the rows of each group.
+
+        :return: A generator of tuples of the values of the group columns and
+            the accumulators of each group.
+        """
+
+        key = self.__key()
+        update = self.__update
+        initial = [0] + [0, 0, None, None] * len(columns)
+        groups: Dict[Tuple[Any, ...], List[Any]] = {}
+        spill_dir: Optional["tempfile.TemporaryDirectory[str]"] = None
+        files: List[IO[bytes]] = []
+
+        self.spills = 0
+
+        try:
+            for row in self.rows():
+
+                row_key = key(row)
+                state = groups.get(row_key)
+
+                if state is None:
+
+                    if len(groups) >= self.max_groups:
+
+                        if spill_dir is None:
+                            spill_dir = tempfile.TemporaryDirectory(
+                                prefix="csvio-groups-", dir=self.tmp_dir
+                            )
+                            files = [
+                                open(
+                                    os.path.join(spill_dir.name, f"part{i}"),
+                                    "w+b",
+                                )
+                                for i in range(self.partitions)
+                            ]
+
+                        self.__spill(groups, files)
+
+                    state = groups[row_key] = initial[:]
+
+                update(state, row, columns)
+
+            if not files:
+                yield from groups.items()
+                return
+
+            self.__spill(groups, files)
+
+            for fh in files:
+                yield from self.__read_partition(fh).items()
+
+        finally:
+            for fh in files:
+                fh.close()
+
+            if spill_dir is not None:
+                spill_dir.cleanup()
+
+    def iter_agg(self, **aggregations: Union[bool, str, FN]) -> Iterator[R]:
+        """
+        Aggregate the rows of each group one group at a time. See
+        :py:meth:`agg` for the aggregations.
+
+        :return: A generator of dictionaries with the values of the group
+            columns and the aggregated values of each group.
+        """
+
+        count_rows, columns, outputs = self.__columns(aggregations)
+        names = self.columns
+
+        for group, state in self.__groups(columns):
+
+            row = dict(zip(names, group))
+
+            for name, aggregation, base in outputs:
+
+                if aggregation == "count":
+                    row[name] = state[base + _N] if base else state[0]
+                elif aggregation == "sum":
+                    row[name] = state[base + _SUM]
+                elif aggregation == "mean":
+                    n = state[base + _N]
+                    row[name] = state[base + _SUM] / n if n else None
+                elif aggregation == "min":
+                    row[name] = state[base + _MIN]
+                else:
+                    row[name] = state[base + _MAX]
+
+            yield row
+
+    def agg(self, **aggregations: Union[bool, str, FN]) -> RS:
+        """
+        Aggregate the rows of each group.
+
+        Each keyword argument is the name of an aggregation and the column
+        heading, or list of column headings, of the columns it aggregates.
+        The aggregated values are named after the aggregation and the column,
+        for example ``sum_Quantity``. Empty values are ignored, and text
+        values are converted to numbers.
+
+        * ``count``: Number of non-empty values of the columns, or with
+          :obj:`True`, number of rows of each group, named ``count``.
+        * ``sum`` and ``mean``: Sum and mean of the values of the columns.
+        * ``min`` and ``max``: Smallest and largest value of the columns,
+          compared as numbers if they are numbers and otherwise as text.
+          In a column of both, numbers are smaller than any text, in the same
+          order as :py:func:`~csvio.sorting.sort_csv`.
+
+        :return: A list of dictionaries with the values of the group columns
+            and the aggregated values of each group, in the order the groups
+            are first found. Groups that were spilled are instead in the order
+            of their partitions.
+
+        :raises ValueError: If the values of a column summed or averaged are
+            not numbers.
+
+        Usage:
+
+        .. code-block:: python
+
+            >>> from csvio import CSVReader
+            >>> reader = CSVReader("fruit_stock.csv", lazy=True)
+            >>> reader.group_by(["Fruit"]).agg(count=True, sum="Quantity")
+            [{'Fruit': 'Apple', 'count': 1, 'sum_Quantity': 1}, ...]
+        """
+
+        return list(self.iter_agg(**aggregations))
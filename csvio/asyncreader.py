@@ -0,0 +1,243 @@
+# MIT License
+#
+# csvio: A library for conveniently processing CSV files.
+#
+# Copyright (c) 2021 Salman Raza <raza.salman@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Generator, Iterator, List, Optional
+
+from .csvreader import CSVReader
+from .processors.processor_base import ProcessorBase
+from .utils.types import FN, RS, R
+
+CHUNK_SIZE = 1000
+READ_AHEAD = 4
+
+
+class AsyncCSVReader:
+    """
+    Read the rows of a CSV from :py:mod:`asyncio` code.
+
+    The CSV is read and parsed by a :py:class:`~csvio.CSVReader` with
+    ``lazy=True`` in a worker thread, one chunk of ``chunk_size`` rows at a
+    time, so the event loop only ever waits for complete chunks and stays
+    responsive while a large CSV is read.
+
+    Up to ``read_ahead`` chunks are read before they are consumed. Once that
+    many chunks are waiting, reading pauses until the consumer takes one,
+    which bounds the memory used when rows are consumed more slowly than they
+    are read.
+
+    :param filename: Full path to the CSV file.
+    :type filename: required
+
+    :param processors: A list of processors, as accepted by
+        :py:class:`~csvio.CSVReader`. The functions added to the processors
+        can be coroutine functions, which are awaited on the event loop. The
+        processors before the first one with a coroutine function are
+        applied in the worker thread, the remaining ones on the event loop.
+    :type processors: optional
+
+    :param chunk_size: Number of rows read in the worker thread at a time.
+    :type chunk_size: optional
+
+    :param read_ahead: Maximum number of chunks read before they are
+        consumed.
+    :type read_ahead: optional
+
+    :param reader_kwargs: Other keyword arguments passed to
+        :py:class:`~csvio.CSVReader`, for example ``columns``, ``where`` or
+        ``schema``.
+    :type reader_kwargs: optional
+
+    Usage:
+
+    .. code-block:: python
+
+        >>> import asyncio
+        >>> from csvio import AsyncCSVReader
+        >>> async def main():
+        ...     reader = AsyncCSVReader("fruit_stock.csv")
+        ...     async for row in reader:
+        ...         print(row["Fruit"])
+        >>> asyncio.run(main())
+        Apple
+        Melons
+        Mango
+        Strawberry
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        processors: List[ProcessorBase] = None,
+        chunk_size: int = CHUNK_SIZE,
+        read_ahead: int = READ_AHEAD,
+        **reader_kwargs: Any,
+    ) -> None:
+
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+
+        if read_ahead < 1:
+            raise ValueError("read_ahead must be a positive integer")
+
+        reader_kwargs.pop("lazy", None)
+
+        self.filename = filename
+        self.processors = processors or []
+        self.chunk_size = chunk_size
+        self.read_ahead = read_ahead
+        self.reader_kwargs = reader_kwargs
+
+        self._reader: Optional[CSVReader] = None
+
+    def __aiter__(self) -> AsyncIterator[R]:
+        return self.iter_rows()
+
+    @property
+    def fieldnames(self) -> FN:
+        """
+        :return: List of column headings, available once reading has
+            started.
+        """
+
+        if self._reader is None:
+            return []
+
+        return self._reader.fieldnames
+
+    def __split_processors(self) -> int:
+
+        for i, processor in enumerate(self.processors):
+            if processor.is_async():
+                return i
+
+        return len(self.processors)
+
+    async def iter_chunks(self) -> AsyncIterator[RS]:
+        """
+        Read the rows from the CSV in lists of ``chunk_size`` rows.
+
+        :return: An asynchronous generator of lists of dictionaries each
+            representing a processed row in the CSV file.
+
+        Usage:
+
+        .. code-block:: python
+
+            >>> async def main():
+            ...     reader = AsyncCSVReader("fruit_stock.csv", chunk_size=3)
+            ...     async for chunk in reader.iter_chunks():
+            ...         print(len(chunk))
+            >>> asyncio.run(main())
+            3
+            1
+        """
+
+        loop = asyncio.get_running_loop()
+        split = self.__split_processors()
+        executor = ThreadPoolExecutor(1)
+        queue: "asyncio.Queue[Optional[RS]]" = asyncio.Queue(self.read_ahead)
+        chunks: Optional[Iterator[RS]] = None
+
+        def open_chunks() -> Iterator[RS]:
+
+            self._reader = CSVReader(
+                self.filename,
+                processors=self.processors[:split],
+                lazy=True,
+                **self.reader_kwargs,
+            )
+
+            return self._reader.iter_chunks(self.chunk_size)
+
+        async def produce() -> None:
+
+            nonlocal chunks
+
+            try:
+                chunks = await loop.run_in_executor(executor, open_chunks)
+
+                while True:
+
+                    chunk = await loop.run_in_executor(
+                        executor, next, chunks, None
+                    )
+
+                    if chunk is None:
+                        break
+
+                    await queue.put(chunk)
+            except Exception:
+                await queue.put(None)
+                raise
+
+            await queue.put(None)
+
+        producer = asyncio.ensure_future(produce())
+
+        try:
+            while True:
+
+                chunk = await queue.get()
+
+                if chunk is None:
+                    break
+
+                for processor in self.processors[split:]:
+                    chunk = await processor.process_rows_async(chunk)
+
+                yield chunk
+
+            await producer
+        finally:
+            producer.cancel()
+
+            if isinstance(chunks, Generator):
+                await loop.run_in_executor(executor, chunks.close)
+
+            executor.shutdown(wait=False)
+
+    async def iter_rows(self) -> AsyncIterator[R]:
+        """
+        Read the rows from the CSV one at a time.
+
+        :return: An asynchronous generator of dictionaries each representing
+            a processed row in the CSV file.
+        """
+
+        async for chunk in self.iter_chunks():
+            for row in chunk:
+                yield row
+
+    async def read_rows(self) -> RS:
+        """
+        :return: A list of all the processed rows in the CSV file.
+        """
+
+        rows: RS = []
+
+        async for chunk in self.iter_chunks():
+            rows.extend(chunk)
+
+        return rows
@@ -0,0 +1,244 @@
+# MIT License
+#
+# csvio: A library for conveniently processing CSV files.
+#
+# Copyright (c) 2021 Salman Raza <raza.salman@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import csv
+from collections import deque
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+)
+
+from .errors import BadRow, BadRowError
+
+POLICIES = ("raise", "skip", "quarantine")
+QUARANTINE_FIELDNAMES = ["line", "error", "text"]
+
+
+class BadRows:
+    """
+    Apply an error policy to the records of a CSV that cannot be tokenized,
+    for example because of an unbalanced quote, so that reading can continue
+    with the records after them.
+
+    The lines of each record are tracked while it is tokenized. When a record
+    cannot be tokenized, its first line is rejected and tokenizing resumes
+    from the next line, which is assumed to be the start of the next record.
+    Lines swallowed by an unbalanced quote are therefore tokenized again
+    instead of being lost.
+
+    :param policy: What to do with the rejected lines. ``raise`` raises a
+        :py:class:`~csvio.errors.BadRowError`. ``skip`` discards them, and
+        ``quarantine`` writes them to the CSV file at ``path``, with the
+        columns ``line``, ``error`` and ``text``. The rejected lines are
+        recorded in :py:attr:`errors` and counted in :py:attr:`error_count`
+        in all cases.
+    :type policy: required
+
+    :param path: Path of the quarantine file, created when the first line is
+        rejected. If not provided, the rejected lines are only recorded.
+    :type path: optional
+
+    :param max_errors: Maximum number of rejected lines kept in
+        :py:attr:`errors`. All of them are kept if :obj:`None`.
+    :type max_errors: optional
+    """
+
+    def __init__(
+        self, policy: str, path: str = None, max_errors: Optional[int] = 1000
+    ) -> None:
+
+        if policy not in POLICIES:
+            raise ValueError(f"Unsupported bad row policy: {policy}")
+
+        self.policy = policy
+        self.path = path
+        self.max_errors = max_errors
+
+        self.errors: List[BadRow] = []
+        self.error_count = 0
+
+        self._file: Optional[TextIO] = None
+        self._writer: Any = None
+        self._created = False
+
+    def __getstate__(self) -> Dict[str, Any]:
+
+        state = self.__dict__.copy()
+        state["_file"] = state["_writer"] = None
+
+        return state
+
+    def copy(self) -> "BadRows":
+        """
+        :return: An empty :py:class:`BadRows` with the same policy, that keeps
+            the lines it rejects instead of writing them, so that they can be
+            added to this one with :py:meth:`add_errors`.
+        """
+
+        return BadRows(
+            self.policy,
+            max_errors=None
+            if self.policy == "quarantine"
+            else self.max_errors,
+        )
+
+    def reset(self) -> None:
+        """
+        Clear the rejected lines and their count, and truncate the quarantine
+        file if it was written, so that it only holds the lines rejected after
+        the reset.
+        """
+
+        self.errors, self.error_count = [], 0
+        self.flush()
+
+        if self._created and self.path is not None:
+            self._created = False
+            self.__write(self.path, [])
+            self.flush()
+
+    def reject(self, bad_row: BadRow) -> None:
+        """
+        Apply the policy to ``bad_row``.
+        """
+
+        if self.policy == "raise":
+            raise BadRowError(bad_row)
+
+        self.error_count += 1
+
+        if self.max_errors is None or len(self.errors) < self.max_errors:
+            self.errors.append(bad_row)
+
+        if self.policy == "quarantine" and self.path is not None:
+            self.__write(self.path, [bad_row])
+
+    def add_errors(self, errors: List[BadRow], count: int) -> None:
+        """
+        Add lines rejected by a copy of this object, such as the copies used
+        by worker processes, writing them to the quarantine file.
+        """
+
+        self.error_count += count
+
+        if self.policy == "quarantine" and self.path is not None:
+            self.__write(self.path, errors)
+            self.flush()
+
+        if self.max_errors is not None:
+            errors = errors[: max(0, self.max_errors - len(self.errors))]
+
+        self.errors.extend(errors)
+
+    def __write(self, path: str, bad_rows: List[BadRow]) -> None:
+
+        if self._writer is None:
+
+            fh = open(path, "a" if self._created else "w", newline="")
+            self._file = fh
+            self._writer = csv.writer(fh)
+
+            if not self._created:
+                self._writer.writerow(QUARANTINE_FIELDNAMES)
+                self._created = True
+
+        self._writer.writerows(
+            (b.line, b.error, b.text.rstrip("\r\n")) for b in bad_rows
+        )
+
+    def flush(self) -> None:
+        """
+        Close the quarantine file, if it is open.
+        """
+
+        if self._file is not None:
+            self._file.close()
+            self._file = self._writer = None
+
+    def guard(
+        self,
+        lines: Iterable[str],
+        make_reader: Callable[[Iterable[str]], Any],
+    ) -> Iterator[List[str]]:
+        """
+        Tokenize ``lines`` with the reader returned by ``make_reader``,
+        applying the policy to the records that cannot be tokenized.
+
+        :param make_reader: Function returning a :py:func:`csv.reader` of
+            the lines it is passed.
+        :type make_reader: required
+
+        :return: A generator of the lists of values of the records.
+        """
+
+        seen: List[str] = []
+        clear = seen.clear
+        pending: Deque[str] = deque()
+        source = iter(lines)
+        consumed = 0
+
+        def tracked() -> Iterator[str]:
+
+            while pending:
+                text = pending.popleft()
+                seen.append(text)
+                yield text
+
+            for text in source:
+                seen.append(text)
+                yield text
+
+        try:
+            while True:
+
+                reader = make_reader(tracked())
+
+                try:
+                    for values in reader:
+                        clear()
+                        yield values
+
+                    return
+
+                except csv.Error as e:
+
+                    if not seen:
+                        raise
+
+                    # The reader only counts the lines it consumed, so the
+                    # record starts after the lines of the records before it.
+                    line = consumed + reader.line_num - len(seen) + 1
+                    self.reject(BadRow(line, seen[0], str(e)))
+
+                    pending.extendleft(reversed(seen[1:]))
+                    consumed = line
+                    clear()
+        finally:
+            self.flush()
@@ -0,0 +1,411 @@
+# MIT License
+#
+# csvio: A library for conveniently processing CSV files.
+#
+# Copyright (c) 2021 Salman Raza <raza.salman@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from array import array
+from collections.abc import Sequence
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Type,
+    Union,
+)
+
+from .records import Record, record_class
+from .utils.types import FN, RS, R
+
+INT, FLOAT, ENCODED, OBJECT = "int", "float", "encoded", "object"
+
+
+class Column:
+    """
+    The values of a single column stored in a contiguous array.
+
+    The storage is chosen from the values appended to the column, and is
+    changed as soon as a value that does not fit the current storage is
+    appended:
+
+    * ``int``: Python :obj:`int` values stored in an :py:class:`array.array`
+      of signed 64 bit integers.
+    * ``float``: :obj:`int` and :obj:`float` values stored in an
+      :py:class:`array.array` of doubles.
+    * ``encoded``: Any other hashable values, such as strings, stored once
+      each in :py:attr:`dictionary`, and referenced from every row by their
+      position in it in an :py:class:`array.array` of codes.
+    * ``object``: Values that are not hashable, stored in a list.
+
+    Missing values, :obj:`None`, do not change the storage of a numeric
+    column. They are stored as zeros, and marked in :py:attr:`missing`, a
+    mask with a byte for each row that is only created once a value is
+    missing.
+    """
+
+    def __init__(self) -> None:
+
+        self.kind: Optional[str] = None
+        self.data: Union["array[Any]", List[Any]] = []
+        self.dictionary: List[Hashable] = []
+        self._codes: Dict[Hashable, int] = {}
+        self.missing: Optional[bytearray] = None
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, index: int) -> Any:
+
+        if self.kind == ENCODED:
+            return self.dictionary[self.data[index]]
+
+        if self.missing is not None and self.missing[index]:
+            return None
+
+        return self.data[index]
+
+    def __iter__(self) -> Iterator[Any]:
+
+        if self.kind == ENCODED:
+            dictionary = self.dictionary
+            return (dictionary[code] for code in self.data)
+
+        if self.missing is not None:
+            return (
+                None if missing else value
+                for value, missing in zip(self.data, self.missing)
+            )
+
+        return iter(self.data)
+
+    def __convert(self, kind: str) -> None:
+
+        values = list(self)
+
+        self.kind = kind
+        self.dictionary = []
+        self._codes = {}
+        self.missing = None
+
+        if kind == INT:
+            self.data = array("q")
+        elif kind == FLOAT:
+            self.data = array("d")
+        elif kind == ENCODED:
+            self.data = array("I")
+        else:
+            self.data = []
+
+        for value in values:
+            self.append(value)
+
+    def append(self, value: Any) -> None:
+        """
+        Append a value to the column, changing its storage if the value does
+        not fit the current one.
+        """
+
+        kind = self.kind
+        value_type = type(value)
+
+        if value is None and kind in (INT, FLOAT, None):
+
+            if kind is None:
+                self.data.append(value)
+                return
+
+            if self.missing is None:
+                self.missing = bytearray(len(self.data))
+
+            self.missing.append(1)
+            self.data.append(0)
+
+        elif kind == ENCODED:
+
+            try:
+                code = self._codes.get(value)
+            except TypeError:
+                self.__convert(OBJECT)
+                self.data.append(value)
+                return
+
+            if code is None:
+                code = self._codes[value] = len(self.dictionary)
+                self.dictionary.append(value)
+
+            self.data.append(code)
+
+        elif kind == INT and value_type is int:
+
+            try:
+                self.data.append(value)
+            except OverflowError:
+                self.__convert(OBJECT)
+                self.data.append(value)
+                return
+
+            if self.missing is not None:
+                self.missing.append(0)
+
+        elif kind == FLOAT and (value_type is float or value_type is int):
+
+            self.data.append(value)
+
+            if self.missing is not None:
+                self.missing.append(0)
+
+        elif kind == OBJECT:
+            self.data.append(value)
+
+        elif kind is None:
+            kind = (
+                INT
+                if value_type is int
+                else FLOAT
+                if value_type is float
+                else ENCODED
+            )
+            self.__convert(kind)
+            self.append(value)
+
+        elif kind == INT and value_type is float:
+            self.__convert(FLOAT)
+            self.append(value)
+
+        else:
+            self.__convert(ENCODED)
+            self.append(value)
+
+    def __numbers(self, aggregation: str) -> Iterable[Union[int, float]]:
+
+        if self.kind not in (INT, FLOAT, None):
+            raise TypeError(
+                f"Cannot {aggregation} a column stored as {self.kind}"
+            )
+
+        if self.kind is None:
+            return []
+
+        if self.missing is None:
+            return self.data
+
+        return (
+            value
+            for value, missing in zip(self.data, self.missing)
+            if not missing
+        )
+
+    def sum(self) -> Union[int, float]:
+        """
+        :return: Sum of the values of a numeric column, skipping missing
+            values.
+        """
+
+        return sum(self.__numbers("sum"))
+
+    def mean(self) -> Optional[float]:
+        """
+        :return: Mean of the values of a numeric column, skipping missing
+            values. :obj:`None` if no value is present.
+        """
+
+        total: Union[int, float] = 0
+        count = 0
+
+        for value in self.__numbers("mean"):
+            total += value
+            count += 1
+
+        return total / count if count else None
+
+    def unique(self) -> List[Any]:
+        """
+        :return: List of the distinct values in the column, in the order in
+            which they first appear.
+        """
+
+        if self.kind == ENCODED:
+            return list(self.dictionary)
+
+        if self.kind == OBJECT:
+            unique: List[Any] = []
+
+            for value in self.data:
+                if value not in unique:
+                    unique.append(value)
+
+            return unique
+
+        return list(dict.fromkeys(self))
+
+    def group_positions(self) -> Dict[Any, "array[int]"]:
+        """
+        :return: A dictionary mapping each distinct value in the column to an
+            array of the positions of the rows that have it.
+        """
+
+        if self.kind == ENCODED:
+
+            groups = [array("L") for _ in self.dictionary]
+
+            for position, code in enumerate(self.data):
+                groups[code].append(position)
+
+            return dict(zip(self.dictionary, groups))
+
+        positions: Dict[Any, "array[int]"] = {}
+
+        for position, value in enumerate(self):
+            positions.setdefault(value, array("L")).append(position)
+
+        return positions
+
+
+class ColumnStore(Sequence):  # type: ignore
+    """
+    Rows stored column by column in :py:class:`Column` objects.
+
+    A column store is a read only sequence of rows. Each row is built from the
+    columns only when it is accessed, as a dictionary, or as a
+    :py:class:`~csvio.records.Record` if ``compact`` is :obj:`True`.
+
+    :param fieldnames: Column headings of the rows to store. If not
+        provided, the keys of the first row appended are used.
+    :type fieldnames: optional
+
+    :param compact: Build the rows as records instead of dictionaries.
+    :type compact: optional
+    """
+
+    def __init__(self, fieldnames: FN = [], compact: bool = False) -> None:
+
+        self.compact = compact
+        self.__set_fieldnames(fieldnames)
+        self._len = 0
+
+    def __set_fieldnames(self, fieldnames: FN) -> None:
+
+        self.fieldnames = list(fieldnames)
+        self.columns = {fieldname: Column() for fieldname in fieldnames}
+        self._column_list = list(self.columns.values())
+        self.record: Optional[Type[Record]] = None
+
+        if self.compact:
+            self.record = record_class(tuple(fieldnames))
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getstate__(self) -> Dict[str, Any]:
+
+        state = dict(self.__dict__)
+        state["record"] = None
+
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+
+        self.__dict__.update(state)
+
+        if self.compact:
+            self.record = record_class(tuple(self.fieldnames))
+
+    def __getitem__(self, index: Any) -> Any:
+
+        if isinstance(index, slice):
+            return [self.row(i) for i in range(*index.indices(self._len))]
+
+        if index < 0:
+            index += self._len
+
+        if not 0 <= index < self._len:
+            raise IndexError("ColumnStore index out of range")
+
+        return self.row(index)
+
+    def __iter__(self) -> Iterator[R]:
+
+        fieldnames = self.fieldnames
+        record = self.record
+
+        for values in zip(*self._column_list):
+
+            if record is None:
+                yield dict(zip(fieldnames, values))
+            else:
+                yield record._make(values)  # type: ignore
+
+    def row(self, index: int) -> R:
+        """
+        :return: The row at position ``index``, built from the columns.
+        """
+
+        values = [column[index] for column in self._column_list]
+
+        if self.record is not None:
+            return self.record._make(values)  # type: ignore
+
+        return dict(zip(self.fieldnames, values))
+
+    def append(self, row: R) -> None:
+        """
+        Append a row to the store. All rows must have the same keys as the
+        first row appended.
+        """
+
+        if not self.fieldnames:
+            self.__set_fieldnames(list(row.keys()))
+
+        for fieldname, column in zip(self.fieldnames, self._column_list):
+            column.append(row[fieldname])
+
+        self._len += 1
+
+    def extend(self, rows: Iterable[R]) -> None:
+        """
+        Append all the rows in ``rows`` to the store.
+        """
+
+        for row in rows:
+            self.append(row)
+
+    def column(self, column_name: str) -> Column:
+        """
+        :return: The :py:class:`Column` storing the values of ``column_name``.
+        """
+        return self.columns[column_name]
+
+    def rows_from_column_key(self, column_name: str) -> Dict[Any, RS]:
+        """
+        Group the rows by the values of ``column_name``, in the same way as
+        :py:meth:`~csvio.csvbase.CSVBase.rows_from_column_key`. The groups are
+        found from the column alone, and only the rows returned are built.
+        """
+
+        return {
+            key: [self.row(position) for position in positions]
+            for key, positions in self.column(column_name)
+            .group_positions()
+            .items()
+        }
@@ -21,10 +21,15 @@
 # LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
+from .aggregation import MAX_GROUPS, PARTITIONS, GroupBy
 from .filebase import FileBase
-from .utils.types import FN, KW, RS
+from .indexes import HashIndex, NestedGroups, SortedIndex, group_rows
+from .utils.sidecar import load_json_sidecar, save_json_sidecar
+from .utils.types import FN, KW, RS, R
+
+INDEX_SUFFIX = "csvio-index.json"
 
 
 class CSVBase(FileBase):
@@ -60,6 +65,8 @@ class CSVBase(FileBase):
 
         self._fieldnames: FN = []
         self._rows: RS = []
+        self._indexes: Dict[Tuple[str, ...], HashIndex] = {}
+        self._sorted_indexes: Dict[str, SortedIndex] = {}
 
     @property
     def open_kwargs(self) -> KW:
@@ -100,6 +107,7 @@ class CSVBase(FileBase):
     @rows.setter
     def rows(self, rows: RS) -> None:
         self._rows = rows
+        self._update_indexes()
 
     @property
     def num_rows(self) -> int:
@@ -109,6 +117,187 @@ class CSVBase(FileBase):
         """
         return len(self.rows)
 
+    def _rows_source(self) -> Iterable[R]:
+        """
+        :return: The rows that are used by the helper methods of this class
+            when they are not provided with rows explicitly. Readers that
+            stream their rows override this to avoid materializing them.
+        """
+        return self.rows
+
+    def _update_indexes(self) -> None:
+
+        for index in self._indexes.values():
+            index.update(self._rows)
+
+        for sorted_index in self._sorted_indexes.values():
+            sorted_index.update(self._rows)
+
+    def _index_fingerprint(self) -> str:
+        """
+        :return: A fingerprint of how the rows are read, saved with the
+            persisted indexes, so that the indexes of rows read differently
+            are not loaded. Readers override this.
+        """
+        return ""
+
+    def __load_index(self, columns: FN) -> Optional[HashIndex]:
+
+        saved = load_json_sidecar(self.filepath, INDEX_SUFFIX)
+        rows = self.rows
+
+        if (
+            saved is None
+            or saved["num_rows"] != len(rows)
+            or saved.get("fingerprint") != self._index_fingerprint()
+        ):
+            return None
+
+        data = saved["indexes"].get("\x1f".join(columns))
+
+        if data is None:
+            return None
+
+        return HashIndex.from_dict(rows, data)
+
+    def __save_index(self, index: HashIndex) -> None:
+
+        saved = load_json_sidecar(self.filepath, INDEX_SUFFIX)
+        fingerprint = self._index_fingerprint()
+
+        if (
+            saved is None
+            or saved["num_rows"] != index.size
+            or saved.get("fingerprint") != fingerprint
+        ):
+            saved = {
+                "num_rows": index.size,
+                "fingerprint": fingerprint,
+                "indexes": {},
+            }
+
+        saved["indexes"]["\x1f".join(index.columns)] = index.to_dict()
+        save_json_sidecar(self.filepath, INDEX_SUFFIX, saved)
+
+    def create_index(
+        self, columns: Union[str, FN], persist: bool = False
+    ) -> HashIndex:
+        """
+        Create an index of the rows by the values of one or more columns, to
+        look up the rows that have given values without scanning all the rows
+        on every lookup.
+
+        The index is built once and kept up to date with the rows appended to
+        :py:attr:`rows` afterwards. It is also used by
+        :py:meth:`rows_from_column_key` for the column it indexes, if it
+        indexes a single column.
+
+        :param columns: Column heading of the column to index the rows by, or
+            a list of column headings for an index on multiple columns.
+        :type columns: required
+
+        :param persist: If :obj:`True` the index is saved to a sidecar file
+            next to the CSV, named after it with the ``.csvio-index.json``
+            extension, and loaded from it instead of being built by subsequent
+            calls, as long as the path, size and modification time of the CSV
+            and the number of rows are unchanged, and the rows are read in the
+            same way, with the same ``processors``, ``columns``, ``where``
+            filter and ``schema`` among the other arguments of the reader.
+            The index is built again otherwise. Indexes whose keys cannot be
+            saved as JSON values are not saved.
+        :type persist: optional
+
+        :return: The :py:class:`~csvio.indexes.HashIndex` created.
+
+        Usage:
+
+        .. code-block:: python
+
+            >>> from csvio import CSVReader
+            >>> reader = CSVReader("fruit_stock.csv")
+            >>> index = reader.create_index("Fruit")
+            >>> index["Mango"]
+            [{'Supplier': 'Long Mangoes', 'Fruit': 'Mango', 'Quantity': '3'}]
+            >>> index = reader.create_index(["Supplier", "Fruit"])
+            >>> index[("Big Apple", "Apple")]
+            [{'Supplier': 'Big Apple', 'Fruit': 'Apple', 'Quantity': '1'}]
+        """
+
+        if isinstance(columns, str):
+            columns = [columns]
+
+        index = self.__load_index(columns) if persist else None
+
+        if index is None:
+
+            index = HashIndex(self.rows, columns)
+
+            if persist:
+                self.__save_index(index)
+
+        self._indexes[tuple(columns)] = index
+
+        return index
+
+    def index(self, columns: Union[str, FN]) -> Optional[HashIndex]:
+        """
+        :return: The index created with :py:meth:`create_index` for
+            ``columns``, or :obj:`None` if there is none.
+        """
+
+        if isinstance(columns, str):
+            columns = [columns]
+
+        return self._indexes.get(tuple(columns))
+
+    def create_sorted_index(
+        self, column: str, key: Callable[[Any], Any] = None
+    ) -> SortedIndex:
+        """
+        Create an index of the rows sorted by the values of a column, to find
+        the rows whose values are in a range, or start with a prefix, with a
+        binary search instead of a scan of all the rows.
+
+        The index is built once and kept up to date with the rows appended to
+        :py:attr:`rows` afterwards.
+
+        :param column: Column heading of the column to sort the rows by.
+        :type column: required
+
+        :param key: A function that converts the values of the column to the
+            values to sort them by, if they are not converted when they are
+            read. See :py:class:`~csvio.indexes.SortedIndex`.
+        :type key: optional
+
+        :return: The :py:class:`~csvio.indexes.SortedIndex` created.
+
+        Usage:
+
+        .. code-block:: python
+
+            >>> from csvio import CSVReader
+            >>> reader = CSVReader("fruit_stock.csv")
+            >>> by_quantity = reader.create_sorted_index("Quantity", key=int)
+            >>> [row["Fruit"] for row in by_quantity.range(2, 3)]
+            ['Melons', 'Mango']
+            >>> by_fruit = reader.create_sorted_index("Fruit")
+            >>> [row["Fruit"] for row in by_fruit.prefix("M")]
+            ['Mango', 'Melons']
+        """
+
+        index = self._sorted_indexes[column] = SortedIndex(
+            self.rows, column, key
+        )
+
+        return index
+
+    def sorted_index(self, column: str) -> Optional[SortedIndex]:
+        """
+        :return: The index created with :py:meth:`create_sorted_index` for
+            ``column``, or :obj:`None` if there is none.
+        """
+        return self._sorted_indexes.get(column)
+
     def _init_kwargs_dict(
         self, dict_to_update: Dict[str, Any], args_dict: KW
     ) -> None:
@@ -119,7 +308,7 @@ class CSVBase(FileBase):
                 dict_to_update[arg] = value
 
     def rows_from_column_key(
-        self, column_name: str, rows: RS = None
+        self, column_name: str, rows: Iterable[R] = None
     ) -> Dict[str, RS]:
         """
         Collect all the rows in the ``rows`` parameter that have the same
@@ -142,17 +331,86 @@ class CSVBase(FileBase):
         :return: A dictionary constructed using the logic as explained above.
         """
 
+        if rows is None and (column_name,) in self._indexes:
+            return self._indexes[(column_name,)].groups()
+
         ret_dict: Dict[str, RS] = {}
-        rows = rows or self.rows
+
+        if rows is None:
+            rows = self._rows_source()
 
         for row in rows:
             ret_dict.setdefault(row[column_name], []).append(row)
 
         return ret_dict
 
+    def group_by(
+        self,
+        columns: Union[str, FN],
+        rows: Iterable[R] = None,
+        max_groups: int = MAX_GROUPS,
+        partitions: int = PARTITIONS,
+        tmp_dir: str = None,
+    ) -> GroupBy:
+        """
+        Group the rows that have the same values of the ``columns``, to
+        aggregate the values of each group with
+        :py:meth:`~csvio.aggregation.GroupBy.agg`.
+
+        Unlike :py:meth:`rows_from_column_key`, only the accumulators of the
+        aggregations are kept for each group, and the rows of a reader
+        constructed with ``lazy=True`` are streamed and not kept.
+
+        :param columns: Column heading, or list of column headings, of the
+            columns whose values define the groups.
+        :type columns: required
+
+        :param rows: Rows to group. They are iterated by every aggregation,
+            so an iterator can only be aggregated once.
+        :type rows: optional. If not provided
+            :obj:`self.rows` will be used.
+
+        :param max_groups: Maximum number of groups held in memory, before
+            they are spilled to temporary files.
+        :type max_groups: optional
+
+        :param partitions: Number of temporary files the groups are spilled
+            to.
+        :type partitions: optional
+
+        :param tmp_dir: Directory of the temporary files.
+        :type tmp_dir: optional
+
+        :return: A :py:class:`~csvio.aggregation.GroupBy` of the rows.
+
+        Usage:
+
+        .. code-block:: python
+
+            >>> from csvio import CSVReader
+            >>> reader = CSVReader("fruit_stock.csv", lazy=True)
+            >>> reader.group_by("Supplier").agg(count=True, mean="Quantity")
+            [{'Supplier': 'Big Apple', 'count': 1, 'mean_Quantity': 1.0}, ...]
+        """
+
+        if isinstance(columns, str):
+            columns = [columns]
+
+        return GroupBy(
+            lambda: self._rows_source() if rows is None else rows,
+            columns,
+            max_groups,
+            partitions,
+            tmp_dir,
+            self.fieldnames,
+        )
+
     def rows_to_nested_dicts(
-        self, column_order: List[str], rows: RS = None
-    ) -> Dict[str, Any]:
+        self,
+        column_order: List[str],
+        rows: Iterable[R] = None,
+        lazy: bool = False,
+    ) -> Union[Dict[str, Any], NestedGroups]:
         """
         Collect all values of columns that are the same and construct a nested
         dictionary that has the common values as the keys, in the same order of
@@ -160,6 +418,12 @@ class CSVBase(FileBase):
 
         The value of the last column name in the `column_order` list
 
+        The rows are grouped in a single pass by the tuple of the values of
+        their columns, and the hierarchy is built from the groups. The groups
+        of an index created with :py:meth:`create_index` on the columns of
+        ``column_order``, in the same order, are used when ``rows`` is not
+        provided, without reading the rows again.
+
         :param column_order: An ordered list of column names, to be used for
             constructing the dictionary
         :type column_order: required
@@ -169,6 +433,11 @@ class CSVBase(FileBase):
         :type rows: optional. If not provided
             :obj:`self.rows` will be used.
 
+        :param lazy: If :obj:`True` a :py:class:`~csvio.indexes.NestedGroups`
+            is returned instead of a dictionary, which builds each level of
+            the hierarchy only when it is accessed.
+        :type lazy: optional
+
         :return: A dictionary with same column values collected under a common
             key in a hierarchical order.
 
@@ -179,21 +448,34 @@ class CSVBase(FileBase):
             :end-before: end-rows_to_nested_dicts
         """
 
-        rows = rows or self.rows
+        index = self.index(column_order) if rows is None else None
 
-        if len(column_order) == 1:
+        if index is not None and lazy:
+            return index.nested()
+
+        if len(column_order) == 1 and not lazy:
             return self.rows_from_column_key(column_order[0], rows)
 
-        ret_dict: Dict[str, Any] = {}
+        if index is not None:
+            groups = index.groups()
+        else:
+            groups = group_rows(
+                self._rows_source() if rows is None else rows, column_order
+            )
 
-        for row in self.rows:
+        if lazy:
+            return NestedGroups(groups, len(column_order))
+
+        ret_dict: Dict[str, Any] = {}
+        last = len(column_order) - 1
 
-            temp_dict = ret_dict.setdefault(row[column_order[0]], {})
+        for key, group in groups.items():
 
-            for column in column_order[1:-1]:
+            temp_dict = ret_dict
 
-                temp_dict = temp_dict.setdefault(row[column], {})
+            for depth in range(last):
+                temp_dict = temp_dict.setdefault(key[depth], {})
 
-            temp_dict.setdefault(row[column_order[-1]], []).append(row)
+            temp_dict[key[last]] = group
 
         return ret_dict
@@ -22,13 +22,335 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 import csv
+import io
+import locale
+import os
+import random
+import time
 import traceback
-from typing import List
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import (
+    Any,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+    Type,
+    Union,
+)
 
+from .badrows import BadRows
+from .columnar import Column, ColumnStore
 from .csvbase import CSVBase
+from .dedup import Deduplicator
+from .indexes import HashIndex, OffsetIndex
+from .interning import Cardinality, Interner
 from .processors.processor_base import ProcessorBase
+from .profiling import TOP_K, ColumnProfile, ColumnProfiler
+from .records import Record, record_class
+from .schema import BATCH_SIZE, BatchConverter, Schema
+from .utils.cache import RowCache, fingerprint_digest
+from .utils.compression import TEXT_KWARGS, compression_from_magic, open_file
+from .utils.executors import map_bounded
+from .utils.filters import ValuesFilter, Where, compile_where
+from .utils.ranges import (
+    ByteRange,
+    next_record_start,
+    record_offsets,
+    split_record_ranges,
+)
+from .utils.sampling import reservoir_sample
+from .utils.sidecar import (
+    file_signature,
+    load_array_sidecar,
+    load_json_sidecar,
+    save_array_sidecar,
+    save_json_sidecar,
+    sidecar_path,
+)
 from .utils.types import FN, KW, RS, R
 
+DIALECT_ATTRS = (
+    "delimiter",
+    "doublequote",
+    "escapechar",
+    "lineterminator",
+    "quotechar",
+    "quoting",
+    "skipinitialspace",
+)
+SNIFF_SIZE = 1 << 16
+HEADER_CACHE_SUFFIX = "csvio-header.json"
+INTERN_MAX_CARDINALITY = 1000
+OFFSET_INDEX_SUFFIX = "csvio-offsets"
+QUARANTINE_SUFFIX = "csvio-quarantine.csv"
+
+
+class _RowParser:
+    """
+    Build the row dictionaries, or records, from the lists of values
+    tokenized by :py:func:`csv.reader`, keeping only the selected columns.
+    """
+
+    def __init__(
+        self,
+        header: FN,
+        columns: FN,
+        csv_kwargs: KW,
+        where: Optional[Where] = None,
+        compact: bool = False,
+        schema: Optional[Schema] = None,
+        interner: Optional[Interner] = None,
+        bad_rows: Optional[BadRows] = None,
+        dedup: Optional[Deduplicator] = None,
+    ) -> None:
+
+        self.header = header
+        self.columns = columns or header
+        self.restval: Any = csv_kwargs.get("restval")
+        self.reader_kwargs = {
+            k: v
+            for k, v in csv_kwargs.items()
+            if k not in ("restkey", "restval")
+        }
+
+        positions = {fieldname: i for i, fieldname in enumerate(header)}
+        missing = [c for c in self.columns if c not in positions]
+
+        if missing:
+            raise ValueError(f"Columns not found in the CSV: {missing}")
+
+        self.indices: Optional[List[int]] = None
+
+        if self.columns != header:
+            self.indices = [positions[c] for c in self.columns]
+
+        self.where: Optional[ValuesFilter] = None
+
+        if where is not None:
+            self.where = compile_where(where, header)
+
+        self.record: Optional[Type[Record]] = None
+
+        if compact:
+            self.record = record_class(tuple(self.columns))
+
+        self.convert: Optional[BatchConverter] = None
+
+        if schema is not None:
+            self.convert = schema.batch_converter(self.columns)
+
+        self.interner = interner
+        self.bad_rows = bad_rows
+        self.dedup = dedup
+        self.key_indices: Optional[List[int]] = None
+
+        if dedup is not None and dedup.columns:
+
+            missing = [c for c in dedup.columns if c not in positions]
+
+            if missing:
+                raise ValueError(f"Columns not found in the CSV: {missing}")
+
+            self.key_indices = [positions[c] for c in dedup.columns]
+
+    def csv_reader(self, fh: TextIO) -> Iterator[List[str]]:
+
+        if self.bad_rows is not None:
+            return self.bad_rows.guard(
+                fh, lambda lines: csv.reader(lines, **self.reader_kwargs)
+            )
+
+        return csv.reader(fh, **self.reader_kwargs)
+
+    def __values(
+        self, csv_reader: Iterator[List[str]], records: List[int] = None
+    ) -> Iterator[List[Any]]:
+        """
+        Yield the values of the selected columns of the rows that pass the
+        filter, appending their record numbers to ``records`` if provided.
+        """
+
+        indices = self.indices
+        width = len(self.header)
+        restval = self.restval
+        where = self.where
+        interner = self.interner
+        dedup = self.dedup
+        key_indices = self.key_indices
+
+        for number, values in enumerate(csv_reader, 1):
+
+            if not values:
+                continue
+
+            if len(values) < width:
+                values += [restval] * (width - len(values))
+
+            if where is not None and not where(values):
+                continue
+
+            if dedup is not None:
+
+                if key_indices is not None:
+                    key = tuple([values[i] for i in key_indices])
+                else:
+                    key = tuple(values[:width])
+
+                if not dedup.add(key):
+                    continue
+
+            if indices is not None:
+                values = [values[i] for i in indices]
+            elif len(values) > width:
+                del values[width:]
+
+            if interner is not None:
+                interner.intern_values(values)
+
+            if records is not None:
+                records.append(number)
+
+            yield values
+
+    def parse_rows(self, csv_reader: Iterator[List[str]]) -> Iterator[R]:
+
+        convert = self.convert
+
+        if convert is None:
+            rows: Iterable[Any] = self.__values(csv_reader)
+        else:
+            rows = self.__converted_values(csv_reader, convert)
+
+        return self.__build(rows)
+
+    def sample_rows(
+        self, csv_reader: Iterator[List[str]], k: int, rng: random.Random
+    ) -> Iterator[R]:
+        """
+        Select a uniform random sample of ``k`` of the rows that pass the
+        filter, building only the selected rows.
+        """
+
+        def numbered() -> Iterator[Tuple[int, List[Any]]]:
+
+            records: List[int] = []
+
+            for values in self.__values(csv_reader, records):
+                yield records.pop(), values
+
+        sample = reservoir_sample(numbered(), k, rng)
+        rows: Iterable[Any] = [values for _, values in sample]
+
+        if self.convert is not None and sample:
+            rows = self.convert(
+                [values for _, values in sample],
+                [number for number, _ in sample],
+            )
+
+        return self.__build(rows)
+
+    def __build(self, rows: Iterable[Any]) -> Iterator[R]:
+
+        columns = self.columns
+        record = self.record
+
+        if record is None:
+            for values in rows:
+                yield dict(zip(columns, values))
+        else:
+            for values in rows:
+                yield record._make(values)  # type: ignore
+
+    def __converted_values(
+        self, csv_reader: Iterator[List[str]], convert: BatchConverter
+    ) -> Iterator[Any]:
+
+        records: List[int] = []
+        values = self.__values(csv_reader, records)
+
+        while True:
+
+            batch = list(islice(values, BATCH_SIZE))
+
+            if not batch:
+                break
+
+            yield from convert(batch, records)
+            records.clear()
+
+
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(processors: Dict[str, Any], state: Dict[str, Any]) -> None:
+
+    ProcessorBase.processors.update(processors)
+    _worker_state.update(state)
+
+
+def _read_range(byte_range: ByteRange) -> Tuple[RS, KW]:
+
+    filepath = _worker_state["filepath"]
+    parser: _RowParser = _worker_state["parser"]
+    processors = _worker_state["processors"]
+    open_kwargs = _worker_state["open_kwargs"]
+    schema: Optional[Schema] = _worker_state["schema"]
+
+    if schema is not None:
+        schema.errors, schema.error_count = [], 0
+
+    if parser.interner is not None:
+        parser.interner.reset()
+
+    if parser.bad_rows is not None:
+        parser.bad_rows.reset()
+
+    start, end = byte_range
+    rows: RS = []
+
+    with open(filepath, "rb") as fh:
+        fh.seek(start)
+        data = fh.read(end - start)
+
+    text_kwargs = {k: v for k, v in open_kwargs.items() if k in TEXT_KWARGS}
+
+    try:
+        with io.TextIOWrapper(io.BytesIO(data), **text_kwargs) as fh:
+            rows.extend(parser.parse_rows(parser.csv_reader(fh)))
+
+    except csv.Error:
+
+        print("\nCSV Reader Error: {} {}\n".format(filepath, byte_range))
+        traceback.print_exc()
+
+    if processors:
+
+        for processor in processors:
+            rows = processor.process_rows(rows)
+
+    stats: KW = {}
+
+    if schema is not None:
+        stats["schema_errors"] = (schema.errors, schema.error_count)
+
+    if parser.interner is not None:
+        stats["interner"] = parser.interner
+
+    if parser.bad_rows is not None:
+        stats["bad_rows"] = (
+            parser.bad_rows.errors,
+            parser.bad_rows.error_count,
+        )
+
+    return rows, stats
+
 
 class CSVReader(CSVBase):
     """
@@ -65,6 +387,225 @@ class CSVReader(CSVBase):
         DictReader constructor within this class.
     :type csv_kwargs: optional
 
+    :param lazy:
+        If :obj:`True` the rows are not read when the object is constructed.
+        They are instead parsed and processed one at a time as they are
+        consumed from :py:meth:`~csvio.CSVReader.iter_rows`, or by iterating
+        over the reader object itself, keeping memory usage constant
+        regardless of the size of the CSV.
+        :py:attr:`~csvio.CSVReader.num_rows`,
+        :py:meth:`~csvio.csvbase.CSVBase.rows_from_column_key` and
+        :py:meth:`~csvio.csvbase.CSVBase.rows_to_nested_dicts` consume the
+        stream without storing it. Accessing
+        :py:attr:`~csvio.CSVReader.rows` materializes all the rows in memory.
+    :type lazy: optional
+
+    :param workers:
+        Number of processes to use for parsing the CSV. If more than one, the
+        CSV is split into byte ranges that start and end on record
+        boundaries, and each range is parsed and processed in a separate
+        process, with at most ``parallel_range_size`` bytes per range.
+        Processor functions must be importable by the worker processes, which
+        is always the case on platforms that use the *fork* start method.
+        Quotes in the CSV must be escaped by doubling them and the file
+        encoding must represent newlines and quote characters as single
+        bytes, as is the case with UTF-8.
+    :type workers: optional
+
+    :param ordered:
+        Only used if ``workers`` is more than one. If :obj:`False` the rows
+        of each byte range are yielded as soon as it is parsed, instead of in
+        the order in which they appear in the CSV.
+    :type ordered: optional
+
+    :param sniff:
+        If :obj:`True` and no ``dialect`` is provided in ``csv_kwargs``, the
+        dialect of the CSV is detected from a sample of its contents using
+        :py:class:`csv.Sniffer`. The detected dialect parameters are added to
+        :py:attr:`~csvio.CSVReader.csv_kwargs`, without replacing the ones
+        that are already provided.
+    :type sniff: optional
+
+    :param header_cache:
+        If :obj:`True` the detected dialect and the column headings are saved
+        to a sidecar file next to the CSV, named after it with the
+        ``.csvio-header.json`` extension. Readers subsequently constructed for
+        the same CSV use the saved values, without sniffing the dialect or
+        reading the column headings separately, as long as the path, size and
+        modification time of the CSV are unchanged.
+    :type header_cache: optional
+
+    :param columns:
+        A list of column headings to read from the CSV, in the order in which
+        they should appear in the rows. The values of the other columns are
+        discarded as soon as a row is tokenized, without being added to the
+        row dictionaries or passed to the ``processors``.
+        :py:attr:`~csvio.CSVReader.fieldnames` returns this list if it is
+        provided.
+    :type columns: optional
+
+    :param where:
+        A filter for the rows to read. Rows that do not pass the filter are
+        discarded as soon as they are tokenized, before the row dictionaries
+        are built and before the ``processors`` are applied. The filter is
+        compared against the unprocessed values of all the columns in the
+        CSV, and can be either of:
+
+        * A function that accepts a read only mapping of column headings to
+          the values of a row, and returns :obj:`True` if the row should be
+          kept. The mapping is reused for every row and must not be stored.
+        * A ``(column, operator, value)`` tuple, or a list of such tuples that
+          must all be met. The supported operators are ``==``, ``!=``, ``<``,
+          ``<=``, ``>``, ``>=``, ``in``, ``not in``, ``contains``,
+          ``startswith`` and ``endswith``. If ``value`` is an :obj:`int` or a
+          :obj:`float` (or a collection of them for ``in`` and ``not in``),
+          the values in the column are converted to the same type before
+          they are compared, and the rows for which the conversion fails are
+          discarded.
+
+        The conditions are compiled to a single function once, before any row
+        is read.
+
+        .. code-block:: python
+
+            >>> reader = CSVReader(
+            ...     "fruit_stock.csv",
+            ...     where=[("Fruit", "in", {"Apple", "Mango"}), ("Quantity", ">", 1)],
+            ... )
+            >>> [row["Supplier"] for row in reader.rows]
+            ['Long Mangoes']
+
+    :type where: optional
+
+    :param compact_rows:
+        If :obj:`True` each row is represented by a
+        :py:class:`~csvio.records.Record` instead of a dictionary. Records
+        store the values of a row in a tuple and share the column headings
+        with all the other rows, which takes a fraction of the memory of a
+        dictionary for CSVs with many rows. Values are still accessed with
+        ``row["column"]``.
+    :type compact_rows: optional
+
+    :param columnar:
+        If :obj:`True` the rows are stored column by column in a
+        :py:class:`~csvio.columnar.ColumnStore`, which is then returned by
+        :py:attr:`~csvio.CSVReader.rows`. Columns of :obj:`int` or
+        :obj:`float` values, for example those converted by a processor, are
+        stored in arrays of numbers, and other columns store each distinct
+        value once. The rows are only built when they are accessed, and
+        whole column operations are available using
+        :py:meth:`~csvio.CSVReader.column`.
+    :type columnar: optional
+
+    :param schema:
+        A :py:class:`~csvio.schema.Schema` used to convert the values of the
+        columns to their types as they are read, before the ``processors``
+        are applied. The values are converted a batch of rows at a time with
+        converters specialized for each type, which is considerably faster
+        than converting them one at a time with a
+        :py:class:`~csvio.processors.field_processor.FieldProcessor`. A
+        dictionary mapping column headings to types can be passed instead,
+        as a shorthand for ``Schema(types)``, as can ``"infer"`` for
+        ``Schema(infer=True)``. The schema is available as the ``schema``
+        attribute of the reader, along with the values that could not be
+        converted.
+    :type schema: optional
+
+    :param intern_columns:
+        A list of column headings of columns with few distinct values, such
+        as countries or statuses, whose equal values should share a single
+        object in all the rows instead of a new string per row. This reduces
+        the memory used by the rows, and speeds up grouping and comparing
+        them by these columns. If :obj:`True`, all the columns of text values
+        are interned until they have more than ``intern_max_cardinality``
+        distinct values, which is 1000 by default. The number of distinct
+        values found in each column is returned by
+        :py:attr:`~csvio.CSVReader.cardinality`. With ``workers`` more than
+        one, values are shared between the rows of each byte range read by a
+        worker.
+    :type intern_columns: optional
+
+    :param follow:
+        If :obj:`True` the CSV is expected to be appended to by other
+        processes while it is read, for example by
+        :py:meth:`~csvio.CSVWriter.flush`. Only the records that are
+        terminated by a newline are read, and the byte position at which the
+        last of them ends is remembered, so that
+        :py:meth:`~csvio.CSVReader.refresh` and
+        :py:meth:`~csvio.CSVReader.follow_rows` read only the records
+        appended after it. A last record that is still being written is read
+        once it is complete, and is not read by any other method before.
+        CSVs read with ``follow=True`` are always read by a single process.
+    :type follow: optional
+
+    :param cache:
+        If :obj:`True` the rows read are stored in a
+        :py:class:`~csvio.utils.cache.RowCache` in the user's cache
+        directory, and loaded from it by readers constructed later for the
+        same CSV, instead of reading it again, as long as the path, size and
+        modification time of the CSV are unchanged and the reader is
+        constructed with the same arguments and processor functions. The
+        path of a directory to store the rows in, or a
+        :py:class:`~csvio.utils.cache.RowCache` to limit the size of the
+        cache, can be passed instead. The rows are only cached when they are
+        all read, and the conversion errors of the ``schema`` are not
+        restored with them.
+    :type cache: optional
+
+    :param compression:
+        Compression format of the CSV, ``gzip``, ``bz2`` or ``xz``, to
+        decompress it on the fly while it is read. By default the format is
+        detected from the extension of the CSV, such as ``.csv.gz``, or from
+        the bytes it starts with. :obj:`None` reads the CSV uncompressed.
+        Compressed CSVs are always read by a single process, and cannot be
+        read with ``follow=True`` or with an offset index.
+    :type compression: optional
+
+    :param on_bad_row:
+        What to do with the records that cannot be tokenized, such as records
+        with an unbalanced quote. By default the traceback of the error is
+        printed and reading stops. ``raise`` raises a
+        :py:class:`~csvio.errors.BadRowError`, ``skip`` rejects the first line
+        of the record and continues reading from the next line, and
+        ``quarantine`` also writes the rejected lines to the file at
+        ``quarantine_path``. The rejected lines are counted in
+        :py:attr:`bad_rows`, a :py:class:`~csvio.badrows.BadRows`. Rows read
+        with rejected lines are not saved to the row ``cache``.
+    :type on_bad_row: optional
+
+    :param quarantine_path:
+        Path of the CSV file the rejected lines are written to with
+        ``on_bad_row="quarantine"``. Defaults to the path of the CSV with
+        the ``.csvio-quarantine.csv`` extension added. The file and the count
+        of rejected lines start over every time the CSV is read from its
+        start.
+    :type quarantine_path: optional
+
+    :param dedup:
+        Drop the rows whose values were already read, before they are built
+        or passed to the ``processors``. :obj:`True` compares all the values
+        of the rows, and a list of column headings compares the values of
+        those columns. Only a hash of the values of each row is kept, in a
+        :py:class:`~csvio.dedup.Deduplicator`, which can also be passed to
+        use the Bloom filter mode or to drop the rows already read from
+        other CSVs. A deduplicator created by the reader is emptied every
+        time the CSV is read from its start, while one that is passed is
+        never emptied by the reader. The reader then does not use the row
+        ``cache``. CSVs are always read by a single process with ``dedup``.
+    :type dedup: optional
+
+    :param index_columns:
+        A list of the columns to index the rows by, each a column heading or
+        a list of column headings, as passed to
+        :py:meth:`~csvio.csvbase.CSVBase.create_index`. The indexes are built
+        while the rows are read, instead of by another pass over the rows
+        once they are read, and are then used by
+        :py:meth:`~csvio.csvbase.CSVBase.rows_from_column_key` and
+        :py:meth:`~csvio.csvbase.CSVBase.rows_to_nested_dicts` for their
+        columns. The rows of a reader constructed with ``lazy=True`` are
+        indexed when they are first stored in :py:attr:`rows`.
+    :type index_columns: optional
+
     """
 
     def __init__(
@@ -74,62 +615,1342 @@ class CSVReader(CSVBase):
         fieldnames: FN = [],
         open_kwargs: KW = {},
         csv_kwargs: KW = {},
+        lazy: bool = False,
+        workers: int = 1,
+        ordered: bool = True,
+        sniff: bool = False,
+        header_cache: bool = False,
+        columns: FN = [],
+        where: Where = None,
+        compact_rows: bool = False,
+        columnar: bool = False,
+        schema: Union[Schema, Dict[str, str], str] = None,
+        intern_columns: Union[FN, bool] = [],
+        follow: bool = False,
+        cache: Union[bool, str, RowCache] = False,
+        compression: Optional[str] = "infer",
+        on_bad_row: str = None,
+        quarantine_path: str = None,
+        dedup: Union[bool, FN, Deduplicator] = False,
+        index_columns: List[Union[str, FN]] = [],
     ) -> None:
 
-        super().__init__(filename, open_kwargs, csv_kwargs)
+        super().__init__(filename, open_kwargs, dict(csv_kwargs))
 
         self.processors = processors
-        self.fieldnames = fieldnames or self.__get_fieldnames()
-        self.rows = self.__get_rows()
+        self.lazy = lazy
+        self.workers = workers
+        self.ordered = ordered
+        self.parallel_range_size = 1 << 26
+        self.sniff = sniff and "dialect" not in self.csv_kwargs
+        self.header_cache = header_cache
+        self.columns = list(columns)
+        self.where = where
+        self.compact_rows = compact_rows
+        self.columnar = columnar
+        self.schema = self.__get_schema(schema)
+        self.intern_columns = intern_columns
+        self.intern_max_cardinality = INTERN_MAX_CARDINALITY
+        self.follow = follow
+        self.cache = self.__get_cache(cache)
+        self.compression = self.__get_compression(compression)
+        self.bad_rows = self.__get_bad_rows(on_bad_row, quarantine_path)
+        self._owns_dedup = not isinstance(dedup, Deduplicator)
+        self.dedup = self.__get_dedup(dedup)
+        self.index_columns = [
+            [columns] if isinstance(columns, str) else list(columns)
+            for columns in index_columns
+        ]
+        self.fieldnames = fieldnames
 
-    def __get_fieldnames(self) -> FN:
+        if follow and self.compression is not None:
+            raise ValueError(
+                "follow=True is not supported for compressed CSVs"
+            )
+
+        self._materialized = False
+        self._dialect: Optional[KW] = None
+        self._interner: Optional[Interner] = None
+        self._offset_index: Optional[OffsetIndex] = None
+        self._read_offset: Optional[int] = None
+
+        if header_cache:
+            self.__load_header_cache()
+
+        if not self._fieldnames and (lazy or self.__parallel()):
+            self.fieldnames = self.__get_fieldnames()
+
+        if not lazy:
+            self.rows = self.__get_rows()
+
+    def __iter__(self) -> Iterator[R]:
 
-        fieldnames: FN = []
+        if self._materialized:
+            return iter(self.rows)
+
+        return self.iter_rows()
+
+    @property
+    def fieldnames(self) -> FN:
+        """
+        :return: List of column headings. Only the headings listed in the
+            ``columns`` parameter are returned, if it is provided.
+        """
+        return list(self.columns or self._fieldnames)
+
+    @fieldnames.setter
+    def fieldnames(self, fieldnames: FN) -> None:
+        self._fieldnames = fieldnames
+
+    @property
+    def rows(self) -> RS:
+        """
+        :return: A list of dictionaries where each item in it represents a row
+            in the CSV file. Each dictionary in the list maps the column
+            heading (fieldname) to the corresponding value for it from the CSV.
+
+            For a reader constructed with ``lazy=True``, all the rows are read
+            into memory the first time this property is accessed.
+        """
+        if not self._materialized:
+            self.rows = self.__get_rows()
+
+        return self._rows
+
+    @rows.setter
+    def rows(self, rows: RS) -> None:
+        self._rows = rows
+        self._materialized = True
+        self._update_indexes()
+
+    @property
+    def num_rows(self) -> int:
+        """
+        :return: The total number of rows in the CSV (excluding column
+            headings). For a reader constructed with ``lazy=True`` whose rows
+            are not materialized yet, the rows are counted while streaming
+            them from the CSV without storing them.
+        """
+        if self._materialized:
+            return len(self._rows)
+
+        return sum(1 for _ in self.iter_rows())
+
+    @property
+    def cardinality(self) -> Dict[str, Cardinality]:
+        """
+        :return: A dictionary mapping the column headings of the columns
+            interned with ``intern_columns`` to their
+            :py:class:`~csvio.interning.Cardinality`, from the rows read so
+            far.
+
+        Usage:
+
+        .. code-block:: python
+
+            >>> from csvio import CSVReader
+            >>> reader = CSVReader("fruit_stock.csv", intern_columns=["Fruit"])
+            >>> reader.cardinality["Fruit"]
+            Cardinality(distinct=4, rows=4, interned=True)
+        """
+        if self._interner is None:
+            return {}
+
+        return self._interner.cardinality()
+
+    def _rows_source(self) -> Iterable[R]:
+
+        if self._materialized:
+            return self._rows
+
+        return iter(self)
+
+    def __get_schema(
+        self, schema: Union[Schema, Dict[str, str], str, None]
+    ) -> Optional[Schema]:
+
+        if schema is None or isinstance(schema, Schema):
+            return schema
+
+        if schema == "infer":
+            return Schema(infer=True)
+
+        if isinstance(schema, dict):
+            return Schema(schema)
+
+        raise ValueError(f"Unsupported schema: {schema!r}")
+
+    def __get_cache(
+        self, cache: Union[bool, str, RowCache]
+    ) -> Optional[RowCache]:
+
+        if isinstance(cache, RowCache):
+            return cache
+
+        if cache is True:
+            return RowCache()
+
+        if cache:
+            return RowCache(str(cache))
+
+        return None
+
+    def __cache_key(self, cache: RowCache) -> str:
+
+        return cache.key(
+            {
+                "file": file_signature(self.filepath),
+                **self.__read_description(),
+            }
+        )
+
+    def _index_fingerprint(self) -> str:
+
+        return fingerprint_digest(self.__read_description())
+
+    def __read_description(self) -> KW:
+        """
+        :return: A description of how the rows are read from the CSV, that
+            identifies the rows stored in the row ``cache`` or indexed by a
+            persisted index.
+        """
+
+        processors = [
+            (
+                type(processor).__qualname__,
+                processor.handle,
+                ProcessorBase.processors.get(processor.handle),
+            )
+            for processor in self.processors or []
+        ]
+        schema = self.schema
+
+        return {
+            "fieldnames": self._fieldnames,
+            "open_kwargs": self.open_kwargs,
+            "csv_kwargs": self.csv_kwargs,
+            "sniff": self.sniff,
+            "columns": self.columns,
+            "where": self.where,
+            "compact_rows": self.compact_rows,
+            "columnar": self.columnar,
+            "schema": schema
+            and (
+                schema.type_specs(),
+                schema.infer,
+                schema.sample_size,
+                schema.on_error,
+            ),
+            "intern_columns": self.intern_columns,
+            "intern_max_cardinality": self.intern_max_cardinality,
+            "processors": processors,
+            "on_bad_row": self.bad_rows and self.bad_rows.policy,
+            "dedup": self.dedup
+            and (
+                self.dedup.columns,
+                self.dedup.mode,
+                self.dedup.error_rate,
+            ),
+        }
+
+    def __get_dedup(
+        self, dedup: Union[bool, FN, Deduplicator]
+    ) -> Optional[Deduplicator]:
+
+        if isinstance(dedup, Deduplicator):
+            return dedup
+
+        if dedup is True:
+            return Deduplicator()
+
+        if dedup:
+            return Deduplicator(list(dedup))
+
+        return None
+
+    def __get_bad_rows(
+        self, on_bad_row: Optional[str], quarantine_path: Optional[str]
+    ) -> Optional[BadRows]:
+
+        if on_bad_row is None:
+            return None
+
+        if on_bad_row == "quarantine" and quarantine_path is None:
+            quarantine_path = sidecar_path(self.filepath, QUARANTINE_SUFFIX)
+
+        return BadRows(on_bad_row, quarantine_path)
+
+    def __get_compression(self, compression: Optional[str]) -> Optional[str]:
+
+        if compression != "infer":
+            return compression
+
+        return self.file_compression or compression_from_magic(self.filepath)
+
+    def __parallel(self) -> bool:
+
+        return (
+            self.workers > 1
+            and self.compression is None
+            and self.dedup is None
+            and not self.follow
+        )
+
+    def __open(self) -> TextIO:
 
         try:
-            with open(self.filepath, "r", **self.open_kwargs) as fh:
-                csvreader = csv.DictReader(fh, **self.csv_kwargs)
-                fieldnames = csvreader.fieldnames  # type: ignore
+            return open_file(  # type: ignore
+                self.filepath, "r", self.compression, **self.open_kwargs
+            )
 
         except FileNotFoundError:
             print("File to read not found: {}".format(self.filepath))
             exit()
 
-        return fieldnames
+    def __load_header_cache(self) -> None:
 
-    def __get_rows(self) -> RS:
+        cached = load_json_sidecar(self.filepath, HEADER_CACHE_SUFFIX)
 
-        rows: RS = []
+        if cached is None:
+            return
+
+        if self.sniff and cached["dialect"] is not None:
+            self.__set_dialect(cached["dialect"])
+
+        if not self._fieldnames:
+            self.fieldnames = cached["fieldnames"]
+
+    def __save_header_cache(self) -> None:
+
+        save_json_sidecar(
+            self.filepath,
+            HEADER_CACHE_SUFFIX,
+            {"dialect": self._dialect, "fieldnames": self._fieldnames},
+        )
+
+    def __set_dialect(self, dialect: KW) -> None:
+
+        self._dialect = dialect
+        self._init_kwargs_dict(self._csv_kwargs, dialect)
+        self.sniff = False
+
+    def __sniff(self, fh: TextIO) -> None:
+
+        sample = fh.read(SNIFF_SIZE)
+        fh.seek(0)
 
         try:
-            with open(self.filepath, "r", **self.open_kwargs) as fh:
+            dialect = csv.Sniffer().sniff(sample)
+        except csv.Error:
+            self.sniff = False
+            return
+
+        self.__set_dialect(
+            {attr: getattr(dialect, attr) for attr in DIALECT_ATTRS}
+        )
+
+    def __interner(self) -> Optional[Interner]:
+
+        if not self.intern_columns:
+            return None
+
+        if self.intern_columns is not True:
+            return Interner(self.fieldnames, self.intern_columns)
+
+        types = self.schema.types if self.schema is not None else {}
+
+        return Interner(
+            self.fieldnames,
+            [c for c in self.fieldnames if types.get(c, "str") == "str"],
+            self.intern_max_cardinality,
+        )
+
+    def __parser(
+        self,
+        appended: bool = False,
+        detached: bool = False,
+        dedup: Deduplicator = None,
+    ) -> _RowParser:
+        """
+        Create the parser of the rows read from the CSV.
+
+        :param appended: If :obj:`True` the rows are appended to the rows
+            already read, and share their interned values and deduplicator.
+        :type appended: optional
+
+        :param detached: If :obj:`True` the rows are read without changing
+            the state of the reader, for reading records at any position.
+            Their values are not interned, only the duplicates found by
+            ``dedup`` are dropped, and their bad lines are rejected by a copy
+            of :py:attr:`bad_rows` that does not write them.
+        :type detached: optional
+
+        :param dedup: Deduplicator of a detached parser.
+        :type dedup: optional
+        """
+
+        bad_rows = self.bad_rows
+
+        if detached:
+            interner = None
+            bad_rows = bad_rows and bad_rows.copy()
+        else:
+            if not appended or self._interner is None:
+                self._interner = self.__interner()
+
+            if not appended and self.dedup is not None and self._owns_dedup:
+                self.dedup.reset()
+            if not appended and self.bad_rows is not None:
+                self.bad_rows.reset()
+
+            interner, dedup = self._interner, self.dedup
+
+        return _RowParser(
+            self._fieldnames,
+            self.columns,
+            self.csv_kwargs,
+            self.where,
+            self.compact_rows,
+            self.schema,
+            interner,
+            bad_rows,
+            dedup,
+        )
+
+    def __csv_reader(
+        self, fh: TextIO, detached: bool = False
+    ) -> Iterator[List[str]]:
+        """
+        Create a csv reader positioned at the first row after the column
+        headings, reading the column headings from it if they are not known
+        yet.
+
+        :param detached: If :obj:`True` the bad lines are rejected by a copy
+            of :py:attr:`bad_rows` that does not write them, as for the rows
+            of a detached parser.
+        :type detached: optional
+        """
+
+        if self.sniff:
+            self.__sniff(fh)
+
+        bad_rows = self.bad_rows
+
+        if detached:
+            bad_rows = bad_rows and bad_rows.copy()
+
+        csv_reader = _RowParser(
+            [], [], self.csv_kwargs, bad_rows=bad_rows
+        ).csv_reader(fh)
+        header = next(csv_reader, None)
+
+        if not self._fieldnames:
+            self.fieldnames = header or []
+
+            if self.header_cache:
+                self.__save_header_cache()
+
+        return csv_reader
+
+    def __get_fieldnames(self) -> FN:
+
+        with self.__open() as fh:
+            self.__csv_reader(fh)
+
+        return self._fieldnames
+
+    def __process_row(self, row: R) -> R:
+
+        if self.processors:
+
+            for processor in self.processors:
+                row = processor.process_row(row)
+
+        return row
+
+    def __process_rows(self, rows: RS) -> RS:
+
+        if self.processors:
+
+            for processor in self.processors:
+                rows = processor.process_rows(rows)
+
+        return rows
+
+    def __parse_rows(
+        self,
+        csv_reader: Iterator[List[str]],
+        appended: bool = False,
+        detached: bool = False,
+    ) -> Iterator[R]:
+
+        if self.schema is not None:
+            csv_reader = self.schema.sample_rows(self._fieldnames, csv_reader)
+
+        return self.__parser(appended, detached).parse_rows(csv_reader)
+
+    def __complete(
+        self, csv_reader: Iterator[List[str]], start: int = None
+    ) -> Iterator[List[str]]:
+        """
+        Stop ``csv_reader`` at the end of the last record terminated by a
+        newline, for a reader constructed with ``follow=True``, so that a last
+        record that is still being written is only read once it is complete,
+        by :py:meth:`refresh`.
+
+        :param start: Byte position of the record ``csv_reader`` reads next.
+            The first record of the CSV if not provided.
+        :type start: optional
+        """
+
+        if not self.follow:
+            return csv_reader
+
+        quotechar = self.__quotechar()
+
+        if start is None:
+            start = self.__header_end(quotechar)
+
+            if start is None:
+                return iter(())
+
+        with open(self.filepath, "rb") as bfh:
+            _, count, _ = record_offsets(
+                bfh, start, quotechar, 0, complete=True
+            )
+
+        return islice((values for values in csv_reader if values), count)
+
+    def __iter_raw_rows(self) -> Generator[R, None, None]:
+
+        try:
+            with self.__open() as fh:
+
+                csv_reader = self.__complete(self.__csv_reader(fh))
 
-                csv_reader = csv.DictReader(
-                    fh, fieldnames=self.fieldnames, **self.csv_kwargs
+                yield from self.__parse_rows(csv_reader)
+
+        except csv.Error:
+
+            print("\nCSV Reader Error: {}\n".format(self.filepath))
+            traceback.print_exc()
+
+    def __quotechar(self) -> Optional[bytes]:
+
+        reader_kwargs = _RowParser([], [], self.csv_kwargs).reader_kwargs
+        dialect = csv.reader(io.StringIO(), **reader_kwargs).dialect
+
+        if dialect.quoting == csv.QUOTE_NONE or not dialect.quotechar:
+            return None
+
+        encoding = self.open_kwargs.get(
+            "encoding"
+        ) or locale.getpreferredencoding(False)
+
+        return dialect.quotechar.encode(encoding)
+
+    def __iter_parallel_rows(self) -> Iterator[R]:
+
+        quotechar = self.__quotechar()
+        size = os.path.getsize(self.filepath)
+
+        data_start = self.__data_start(quotechar)
+
+        num_ranges = max(
+            self.workers * 4,
+            -(-(size - data_start) // self.parallel_range_size),
+        )
+
+        if self.schema is not None and self.schema.infer:
+            with self.__open() as fh:
+                self.schema.sample_rows(
+                    self._fieldnames, self.__csv_reader(fh)
                 )
-                next(csv_reader)
 
-                for row in csv_reader:
+        parser = self.__parser()
+
+        if self.bad_rows is not None:
+            parser.bad_rows = self.bad_rows.copy()
+
+        worker_state = {
+            "filepath": self.filepath,
+            "parser": parser,
+            "processors": self.processors,
+            "open_kwargs": self.open_kwargs,
+            "schema": self.schema,
+        }
+
+        with ProcessPoolExecutor(
+            self.workers,
+            initializer=_init_worker,
+            initargs=(ProcessorBase.processors, worker_state),
+        ) as executor:
+
+            ranges = split_record_ranges(
+                self.filepath,
+                data_start,
+                size,
+                num_ranges,
+                quotechar,
+                executor,
+            )
+
+            for rows, stats in map_bounded(
+                executor, _read_range, ranges, self.workers * 2, self.ordered
+            ):
+                if "schema_errors" in stats:
+                    self.schema.add_errors(*stats["schema_errors"])  # type: ignore
+
+                if "interner" in stats:
+                    self._interner.merge(stats["interner"])  # type: ignore
+
+                if "bad_rows" in stats:
+                    self.bad_rows.add_errors(*stats["bad_rows"])  # type: ignore
+
+                yield from rows
+
+    def iter_rows(self) -> Iterator[R]:
+        """
+        Read the rows from the CSV one at a time, applying the ``processors``
+        to each row as it is read.
+
+        Only the row being yielded is held in memory, making this suitable for
+        reading CSV files that are too large to be loaded entirely.
+
+        :return: A generator of dictionaries each representing a processed
+            row in the CSV file.
+
+        Usage:
+
+        .. code-block:: python
+
+            >>> from csvio import CSVReader
+            >>> reader = CSVReader("fruit_stock.csv", lazy=True)
+            >>> for row in reader.iter_rows():
+            ...     print(row["Fruit"])
+            Apple
+            Melons
+            Mango
+            Strawberry
+        """
+
+        if self.__parallel():
+            yield from self.__iter_parallel_rows()
+        else:
+            for row in self.__iter_raw_rows():
+                yield self.__process_row(row)
+
+    def iter_chunks(self, chunk_size: int) -> Iterator[RS]:
+        """
+        Read the rows from the CSV in lists of ``chunk_size`` rows.
+
+        The ``processors`` are applied to each chunk as a whole using their
+        :py:meth:`~csvio.processors.processor_base.ProcessorBase.process_rows`
+        method. Only a single chunk is held in memory at a time, and each chunk
+        can be passed directly to bulk consumers such as
+        :py:meth:`~csvio.CSVWriter.add_rows`.
+
+        :param chunk_size: Maximum number of rows in each chunk. The last chunk
+            contains the remaining rows and may be smaller.
+        :type chunk_size: required
+
+        :return: A generator of lists of dictionaries each representing a
+            processed row in the CSV file.
+
+        Usage:
+
+        .. code-block:: python
+
+            >>> from csvio import CSVReader
+            >>> reader = CSVReader("fruit_stock.csv", lazy=True)
+            >>> for chunk in reader.iter_chunks(3):
+            ...     print(len(chunk))
+            3
+            1
+        """
+
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+
+        raw_rows = self.__iter_raw_rows()
+
+        while True:
+
+            chunk = list(islice(raw_rows, chunk_size))
+
+            if not chunk:
+                break
+
+            yield self.__process_rows(chunk)
+
+    def head(self, n: int) -> RS:
+        """
+        Read the first ``n`` rows of the CSV. Reading stops as soon as they
+        are read, so previewing a large CSV does not read the rest of it.
+
+        :param n: Maximum number of rows to read.
+        :type n: required
+
+        :return: A list of the processed rows.
+
+        Usage:
+
+        .. code-block:: python
+
+            >>> from csvio import CSVReader
+            >>> reader = CSVReader("fruit_stock.csv", lazy=True)
+            >>> [row["Fruit"] for row in reader.head(2)]
+            ['Apple', 'Melons']
+        """
+
+        if n < 0:
+            raise ValueError("n must not be negative")
+
+        if self._materialized:
+            return self.rows[:n]
+
+        raw_rows = self.__iter_raw_rows()
+
+        try:
+            rows = list(islice(raw_rows, n))
+        finally:
+            raw_rows.close()
+
+        return self.__process_rows(rows)
+
+    def skip(self, n: int) -> Iterator[R]:
+        """
+        Read the rows of the CSV after the first ``n`` rows, one at a time.
+        The skipped rows are not built or passed to the ``processors``.
+
+        :param n: Number of rows to skip.
+        :type n: required
 
-                    row_dict: R = {}
+        :return: A generator of dictionaries each representing a processed
+            row in the CSV file.
 
-                    for fieldname in self.fieldnames:
-                        row_dict[fieldname] = row[fieldname]
+        Usage:
 
-                    if self.processors:
+        .. code-block:: python
 
-                        temp_row = row_dict
+            >>> from csvio import CSVReader
+            >>> reader = CSVReader("fruit_stock.csv", lazy=True)
+            >>> [row["Fruit"] for row in reader.skip(2)]
+            ['Mango', 'Strawberry']
+        """
 
-                        for processor in self.processors:
-                            temp_row = processor.process_row(temp_row)
+        if n < 0:
+            raise ValueError("n must not be negative")
 
-                        rows.append(temp_row)
-                    else:
-                        rows.append(row_dict)
+        if self._materialized:
+            yield from self.rows[n:]
+            return
+
+        for row in islice(self.__iter_raw_rows(), n, None):
+            yield self.__process_row(row)
+
+    def __sample_dedup(self) -> Optional[Deduplicator]:
+        """
+        :return: A new deduplicator with the settings of the reader's, to
+            drop the duplicates of the rows sampled without changing it.
+        """
+
+        if self.dedup is None:
+            return None
+
+        return Deduplicator(
+            self.dedup.columns,
+            self.dedup.mode,
+            self.dedup.capacity,
+            self.dedup.error_rate,
+        )
+
+    def sample(self, k: int, seed: Any = None) -> RS:
+        """
+        Select a uniform random sample of ``k`` rows of the CSV.
+
+        The CSV is read in a single pass holding only the ``k`` selected rows
+        in memory, and only the selected rows are built and passed to the
+        ``processors``, so a sample of a CSV too large to be loaded can be
+        taken with ``lazy=True``. The ``where`` filter is applied before the
+        rows are selected. Sampling does not change the state of the reader:
+        the values of the sample are not interned or counted in
+        :meth:`cardinality`.
+
+        :param k: Number of rows to select.
+        :type k: required
+
+        :param seed: Seed of the random number generator, to select the same
+            rows every time.
+        :type seed: optional
+
+        :return: A list of the selected processed rows, in the order they
+            appear in the CSV. All the rows if there are ``k`` or fewer.
+
+        Usage:
+
+        .. code-block:: python
+
+            >>> from csvio import CSVReader
+            >>> reader = CSVReader("fruit_stock.csv", lazy=True)
+            >>> len(reader.sample(2, seed=42))
+            2
+        """
+
+        if k < 0:
+            raise ValueError("k must not be negative")
+
+        rng = random.Random(seed)
+
+        if self._materialized:
+            return reservoir_sample(self.rows, k, rng)
+
+        rows: RS = []
+
+        try:
+            with self.__open() as fh:
+
+                csv_reader = self.__complete(
+                    self.__csv_reader(fh, detached=True)
+                )
+
+                if self.schema is not None:
+                    csv_reader = self.schema.sample_rows(
+                        self._fieldnames, csv_reader
+                    )
+
+                parser = self.__parser(
+                    detached=True, dedup=self.__sample_dedup()
+                )
+                rows = list(parser.sample_rows(csv_reader, k, rng))
 
         except csv.Error:
 
             print("\nCSV Reader Error: {}\n".format(self.filepath))
             traceback.print_exc()
 
+        return self.__process_rows(rows)
+
+    def __data_start(self, quotechar: Optional[bytes]) -> int:
+
+        with open(self.filepath, "rb") as fh:
+            return next_record_start(fh, 0, 0, quotechar)
+
+    def create_offset_index(
+        self, stride: int = 1, persist: bool = False
+    ) -> OffsetIndex:
+        """
+        Create an index of the byte positions of the records in the CSV, used
+        by :py:meth:`~csvio.CSVReader.read_page` and
+        :py:meth:`~csvio.CSVReader.tail` to read records from any position
+        in the CSV without parsing it from its start.
+
+        The CSV is scanned for the positions of its records once, without
+        being parsed. Quotes in the CSV must be escaped by doubling them and
+        the file encoding must represent newlines and quote characters as
+        single bytes, as is the case with UTF-8.
+
+        :param stride: Record the byte position of every ``stride``-th
+            record only, to reduce the size of the index for very large CSVs.
+            Reading from a record then parses up to ``stride - 1`` records
+            before it.
+        :type stride: optional
+
+        :param persist: If :obj:`True` the index is saved to a sidecar file
+            next to the CSV, named after it with the ``.csvio-offsets``
+            extension, and loaded from it instead of being created by
+            subsequent calls with the same ``stride``, as long as the path,
+            size and modification time of the CSV are unchanged.
+        :type persist: optional
+
+        :return: The :py:class:`~csvio.indexes.OffsetIndex` created.
+        """
+
+        if stride < 1:
+            raise ValueError("stride must be a positive integer")
+
+        if self.compression is not None:
+            raise ValueError(
+                "Offset indexes are not supported for compressed CSVs"
+            )
+
+        if self.sniff or not self._fieldnames:
+            self.__get_fieldnames()
+
+        saved = None
+
+        if persist:
+            saved = load_array_sidecar(self.filepath, OFFSET_INDEX_SUFFIX, "Q")
+
+        if saved is not None and saved[0]["stride"] == stride:
+            data, offsets = saved
+            index = OffsetIndex(
+                offsets, data["num_records"], data["end"], stride
+            )
+
+        else:
+            quotechar = self.__quotechar()
+            start = self.__data_start(quotechar)
+
+            with open(self.filepath, "rb") as fh:
+                offsets, num_records, end = record_offsets(
+                    fh, start, quotechar, stride, complete=self.follow
+                )
+
+            index = OffsetIndex(offsets, num_records, end, stride)
+
+            if persist:
+                save_array_sidecar(
+                    self.filepath,
+                    OFFSET_INDEX_SUFFIX,
+                    {"num_records": num_records, "end": end, "stride": stride},
+                    offsets,
+                )
+
+        self._offset_index = index
+
+        return index
+
+    def __text_kwargs(self) -> KW:
+
+        return {k: v for k, v in self.open_kwargs.items() if k in TEXT_KWARGS}
+
+    def __read_records(self, start: int, count: int, from_end: bool) -> RS:
+
+        text_kwargs = self.__text_kwargs()
+        index = self._offset_index
+
+        if index is not None and from_end:
+            start, from_end = max(0, index.num_records - count), False
+
+        with open_file(self.filepath, "rb", self.compression) as bfh:
+
+            if index is not None:
+                offset, skip = index.locate(start)
+                bfh.seek(offset)
+
+            with io.TextIOWrapper(bfh, **text_kwargs) as fh:
+
+                if index is not None:
+                    csv_reader = self.__complete(
+                        self.__parser(detached=True).csv_reader(fh), offset
+                    )
+                else:
+                    csv_reader = self.__complete(
+                        self.__csv_reader(fh, detached=True)
+                    )
+                    skip = start
+
+                records: Iterable[List[str]] = (
+                    values for values in csv_reader if values
+                )
+
+                if from_end:
+                    records = deque(records, maxlen=count)
+                else:
+                    records = islice(records, skip, skip + count)
+
+                rows = list(self.__parse_rows(iter(records), detached=True))
+
+        return self.__process_rows(rows)
+
+    def read_page(self, start: int, count: int) -> RS:
+        """
+        Read ``count`` records of the CSV from record number ``start``, the
+        first record after the column headings being record number ``0``.
+
+        If an offset index was created with
+        :py:meth:`~csvio.CSVReader.create_offset_index`, the CSV is read from
+        the byte position of the closest record at or before ``start``.
+        Otherwise the records before ``start`` are tokenized and discarded.
+
+        Only the records read are parsed and processed, and the ``where``
+        filter is applied to them after they are read, so a page may contain
+        fewer rows than ``count``. Reading a page does not change the state
+        of the reader, so the values of the page are not interned or counted
+        in :py:attr:`cardinality`, and duplicates are not dropped.
+
+        :param start: Number of the first record to read.
+        :type start: required
+
+        :param count: Maximum number of records to read.
+        :type count: required
+
+        :return: A list of the processed rows.
+
+        Usage:
+
+        .. code-block:: python
+
+            >>> from csvio import CSVReader
+            >>> reader = CSVReader("fruit_stock.csv", lazy=True)
+            >>> index = reader.create_offset_index()
+            >>> [row["Fruit"] for row in reader.read_page(1, 2)]
+            ['Melons', 'Mango']
+        """
+
+        if start < 0 or count < 0:
+            raise ValueError("start and count must not be negative")
+
+        return self.__read_records(start, count, False)
+
+    def tail(self, count: int) -> RS:
+        """
+        Read the last ``count`` records of the CSV, in the same way as
+        :py:meth:`~csvio.CSVReader.read_page`. The records are read from the
+        byte position of the first of them if an offset index was created,
+        and all the records of the CSV are tokenized otherwise.
+
+        :param count: Maximum number of records to read.
+        :type count: required
+
+        :return: A list of the processed rows.
+        """
+
+        if count < 0:
+            raise ValueError("count must not be negative")
+
+        return self.__read_records(0, count, True)
+
+    def __header_end(self, quotechar: Optional[bytes]) -> Optional[int]:
+
+        start = self.__data_start(quotechar)
+
+        with open(self.filepath, "rb") as fh:
+            fh.seek(max(start - 1, 0))
+
+            if fh.read(1) != b"\n":
+                return None
+
+        if self.sniff or not self._fieldnames:
+            self.__get_fieldnames()
+
+        return start
+
+    def __read_appended(self) -> RS:
+        """
+        Read the complete records from the remembered byte position, and
+        remember the byte position at which the last of them ends.
+        """
+
+        quotechar = self.__quotechar()
+        start = self._read_offset
+
+        if start is None:
+            start = self.__header_end(quotechar)
+
+            if start is None:
+                return []
+
+        index = self._offset_index
+
+        with open(self.filepath, "rb") as bfh:
+
+            _, count, end = record_offsets(
+                bfh, start, quotechar, 0, complete=True
+            )
+
+            if index is not None and index.end < end:
+                index.extend(
+                    *record_offsets(
+                        bfh,
+                        index.end,
+                        quotechar,
+                        index.stride,
+                        index.num_records,
+                        complete=True,
+                    )
+                )
+
+            bfh.seek(start)
+
+            with io.TextIOWrapper(bfh, **self.__text_kwargs()) as fh:
+
+                records = (
+                    values
+                    for values in _RowParser(
+                        [], [], self.csv_kwargs, bad_rows=self.bad_rows
+                    ).csv_reader(fh)
+                    if values
+                )
+                rows = list(
+                    self.__parse_rows(
+                        islice(records, count), self._read_offset is not None
+                    )
+                )
+
+        self._read_offset = end
+
+        return self.__process_rows(rows)
+
+    def refresh(self) -> RS:
+        """
+        Read the records appended to the CSV since it was last read, for a
+        reader constructed with ``follow=True``. Only the records that are
+        terminated by a newline are read.
+
+        The rows read are appended to :py:attr:`~csvio.CSVReader.rows` if
+        the rows of the reader are stored, updating the indexes created for
+        them, and to the offset index if one was created. If the CSV is
+        smaller than when it was last read, it is assumed to be replaced, and
+        all its records are read again, replacing the stored rows.
+
+        :return: A list of the processed rows appended to the CSV.
+
+        Usage:
+
+        .. code-block:: python
+
+            >>> from csvio import CSVReader
+            >>> reader = CSVReader("fruit_stock.csv", follow=True)
+            >>> reader.num_rows
+            4
+            >>> # Another process appends a row to the CSV
+            >>> reader.refresh()
+            [{'Supplier': 'Big Pears', 'Fruit': 'Pear', 'Quantity': '5'}]
+            >>> reader.num_rows
+            5
+        """
+
+        if not self.follow:
+            raise ValueError("refresh() requires a reader with follow=True")
+
+        replaced = (
+            self._read_offset is not None
+            and os.path.getsize(self.filepath) < self._read_offset
+        )
+
+        if replaced:
+            self._read_offset = None
+            self._offset_index = None
+
+        rows = self.__read_appended()
+
+        if self._materialized and replaced:
+            self.rows = self.__store_rows(rows)
+
+        elif self._materialized:
+            self._rows.extend(rows)
+            self._update_indexes()
+
+        return rows
+
+    def follow_rows(
+        self, interval: float = 1.0, timeout: float = None
+    ) -> Iterator[R]:
+        """
+        Yield the rows appended to the CSV as they are appended, by calling
+        :py:meth:`~csvio.CSVReader.refresh` every ``interval`` seconds, for
+        a reader constructed with ``follow=True``.
+
+        :param interval: Number of seconds to wait for new records when
+            there are none.
+        :type interval: optional
+
+        :param timeout: If provided, stop once no records are appended for
+            this many seconds. Otherwise the rows are yielded until the
+            generator is closed.
+        :type timeout: optional
+
+        :return: A generator of dictionaries each representing a processed
+            row appended to the CSV.
+        """
+
+        idle_since = time.monotonic()
+
+        while True:
+
+            rows = self.refresh()
+
+            if rows:
+                yield from rows
+                idle_since = time.monotonic()
+                continue
+
+            if (
+                timeout is not None
+                and time.monotonic() - idle_since >= timeout
+            ):
+                return
+
+            time.sleep(interval)
+
+    def __store_rows(self, rows: Iterable[R]) -> RS:
+
+        if self.columnar:
+            stored: RS = ColumnStore(compact=self.compact_rows)  # type: ignore
+        else:
+            stored = []
+
+        if not self.index_columns:
+            stored.extend(rows)
+            return stored
+
+        indexes = [
+            HashIndex(stored, columns) for columns in self.index_columns
+        ]
+        rows = iter(rows)
+
+        for chunk in iter(lambda: list(islice(rows, BATCH_SIZE)), []):
+
+            stored.extend(chunk)
+
+            for index in indexes:
+                index.extend(chunk)
+
+        for index in indexes:
+            self._indexes[tuple(index.columns)] = index
+
+        return stored
+
+    def __get_rows(self) -> RS:
+
+        if self.follow:
+            self._read_offset = None
+            return self.__store_rows(self.__read_appended())
+
+        if self.cache is None or not self._owns_dedup:
+            return self.__store_rows(self.iter_rows())
+
+        key = self.__cache_key(self.cache)
+        cached = self.cache.load(key)
+
+        if cached is not None:
+
+            self.fieldnames = cached["fieldnames"]
+            self._interner = cached["interner"]
+
+            if self.schema is not None:
+                self.schema.types = cached["schema_types"]
+                self.schema.formats = cached["schema_formats"]
+                self.schema.infer = False
+
+            for columns in self.index_columns:
+                self._indexes[tuple(columns)] = HashIndex(
+                    cached["rows"], columns
+                )
+
+            return cached["rows"]
+
+        rows = self.__store_rows(self.iter_rows())
+
+        if self.bad_rows is not None and self.bad_rows.error_count:
+            return rows
+
+        self.cache.save(
+            key,
+            {
+                "rows": rows,
+                "fieldnames": self._fieldnames,
+                "interner": self._interner,
+                "schema_types": self.schema and self.schema.types,
+                "schema_formats": self.schema and self.schema.formats,
+            },
+        )
+
         return rows
+
+    def profile(
+        self, columns: FN = None, top_k: int = TOP_K, chunk_size: int = 10000
+    ) -> Dict[str, ColumnProfile]:
+        """
+        Compute statistics of the values of the columns in a single pass over
+        the rows, holding only a chunk of rows and a fixed amount of state
+        per column in memory.
+
+        The rows of a reader constructed with ``lazy=True`` are read in
+        chunks of ``chunk_size`` rows and are not kept. The statistics are of
+        the processed values, so columns converted to numbers by a ``schema``
+        or the ``processors`` also get their mean and variance.
+
+        :param columns: Column headings of the columns to profile. All the
+            columns if not provided.
+        :type columns: optional
+
+        :param top_k: Number of most frequent values reported per column.
+        :type top_k: optional
+
+        :param chunk_size: Number of rows read at a time.
+        :type chunk_size: optional
+
+        :return: A dictionary mapping the column headings to their
+            :py:class:`~csvio.profiling.ColumnProfile`.
+
+        Usage:
+
+        .. code-block:: python
+
+            >>> from csvio import CSVReader
+            >>> reader = CSVReader(
+            ...     "fruit_stock.csv", lazy=True, schema={"Quantity": "int"}
+            ... )
+            >>> profile = reader.profile()
+            >>> profile["Quantity"].mean
+            2.5
+            >>> profile["Fruit"].distinct
+            4
+        """
+
+        columns = list(columns or self.fieldnames)
+        missing = [c for c in columns if c not in self.fieldnames]
+
+        if missing:
+            raise ValueError(f"Columns not found in the CSV: {missing}")
+
+        profilers = {c: ColumnProfiler(top_k) for c in columns}
+
+        if self._materialized:
+            rows = iter(self.rows)
+            chunks: Iterator[RS] = iter(
+                lambda: list(islice(rows, chunk_size)), []
+            )
+        else:
+            chunks = self.iter_chunks(chunk_size)
+
+        for chunk in chunks:
+            for column, profiler in profilers.items():
+                profiler.update([row.get(column) for row in chunk])
+
+        return {c: profiler.profile() for c, profiler in profilers.items()}
+
+    def column(self, column_name: str) -> Column:
+        """
+        Get the values of a column of a reader constructed with
+        ``columnar=True``, reading the rows if they are not read yet.
+
+        :param column_name: Column heading of the column.
+        :type column_name: required
+
+        :return: A :py:class:`~csvio.columnar.Column` that supports whole
+            column operations such as
+            :py:meth:`~csvio.columnar.Column.sum` and
+            :py:meth:`~csvio.columnar.Column.unique`.
+
+        Usage:
+
+        .. code-block:: python
+
+            >>> from csvio import CSVReader
+            >>> from csvio.processors import FieldProcessor
+            >>> proc = FieldProcessor("quantity")
+            >>> proc.add_processor("Quantity", int)
+            >>> reader = CSVReader(
+            ...     "fruit_stock.csv", processors=[proc], columnar=True
+            ... )
+            >>> reader.column("Quantity").sum()
+            10
+        """
+
+        if not self.columnar:
+            raise ValueError("column() requires a reader with columnar=True")
+
+        return self.rows.column(column_name)  # type: ignore
+
+    def rows_from_column_key(
+        self, column_name: str, rows: Iterable[R] = None
+    ) -> Dict[str, RS]:
+
+        if rows is None and self.columnar and self.index(column_name) is None:
+            return self.rows.rows_from_column_key(column_name)  # type: ignore
+
+        return super().rows_from_column_key(column_name, rows)
@@ -23,10 +23,13 @@
 # SOFTWARE.
 import csv
 import traceback
-from typing import Any, Dict, List, Union
+from typing import IO, Any, Dict, List, Optional, Union
 
 from .csvbase import CSVBase
+from .dedup import Deduplicator
 from .processors.processor_base import ProcessorBase
+from .records import Record
+from .utils.compression import open_file
 from .utils.types import FN, RS, R
 
 
@@ -61,6 +64,40 @@ class CSVWriter(CSVBase):
         DictReader constructor within this class.
     :type csv_kwargs: optional
 
+    :param compression:
+        Compression format of the output CSV, ``gzip``, ``bz2`` or ``xz``, to
+        compress the rows on the fly while they are written. By default the
+        format is detected from the extension of the CSV, such as
+        ``.csv.gz``. :obj:`None` writes the CSV uncompressed. Every call to
+        :py:meth:`~csvio.CSVWriter.flush` appends a new compressed stream to
+        the CSV, which is read back as a single stream by
+        :py:class:`~csvio.CSVReader` and by the decompression tools of each
+        format.
+    :type compression: optional
+
+    :param compresslevel:
+        Compression level of the output CSV, from ``1`` for the fastest
+        compression to ``9`` for the smallest output. The default level of
+        the compression format is used if not provided.
+    :type compresslevel: optional
+
+    :param dedup:
+        Drop the rows added with :py:meth:`~csvio.CSVWriter.add_rows` whose
+        values, after they are processed, were already added. :obj:`True`
+        compares the values of all the ``fieldnames``, and a list of column
+        headings compares the values of those columns. Only a hash of the
+        values of each row is kept, in a
+        :py:class:`~csvio.dedup.Deduplicator`, which can also be passed to
+        use the Bloom filter mode.
+    :type dedup: optional
+
+    :param keep_rows:
+        If :obj:`False` the rows written by :py:meth:`~csvio.CSVWriter.flush`
+        are not kept in :py:attr:`~csvio.CSVWriter.rows`, so any number of
+        rows can be written by adding and flushing them in batches while
+        only holding a batch in memory.
+    :type keep_rows: optional
+
     """
 
     def __init__(
@@ -70,11 +107,29 @@ class CSVWriter(CSVBase):
         processors: List[ProcessorBase] = None,
         open_kwargs: Dict[str, str] = {},
         csv_kwargs: Dict[str, Any] = {},
+        compression: Optional[str] = "infer",
+        compresslevel: int = None,
+        dedup: Union[bool, FN, Deduplicator] = False,
+        keep_rows: bool = True,
     ) -> None:
 
         super().__init__(filename, open_kwargs, csv_kwargs)
 
         self.processors = processors
+        self.compression = (
+            self.file_compression if compression == "infer" else compression
+        )
+        self.compresslevel = compresslevel
+        self.keep_rows = keep_rows
+
+        if isinstance(dedup, Deduplicator):
+            self.dedup: Optional[Deduplicator] = dedup
+        elif dedup is True:
+            self.dedup = Deduplicator()
+        elif dedup:
+            self.dedup = Deduplicator(list(dedup))
+        else:
+            self.dedup = None
 
         self._pending_rows: RS = []
         self.fieldnames: FN = fieldnames
@@ -91,13 +146,22 @@ class CSVWriter(CSVBase):
     def pending_rows(self, rows: RS) -> None:
         self._pending_rows = rows
 
+    def __open(self, mode: str) -> IO[Any]:
+
+        return open_file(
+            self.filepath,
+            mode,
+            self.compression,
+            self.compresslevel,
+            newline="",
+            **self.open_kwargs,
+        )
+
     def __write_field_headings(self) -> bool:
 
         if self.fieldnames:
 
-            with open(
-                self.filepath, "w", newline="", **self.open_kwargs
-            ) as wf:
+            with self.__open("w") as wf:
 
                 writer = csv.DictWriter(
                     wf, fieldnames=self.fieldnames, **self.csv_kwargs
@@ -124,12 +188,13 @@ class CSVWriter(CSVBase):
 
         :param rows:
             A single dictionary or a list of dictionaries that repsresent the
-            row(s) to be written to the output CSV.
+            row(s) to be written to the output CSV. Each dictionary can also
+            be a :py:class:`~csvio.records.Record`.
         :type rows: required
 
         """
 
-        if isinstance(rows, dict):
+        if isinstance(rows, (dict, Record)):
             rows = [rows]
         elif isinstance(rows, list):
             pass
@@ -143,18 +208,19 @@ class CSVWriter(CSVBase):
             for processor in self.processors:
                 temp_rows = processor.process_rows(temp_rows)
 
-            self.pending_rows.extend(temp_rows)
-        else:
-            self.pending_rows.extend(rows)
+            rows = temp_rows
+
+        if self.dedup is not None:
+            rows = list(self.dedup.filter_rows(rows, self.fieldnames))
+
+        self.pending_rows.extend(rows)
 
     def __write_rows(self) -> None:
 
         row_to_write = None
 
         try:
-            with open(
-                self.filepath, "a", newline="", **self.open_kwargs
-            ) as wf:
+            with self.__open("a") as wf:
 
                 writer = csv.DictWriter(
                     wf, fieldnames=self.fieldnames, **self.csv_kwargs
@@ -220,7 +286,10 @@ class CSVWriter(CSVBase):
                 self.__write_field_headings()
 
             self.__write_rows()
-            self.rows += self.pending_rows
+
+            if self.keep_rows:
+                self.rows += self.pending_rows
+
             self.pending_rows = []
 
     def write_blank_csv(self) -> None:
@@ -0,0 +1,360 @@
+# MIT License
+#
+# csvio: A library for conveniently processing CSV files.
+#
+# Copyright (c) 2021 Salman Raza <raza.salman@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import math
+from array import array
+from typing import Any, Iterable, Iterator, Mapping, Optional, Tuple
+
+from .utils.types import FN, R
+
+MODES = ("exact", "bloom")
+DEDUP_CAPACITY = 1 << 20
+DEDUP_ERROR_RATE = 0.001
+
+_HASH_MASK = (1 << 64) - 1
+
+
+def key_digest(key: Tuple[Any, ...]) -> int:
+    """
+    :return: A 64 bit digest of ``key``.
+
+    The digest is the SipHash of the :func:`repr` of the key, computed by
+    :func:`hash`, which tells apart values whose own hashes are equal, such
+    as ``-1`` and ``-2``, or ``1``, ``1.0`` and ``True``. It is cheaper to
+    compute than a :py:mod:`hashlib` digest, but differs between Python
+    processes.
+    """
+
+    return hash(repr(key))
+
+
+class DigestSet:
+    """
+    A set of 64 bit digests stored in a single :py:class:`array.array`, using
+    open addressing with linear probing.
+
+    Each digest takes 8 bytes per slot, and the table is kept between 35%
+    and 70% full, so a digest takes 11 to 23 bytes, instead of the 60 or more
+    bytes an integer takes in a :py:class:`set`.
+
+    :param capacity: Number of digests to allocate space for.
+    :type capacity: optional
+    """
+
+    def __init__(self, capacity: int = DEDUP_CAPACITY) -> None:
+
+        size = 16
+
+        while size * 7 < capacity * 10:
+            size *= 2
+
+        self.table = array("Q", bytes(8 * size))
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, digest: int) -> bool:
+
+        digest = (digest & _HASH_MASK) or 1
+        table = self.table
+        mask = len(table) - 1
+        i = digest & mask
+
+        while table[i]:
+
+            if table[i] == digest:
+                return True
+
+            i = (i + 1) & mask
+
+        return False
+
+    def add(self, digest: int) -> bool:
+        """
+        Add ``digest``.
+
+        :return: :obj:`True` if it was not in the set.
+        """
+
+        # 0 marks an empty slot, so it is stored as 1.
+        digest = (digest & _HASH_MASK) or 1
+        table = self.table
+        mask = len(table) - 1
+        i = digest & mask
+
+        while True:
+
+            slot = table[i]
+
+            if slot == digest:
+                return False
+
+            if not slot:
+                break
+
+            i = (i + 1) & mask
+
+        table[i] = digest
+        self.size += 1
+
+        if self.size * 10 > len(table) * 7:
+            self.__grow()
+
+        return True
+
+    def __grow(self) -> None:
+
+        old = self.table
+        table = array("Q", bytes(16 * len(old)))
+        mask = len(table) - 1
+
+        for digest in old:
+
+            if not digest:
+                continue
+
+            i = digest & mask
+
+            while table[i]:
+                i = (i + 1) & mask
+
+            table[i] = digest
+
+        self.table = table
+
+
+class BloomFilter:
+    """
+    A Bloom filter of 64 bit digests, using a fixed amount of memory.
+
+    The number of bits and of hash functions are chosen so that the
+    probability of reporting a digest that was not added as added is
+    ``error_rate`` once ``capacity`` digests are added. It grows beyond that.
+
+    :param capacity: Expected number of digests.
+    :type capacity: optional
+
+    :param error_rate: False positive probability at ``capacity`` digests.
+    :type error_rate: optional
+    """
+
+    def __init__(
+        self,
+        capacity: int = DEDUP_CAPACITY,
+        error_rate: float = DEDUP_ERROR_RATE,
+    ) -> None:
+
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+
+        self.num_bits = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.num_hashes = max(
+            1, round(self.num_bits / max(capacity, 1) * math.log(2))
+        )
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    def __positions(self, digest: int) -> range:
+        """
+        :return: The positions of the bits of ``digest``, before they are
+            wrapped around the number of bits.
+        """
+
+        # The positions are derived from two hashes, the digest and a mix of
+        # its bits with the finalizer of SplitMix64.
+        h1 = digest & _HASH_MASK
+        h2 = ((h1 ^ (h1 >> 30)) * 0xBF58476D1CE4E5B9) & _HASH_MASK
+        h2 = ((h2 ^ (h2 >> 27)) * 0x94D049BB133111EB) & _HASH_MASK
+
+        start = h1 % self.num_bits
+        step = (h2 % self.num_bits) | 1
+
+        return range(start, start + self.num_hashes * step, step)
+
+    def __contains__(self, digest: int) -> bool:
+
+        bits = self.bits
+        num_bits = self.num_bits
+
+        for position in self.__positions(digest):
+
+            position %= num_bits
+
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+
+        return True
+
+    def add(self, digest: int) -> bool:
+        """
+        Add ``digest``.
+
+        :return: :obj:`True` if it was not added before, with false negatives
+            at the ``error_rate`` of the filter.
+        """
+
+        bits = self.bits
+        num_bits = self.num_bits
+        new = False
+
+        for position in self.__positions(digest):
+
+            if position >= num_bits:
+                position %= num_bits
+
+            byte, bit = position >> 3, 1 << (position & 7)
+            value = bits[byte]
+
+            if not value & bit:
+                bits[byte] = value | bit
+                new = True
+
+        return new
+
+
+class Deduplicator:
+    """
+    Drop the rows whose key was seen before, without keeping the rows.
+
+    The key of a row is the tuple of the values of ``columns``, or of all its
+    values, and only a 64 bit digest of each key, from :py:func:`key_digest`,
+    is kept. The digests differ between Python processes, so a deduplicator
+    only recognises keys seen by the same process.
+
+    In ``exact`` mode the digests are kept in a :py:class:`DigestSet`. Two
+    different keys are only mistaken for each other if their digests
+    collide, with a probability below 1% for 500 million keys.
+
+    In ``bloom`` mode the digests are added to a :py:class:`BloomFilter` that
+    uses a fixed amount of memory, about 1.8 bytes per key of ``capacity``
+    with the default ``error_rate``. A row is then dropped as a duplicate
+    with a probability of ``error_rate`` even if its key was not seen.
+
+    :param columns: Column headings of the columns that make up the key. All
+        the columns if not provided.
+    :type columns: optional
+
+    :param mode: ``exact`` or ``bloom``.
+    :type mode: optional
+
+    :param capacity: Expected number of distinct keys. Sets the size of the
+        Bloom filter, or the initial size of the digest set.
+    :type capacity: optional
+
+    :param error_rate: False positive probability of the Bloom filter.
+    :type error_rate: optional
+
+    Usage:
+
+    .. code-block:: python
+
+        >>> from csvio.dedup import Deduplicator
+        >>> dedup = Deduplicator(["Fruit"])
+        >>> rows = [{"Fruit": "Apple"}, {"Fruit": "Mango"}, {"Fruit": "Apple"}]
+        >>> list(dedup.filter_rows(rows))
+        [{'Fruit': 'Apple'}, {'Fruit': 'Mango'}]
+        >>> dedup.duplicates
+        1
+    """
+
+    def __init__(
+        self,
+        columns: FN = None,
+        mode: str = "exact",
+        capacity: int = DEDUP_CAPACITY,
+        error_rate: float = DEDUP_ERROR_RATE,
+    ) -> None:
+
+        if mode not in MODES:
+            raise ValueError(f"Unsupported dedup mode: {mode}")
+
+        self.columns = list(columns or [])
+        self.mode = mode
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Forget the keys seen, and clear the counts.
+        """
+
+        self.digests: Any
+
+        if self.mode == "exact":
+            self.digests = DigestSet(self.capacity)
+        else:
+            self.digests = BloomFilter(self.capacity, self.error_rate)
+
+        #: Number of distinct keys seen.
+        self.unique = 0
+
+        #: Number of rows dropped as duplicates.
+        self.duplicates = 0
+
+    def add(self, key: Tuple[Any, ...]) -> bool:
+        """
+        Add the key of a row.
+
+        :return: :obj:`True` if the key was not seen before, in which case
+            the row is kept.
+        """
+
+        if self.digests.add(key_digest(key)):
+            self.unique += 1
+            return True
+
+        self.duplicates += 1
+        return False
+
+    def key(
+        self, row: Mapping[str, Any], fieldnames: Optional[FN] = None
+    ) -> Tuple[Any, ...]:
+        """
+        :return: The key of ``row``, the values of :py:attr:`columns`, or
+            else of ``fieldnames`` or of all the columns of the row, in that
+            order.
+        """
+
+        columns = self.columns or fieldnames
+
+        if columns:
+            return tuple([row.get(column) for column in columns])
+
+        return tuple(row.values())
+
+    def filter_rows(
+        self, rows: Iterable[R], fieldnames: Optional[FN] = None
+    ) -> Iterator[R]:
+        """
+        :return: A generator of the rows whose key was not seen before.
+        """
+
+        add = self.add
+        key = self.key
+
+        for row in rows:
+            if add(key(row, fieldnames)):
+                yield row
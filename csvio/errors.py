@@ -1,3 +1,37 @@
+from typing import Any, List, NamedTuple
+
+
+class CellError(NamedTuple):
+    """
+    A value in a CSV that could not be converted to its schema type.
+
+    ``record`` is the number of the record in the CSV, counting from the
+    first record after the column headings. When the CSV is read by multiple
+    worker processes it is counted from the start of the byte range read by
+    the worker instead.
+    """
+
+    record: int
+    column: str
+    value: Any
+    type: str
+
+
+class BadRow(NamedTuple):
+    """
+    A record of a CSV that could not be tokenized by :py:func:`csv.reader`.
+
+    ``line`` is the number of the line of the CSV the record starts on,
+    counting the column headings as line ``1``. When the CSV is read from a
+    byte position, such as by multiple worker processes or in follow mode, it
+    is counted from that position instead, starting at ``1``.
+    """
+
+    line: int
+    text: str
+    error: str
+
+
 class RemoteResourceError(Exception):
     """Raised when access to the remote resource fails"""
 
@@ -10,3 +44,36 @@ class RemoteResourceError(Exception):
 
     def __str__(self) -> str:
         return f"{self.remote_type}: {self.msg}"
+
+
+class SchemaError(Exception):
+    """Raised when values in a CSV cannot be converted to their schema type"""
+
+    def __init__(self, cell_errors: List[CellError]) -> None:
+
+        super().__init__(cell_errors)
+        self.cell_errors = cell_errors
+
+    def __str__(self) -> str:
+
+        return "; ".join(
+            f"record {e.record}, column {e.column!r}: cannot convert "
+            f"{e.value!r} to {e.type}"
+            for e in self.cell_errors
+        )
+
+
+class BadRowError(Exception):
+    """Raised when a record of a CSV cannot be tokenized"""
+
+    def __init__(self, bad_row: BadRow) -> None:
+
+        super().__init__(bad_row)
+        self.bad_row = bad_row
+
+    def __str__(self) -> str:
+
+        return (
+            f"line {self.bad_row.line}: {self.bad_row.error}: "
+            f"{self.bad_row.text!r}"
+        )
@@ -23,6 +23,9 @@
 # SOFTWARE.
 
 from pathlib import Path
+from typing import Optional
+
+from .utils.compression import compression_from_ext
 
 
 class FileBase:
@@ -83,6 +86,15 @@ class FileBase:
         """
         return self.path_obj.suffix
 
+    @property
+    def file_compression(self) -> Optional[str]:
+        """
+        :return: Compression format of the file according to its extension,
+            ``gzip``, ``bz2`` or ``xz``, or :obj:`None` if it is not
+            compressed.
+        """
+        return compression_from_ext(self.file_ext)
+
     def touch(self, exist_ok: bool = False) -> bool:
         """
         Create a blank file at the path provided in the *filename* parameter.
@@ -0,0 +1,607 @@
+# MIT License
+#
+# csvio: A library for conveniently processing CSV files.
+#
+# Copyright (c) 2021 Salman Raza <raza.salman@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
+from operator import itemgetter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from .utils.types import FN, RS, R
+
+
+class HashIndex:
+    """
+    An index of rows by the values of one or more columns, for looking up the
+    rows that have given values without scanning all the rows.
+
+    The index maps each distinct key to an :py:class:`array.array` of the
+    positions of the rows that have it in ``rows``, and returns the rows
+    themselves from ``rows`` when they are looked up. The key of a row is the
+    value of its column for an index on a single column, and a tuple of the
+    values of its columns, in the same order as ``columns``, for an index on
+    multiple columns.
+
+    Rows appended to ``rows`` are added to the index when it is next looked
+    up. Rows that are changed or removed require the index to be rebuilt with
+    :py:meth:`rebuild`.
+
+    :param rows: The rows to index.
+    :type rows: required
+
+    :param columns: Column headings of the columns to index the rows by.
+    :type columns: required
+    """
+
+    def __init__(self, rows: Sequence[R], columns: FN) -> None:
+
+        self.columns = list(columns)
+        self.rows = rows
+        self.positions: Dict[Any, "array[int]"] = {}
+        self.size = 0
+
+        self.update()
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __contains__(self, key: Any) -> bool:
+
+        self.update()
+
+        return key in self.positions
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.positions)
+
+    def __getitem__(self, key: Any) -> RS:
+
+        self.update()
+        rows = self.rows
+
+        return [rows[position] for position in self.positions[key]]
+
+    def get(self, key: Any, default: Optional[RS] = None) -> Optional[RS]:
+        """
+        :return: The rows whose key is ``key``, or ``default`` if there are
+            none.
+        """
+
+        if key not in self:
+            return default
+
+        return self[key]
+
+    def key(self, row: R) -> Any:
+        """
+        :return: The key of ``row`` in this index.
+        """
+
+        return itemgetter(*self.columns)(row)
+
+    def keys(self) -> List[Any]:
+        """
+        :return: The distinct keys of the rows, in the order in which they
+            first appear.
+        """
+        return list(self.positions)
+
+    def groups(self) -> Dict[Any, RS]:
+        """
+        :return: A dictionary mapping every key to the rows that have it, in
+            the same form as the dictionary returned by
+            :py:meth:`~csvio.csvbase.CSVBase.rows_from_column_key`.
+        """
+        self.update()
+        rows = self.rows
+
+        return {
+            key: [rows[position] for position in group]
+            for key, group in self.positions.items()
+        }
+
+    def extend(self, rows: Iterable[R]) -> None:
+        """
+        Add ``rows`` to the index as the next rows of the indexed rows. This
+        builds an index while the rows are read, one chunk of rows at a time
+        as they are stored, instead of after they are all read.
+        """
+
+        positions = self.positions
+        position = self.size
+
+        for key in map(itemgetter(*self.columns), rows):
+
+            group = positions.get(key)
+
+            if group is None:
+                group = positions[key] = array("L")
+
+            group.append(position)
+            position += 1
+
+        self.size = position
+
+    def nested(self) -> "NestedGroups":
+        """
+        :return: The rows grouped in a hierarchy of mappings by the values of
+            the indexed columns, built from the index when each level is
+            accessed. See :py:class:`NestedGroups`.
+        """
+
+        self.update()
+
+        return NestedGroups(self, len(self.columns))
+
+    def update(self, rows: Sequence[R] = None) -> None:
+        """
+        Add the rows appended to the indexed rows since the index was last
+        updated. If ``rows`` is a different sequence of rows than the one
+        indexed, the index is rebuilt from ``rows`` instead.
+        """
+
+        if rows is not None and rows is not self.rows:
+            self.rows = rows
+            self.positions, self.size = {}, 0
+
+        if len(self.rows) > self.size:
+            self.extend(self.rows[self.size :])
+
+    def rebuild(self) -> None:
+        """
+        Rebuild the index from all the indexed rows.
+        """
+
+        self.positions, self.size = {}, 0
+        self.update()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        :return: The index as a dictionary of JSON serializable values.
+        """
+
+        return {
+            "columns": self.columns,
+            "size": self.size,
+            "keys": list(self.positions),
+            "positions": [group.tolist() for group in self.positions.values()],
+        }
+
+    @classmethod
+    def from_dict(cls, rows: Sequence[R], data: Dict[str, Any]) -> "HashIndex":
+        """
+        :return: An index of ``rows`` restored from ``data``, a dictionary
+            returned by :py:meth:`to_dict`, without reading the values of the
+            rows.
+        """
+
+        index = cls.__new__(cls)
+        index.columns = data["columns"]
+        index.rows = rows
+        index.size = data["size"]
+
+        keys = data["keys"]
+
+        if len(index.columns) > 1:
+            keys = [tuple(key) for key in keys]
+
+        index.positions = {
+            key: array("L", group)
+            for key, group in zip(keys, data["positions"])
+        }
+        index.update()
+
+        return index
+
+
+def group_rows(rows: Iterable[R], columns: FN) -> Dict[Any, RS]:
+    """
+    Group the rows by the values of the ``columns`` in a single pass.
+
+    :return: A dictionary mapping the keys of the rows, in the same form as
+        the keys of a :py:class:`HashIndex` on the ``columns``, to the lists
+        of rows that have them, in the order in which the keys first appear.
+    """
+
+    groups: Dict[Any, RS] = {}
+    key = itemgetter(*columns)
+
+    for row in rows:
+
+        row_key = key(row)
+        group = groups.get(row_key)
+
+        if group is None:
+            groups[row_key] = [row]
+        else:
+            group.append(row)
+
+    return groups
+
+
+class NestedGroups(Mapping):  # type: ignore
+    """
+    A read only view of rows grouped by the values of multiple columns, as a
+    hierarchy of mappings in the same form as the dictionary returned by
+    :py:meth:`~csvio.csvbase.CSVBase.rows_to_nested_dicts`.
+
+    The view is built from a flat mapping of the tuples of the values of the
+    columns to the lists of rows that have them, such as the dictionary
+    returned by :py:func:`group_rows` or a :py:class:`HashIndex`. The first
+    level maps the values of the first column to the groups of the next
+    level, down to the last column, whose values are mapped to the lists of
+    rows. The keys of a level are split by the values of its column the
+    first time the level is accessed, so the levels that are never accessed
+    are never built.
+
+    :param groups: The flat mapping of the rows grouped by the tuples of the
+        values of all the columns.
+    :type groups: required
+
+    :param levels: Number of columns in the tuples. The keys of ``groups``
+        are the values themselves if there is a single column.
+    :type levels: required
+
+    :param keys: The keys of ``groups`` under this level. All the keys if
+        not provided.
+    :type keys: optional
+
+    :param depth: Position of the column of this level in the tuples.
+    :type depth: optional
+    """
+
+    def __init__(
+        self,
+        groups: Any,
+        levels: int,
+        keys: List[Tuple[Any, ...]] = None,
+        depth: int = 0,
+    ) -> None:
+
+        if levels < 1:
+            raise ValueError("Nested groups need at least one column")
+
+        self.groups = groups
+        self.levels = levels
+        self.group_keys = keys
+        self.depth = depth
+        self._children: Optional[Dict[Any, Any]] = None
+
+    def __children(self) -> Dict[Any, Any]:
+
+        if self._children is not None:
+            return self._children
+
+        depth = self.depth
+        keys = self.groups if self.group_keys is None else self.group_keys
+        children: Dict[Any, Any] = {}
+
+        if self.levels == 1:
+            # The keys of a single column are its values, not tuples
+            for key in keys:
+                children[key] = key
+        elif depth == self.levels - 1:
+            for key in keys:
+                children[key[depth]] = key
+        else:
+            for key in keys:
+
+                group = children.get(key[depth])
+
+                if group is None:
+                    children[key[depth]] = [key]
+                else:
+                    group.append(key)
+
+            children = {
+                value: NestedGroups(self.groups, self.levels, group, depth + 1)
+                for value, group in children.items()
+            }
+
+        self._children = children
+
+        return children
+
+    def __getitem__(self, value: Any) -> Any:
+
+        child = self.__children()[value]
+
+        if isinstance(child, NestedGroups):
+            return child
+
+        return self.groups[child]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.__children())
+
+    def __len__(self) -> int:
+        return len(self.__children())
+
+    def __repr__(self) -> str:
+        return f"NestedGroups(depth={self.depth}, groups={len(self)})"
+
+    def to_dict(self) -> Dict[Any, Any]:
+        """
+        :return: All the levels of the hierarchy under this one, built as
+            nested dictionaries.
+        """
+
+        return {
+            value: child.to_dict()
+            if isinstance(child, NestedGroups)
+            else child
+            for value, child in self.items()
+        }
+
+
+class SortedIndex:
+    """
+    An index of rows sorted by the values of a column, for finding the rows
+    whose values are in a range, or start with a prefix, with a binary search
+    instead of a scan of all the rows.
+
+    The index keeps the sorted values of the column in a list, along with an
+    :py:class:`array.array` of the positions of their rows in ``rows``, and
+    returns the rows themselves from ``rows`` when they are looked up.
+
+    Rows appended to ``rows`` are added to the index when it is next looked
+    up. Rows that are changed or removed require the index to be rebuilt with
+    :py:meth:`rebuild`.
+
+    :param rows: The rows to index.
+    :type rows: required
+
+    :param column: Column heading of the column to sort the rows by.
+    :type column: required
+
+    :param key: A function that converts the values of the column to the
+        values to sort them by, such as :obj:`int` or
+        :py:meth:`datetime.date.fromisoformat` for columns whose values are
+        not converted when they are read. Rows whose value is :obj:`None`, or
+        cannot be converted by ``key`` with a :obj:`ValueError` or
+        :obj:`TypeError`, are not indexed.
+    :type key: optional
+    """
+
+    def __init__(
+        self, rows: Sequence[R], column: str, key: Callable[[Any], Any] = None
+    ) -> None:
+
+        self.column = column
+        self.key = key
+        self.rows = rows
+        self.values: List[Any] = []
+        self.positions: "array[int]" = array("L")
+        self.size = 0
+
+        self.update()
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def update(self, rows: Sequence[R] = None) -> None:
+        """
+        Add the rows appended to the indexed rows since the index was last
+        updated. If ``rows`` is a different sequence of rows than the one
+        indexed, the index is rebuilt from ``rows`` instead.
+        """
+
+        if rows is not None and rows is not self.rows:
+            self.rows = rows
+            self.values, self.positions, self.size = [], array("L"), 0
+
+        size = len(self.rows)
+
+        if size <= self.size:
+            return
+
+        column = self.column
+        key = self.key
+        added = []
+
+        for position, row in enumerate(self.rows[self.size :], self.size):
+
+            value = row[column]
+
+            if value is None:
+                continue
+
+            if key is not None:
+                try:
+                    value = key(value)
+                except (TypeError, ValueError):
+                    continue
+
+            added.append((value, position))
+
+        if self.values:
+            added.extend(zip(self.values, self.positions))
+
+        added.sort()
+
+        self.values = [value for value, _ in added]
+        self.positions = array("L", (position for _, position in added))
+        self.size = size
+
+    def rebuild(self) -> None:
+        """
+        Rebuild the index from all the indexed rows.
+        """
+
+        self.values, self.positions, self.size = [], array("L"), 0
+        self.update()
+
+    def __rows(self, start: int, stop: int) -> RS:
+
+        rows = self.rows
+
+        return [rows[position] for position in self.positions[start:stop]]
+
+    def range(
+        self,
+        low: Any = None,
+        high: Any = None,
+        include_low: bool = True,
+        include_high: bool = True,
+    ) -> RS:
+        """
+        Find the rows whose values are between ``low`` and ``high``.
+
+        :param low: The lowest value of the rows to find. If not provided,
+            the rows are not limited by a lowest value.
+        :type low: optional
+
+        :param high: The highest value of the rows to find. If not provided,
+            the rows are not limited by a highest value.
+        :type high: optional
+
+        :param include_low: If :obj:`False` the rows whose value is ``low``
+            are excluded.
+        :type include_low: optional
+
+        :param include_high: If :obj:`False` the rows whose value is ``high``
+            are excluded.
+        :type include_high: optional
+
+        :return: The rows found, sorted by their values.
+        """
+
+        self.update()
+        values = self.values
+
+        start, stop = 0, len(values)
+
+        if low is not None:
+            start = (bisect_left if include_low else bisect_right)(values, low)
+
+        if high is not None:
+            stop = (bisect_right if include_high else bisect_left)(
+                values, high
+            )
+
+        return self.__rows(start, max(start, stop))
+
+    def prefix(self, prefix: str) -> RS:
+        """
+        :return: The rows whose values are strings that start with
+            ``prefix``, sorted by their values.
+        """
+
+        self.update()
+        values = self.values
+
+        start = bisect_left(values, prefix)
+
+        if not prefix:
+            return self.__rows(start, len(values))
+
+        try:
+            upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        except ValueError:
+            return self.__rows(start, len(values))
+
+        return self.__rows(start, bisect_left(values, upper))
+
+
+class OffsetIndex:
+    """
+    An index of the byte positions of the records of a CSV file, for reading
+    the records from any position without parsing the CSV from its start.
+
+    Records are numbered from ``0`` for the first record after the column
+    headings, in the order in which they appear in the CSV, counting all the
+    records regardless of any filter applied to them when they are read.
+    Blank lines are not records.
+
+    :param offsets: An :py:class:`array.array` of unsigned 64 bit integers,
+        of the byte positions of every ``stride``-th record.
+    :type offsets: required
+
+    :param num_records: Total number of records in the CSV.
+    :type num_records: required
+
+    :param end: Byte position at which the last record ends.
+    :type end: required
+
+    :param stride: Number of records between two consecutive byte positions
+        in ``offsets``. A larger stride makes the index smaller, at the cost
+        of parsing up to ``stride - 1`` extra records to reach a record.
+    :type stride: optional
+    """
+
+    def __init__(
+        self,
+        offsets: "array[int]",
+        num_records: int,
+        end: int,
+        stride: int = 1,
+    ) -> None:
+
+        self.offsets = offsets
+        self.num_records = num_records
+        self.end = end
+        self.stride = stride
+
+    def __len__(self) -> int:
+        return self.num_records
+
+    def extend(
+        self, offsets: "array[int]", num_records: int, end: int
+    ) -> None:
+        """
+        Add the byte positions of records appended to the CSV, found from the
+        end of the last record in the index.
+        """
+
+        self.offsets.extend(offsets)
+        self.num_records += num_records
+        self.end = end
+
+    def locate(self, record: int) -> Tuple[int, int]:
+        """
+        :return: A tuple of the byte position at which to start reading to
+            reach record number ``record``, and the number of records to skip
+            from that position. The byte position is the end of the last
+            record if there is no such record.
+        """
+
+        if record < 0:
+            record += self.num_records
+
+        if record >= self.num_records:
+            return self.end, 0
+
+        record = max(record, 0)
+        position, skip = divmod(record, self.stride)
+
+        return self.offsets[position], skip
@@ -0,0 +1,187 @@
+# MIT License
+#
+# csvio: A library for conveniently processing CSV files.
+#
+# Copyright (c) 2021 Salman Raza <raza.salman@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from typing import Any, Dict, List, NamedTuple
+
+from .utils.types import FN
+
+
+class Cardinality(NamedTuple):
+    """
+    Cardinality statistics of an interned column.
+    """
+
+    #: Number of distinct values found in the column. For a column that is no
+    #: longer interned, this is the number of distinct values found before
+    #: interning stopped.
+    distinct: int
+
+    #: Number of rows read.
+    rows: int
+
+    #: :obj:`False` if the column stopped being interned because it has more
+    #: distinct values than the maximum cardinality.
+    interned: bool
+
+    @property
+    def ratio(self) -> float:
+        """
+        :return: The number of distinct values per row. The lower the ratio,
+            the more memory interning the column saves.
+        """
+        return self.distinct / self.rows if self.rows else 0.0
+
+
+class Interner:
+    """
+    Intern the values of selected columns of the rows tokenized from a CSV,
+    so that equal values share a single object.
+
+    Each interned column keeps a table of its distinct values. Every value
+    read from the column is replaced by the equal value already in the table,
+    and the duplicate is discarded as soon as the row is built. Rows then
+    hold references to a few shared strings instead of a new string per cell,
+    and the hashes of the shared strings are computed only once.
+
+    :param fieldnames: Column headings of the tokenized rows.
+    :type fieldnames: required
+
+    :param columns: Column headings of the columns to intern.
+    :type columns: required
+
+    :param max_cardinality: If provided, a column stops being interned once it
+        has more distinct values than this, and its table is discarded.
+    :type max_cardinality: optional
+    """
+
+    def __init__(
+        self, fieldnames: FN, columns: FN, max_cardinality: int = None
+    ) -> None:
+
+        missing = [c for c in columns if c not in fieldnames]
+
+        if missing:
+            raise ValueError(f"Columns not found in the CSV: {missing}")
+
+        self.fieldnames = list(fieldnames)
+        self.columns = list(columns)
+        self.max_cardinality = max_cardinality
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Clear the tables and the statistics.
+        """
+
+        self.tables: Dict[str, Dict[Any, Any]] = {c: {} for c in self.columns}
+        self.dropped: Dict[str, int] = {}
+        self.rows = 0
+
+        self._positions = [
+            (self.fieldnames.index(column), column, self.tables[column])
+            for column in self.columns
+        ]
+
+    def intern_values(self, values: List[Any]) -> None:
+        """
+        Replace the values of the interned columns in ``values``, a list of
+        the values of a single row, by the shared equal values.
+        """
+
+        full: List[str] = []
+        limit = self.max_cardinality
+
+        for i, column, table in self._positions:
+
+            value = values[i]
+            shared = table.get(value)
+
+            if shared is None:
+
+                if value is None:
+                    continue
+
+                if limit is not None and len(table) >= limit:
+                    full.append(column)
+                    continue
+
+                table[value] = shared = value
+
+            values[i] = shared
+
+        self.rows += 1
+
+        if full:
+            self.__drop(full)
+
+    def __drop(self, columns: List[str]) -> None:
+
+        for column in columns:
+            self.dropped[column] = len(self.tables[column]) + 1
+            self.tables[column].clear()
+
+        self._positions = [p for p in self._positions if p[1] not in columns]
+
+    def merge(self, other: "Interner") -> None:
+        """
+        Add the statistics of ``other``, an interner of the same columns used
+        to read a different part of the same CSV.
+        """
+
+        self.rows += other.rows
+
+        for column, table in other.tables.items():
+
+            if column in self.dropped:
+                continue
+
+            if column in other.dropped:
+                self.dropped[column] = max(
+                    len(self.tables[column]), other.dropped[column]
+                )
+                self.tables[column].clear()
+                continue
+
+            for value in table:
+                self.tables[column].setdefault(value, value)
+
+            limit = self.max_cardinality
+
+            if limit is not None and len(self.tables[column]) > limit:
+                self.dropped[column] = len(self.tables[column])
+                self.tables[column].clear()
+
+    def cardinality(self) -> Dict[str, Cardinality]:
+        """
+        :return: A dictionary mapping the column headings of the interned
+            columns to their :py:class:`Cardinality`.
+        """
+
+        return {
+            column: Cardinality(
+                self.dropped.get(column, len(self.tables[column])),
+                self.rows,
+                column not in self.dropped,
+            )
+            for column in self.columns
+        }
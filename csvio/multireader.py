@@ -0,0 +1,294 @@
+# MIT License
+#
+# csvio: A library for conveniently processing CSV files.
+#
+# Copyright (c) 2021 Salman Raza <raza.salman@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import glob
+import os
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from functools import partial
+from typing import Any, Dict, Iterator, List, Tuple, Union
+
+from .csvreader import CSVReader
+from .processors.processor_base import ProcessorBase
+from .utils.compression import COMPRESSIONS
+from .utils.executors import map_bounded
+from .utils.types import FN, KW, RS, R
+
+EXECUTORS = ("process", "thread")
+CSV_EXTENSIONS = (".csv",) + tuple(
+    f".csv{ext}" for ext, _, _, _ in COMPRESSIONS.values()
+)
+
+
+def expand_paths(paths: Union[str, List[str]]) -> List[str]:
+    """
+    Expand a path, a glob pattern or a directory, or a list of them, to the
+    list of paths of the CSV files they match.
+
+    Directories are expanded to the CSV files they contain, those with the
+    ``.csv`` extension or a compressed CSV extension such as ``.csv.gz``.
+    Glob patterns are expanded with :py:func:`glob.glob`, and ``**`` matches
+    any number of subdirectories.
+
+    :return: The paths, with the paths matched by each pattern or directory
+        sorted, and without duplicates.
+    """
+
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+
+    expanded: Dict[str, None] = {}
+
+    for path in map(str, paths):
+
+        if os.path.isdir(path):
+            matches = sorted(
+                os.path.join(path, name)
+                for name in os.listdir(path)
+                if name.lower().endswith(CSV_EXTENSIONS)
+            )
+        elif glob.has_magic(path):
+            matches = sorted(glob.glob(path, recursive=True))
+        else:
+            matches = [path]
+
+        expanded.update(dict.fromkeys(matches))
+
+    return list(expanded)
+
+
+# Keyword arguments of the readers of a worker process, set by
+# _init_worker so that they are passed to each process once, when it is
+# started, instead of being pickled with every file.
+_worker_kwargs: KW = {}
+
+
+def _init_worker(processors: Dict[str, Any], reader_kwargs: KW) -> None:
+
+    ProcessorBase.processors.update(processors)
+    _worker_kwargs.update(reader_kwargs)
+
+
+def _read_file(reader_kwargs: KW, path: str) -> Tuple[str, RS]:
+
+    return path, CSVReader(path, **reader_kwargs).rows
+
+
+def _read_worker_file(path: str) -> Tuple[str, RS]:
+
+    return _read_file(_worker_kwargs, path)
+
+
+class MultiCSVReader:
+    """
+    Read the rows of multiple CSV files as a single stream, reading the files
+    concurrently.
+
+    Each file is read by a :py:class:`~csvio.CSVReader` in a pool of
+    ``workers`` processes or threads, with the ``processors`` and the other
+    keyword arguments passed to this reader, and up to ``2 * workers`` files
+    are read ahead of the rows being consumed.
+
+    The column headings of all the files are read when the reader is
+    constructed. All the files must have the same column headings, in any
+    order, or, if ``columns`` is passed, all of those columns.
+
+    :param paths: A path, a glob pattern or a directory, or a list of them,
+        expanded with :py:func:`expand_paths`.
+    :type paths: required
+
+    :param processors: A list of processors applied to the rows of each file,
+        as in :py:class:`~csvio.CSVReader`.
+    :type processors: optional
+
+    :param workers: Number of files read at the same time.
+    :type workers: optional
+
+    :param executor: ``process`` to read the files in worker processes, which
+        parse them in parallel, or ``thread`` to read them in threads, which
+        only overlap waiting for the files to be read or decompressed.
+    :type executor: optional
+
+    :param ordered: If :obj:`True` the rows are yielded in the order of the
+        files, otherwise the rows of each file are yielded as soon as it is
+        read.
+    :type ordered: optional
+
+    :param reader_kwargs: Other keyword arguments passed to the
+        :py:class:`~csvio.CSVReader` of each file, for example ``columns``,
+        ``where`` or ``schema``. They are passed to the worker processes
+        when they are started, so functions such as a ``where`` predicate
+        must be importable by them, as for the ``processors``, unless the
+        *fork* start method is used.
+    :type reader_kwargs: optional
+
+    Usage:
+
+    .. code-block:: python
+
+        >>> from csvio import MultiCSVReader
+        >>> reader = MultiCSVReader("drops/2022-05-18/*.csv", workers=8)
+        >>> len(reader.paths)
+        200
+        >>> for row in reader:
+        ...     process(row)
+    """
+
+    def __init__(
+        self,
+        paths: Union[str, List[str]],
+        processors: List[ProcessorBase] = None,
+        workers: int = 4,
+        executor: str = "process",
+        ordered: bool = True,
+        **reader_kwargs: Any,
+    ) -> None:
+
+        if executor not in EXECUTORS:
+            raise ValueError(f"Unsupported executor: {executor}")
+
+        self.paths = expand_paths(paths)
+
+        if not self.paths:
+            raise ValueError(f"No CSV files found in {paths}")
+
+        reader_kwargs.pop("lazy", None)
+        reader_kwargs.pop("workers", None)
+
+        self.processors = processors
+        self.workers = workers
+        self.executor = executor
+        self.ordered = ordered
+        self.reader_kwargs = reader_kwargs
+
+        self.fieldnames = self.__check_fieldnames()
+
+    def __header_kwargs(self) -> KW:
+
+        return {
+            k: v
+            for k, v in self.reader_kwargs.items()
+            if k
+            in (
+                "fieldnames",
+                "open_kwargs",
+                "csv_kwargs",
+                "sniff",
+                "header_cache",
+                "compression",
+            )
+        }
+
+    def __check_fieldnames(self) -> FN:
+        """
+        Read the column headings of every file, and check that they are
+        compatible with those of the first file.
+
+        :return: The column headings of the rows.
+        """
+
+        header_kwargs = self.__header_kwargs()
+        columns = self.reader_kwargs.get("columns")
+        first: FN = []
+
+        for path in self.paths:
+
+            fieldnames = CSVReader(path, lazy=True, **header_kwargs).fieldnames
+
+            if columns:
+                missing = [c for c in columns if c not in fieldnames]
+                extra: FN = []
+            elif not first:
+                first = fieldnames
+                continue
+            else:
+                missing = [c for c in first if c not in fieldnames]
+                extra = [c for c in fieldnames if c not in first]
+
+            if missing or extra:
+                reference = "columns" if columns else self.paths[0]
+
+                raise ValueError(
+                    f"Column headings of {path} are not compatible with "
+                    f"{reference}: missing {missing}, unexpected {extra}"
+                )
+
+        return list(columns or first)
+
+    def __pool(self) -> Executor:
+
+        if self.executor == "thread":
+            return ThreadPoolExecutor(self.workers)
+
+        return ProcessPoolExecutor(
+            self.workers,
+            initializer=_init_worker,
+            initargs=(ProcessorBase.processors, self.__file_kwargs()),
+        )
+
+    def __file_kwargs(self) -> KW:
+
+        return {**self.reader_kwargs, "processors": self.processors}
+
+    def iter_files(self) -> Iterator[Tuple[str, RS]]:
+        """
+        Read the files concurrently.
+
+        :return: A generator of tuples of the path of each file and the list
+            of its processed rows.
+        """
+
+        if self.executor == "thread":
+            read_file: Any = partial(_read_file, self.__file_kwargs())
+        else:
+            read_file = _read_worker_file
+
+        with self.__pool() as executor:
+            yield from map_bounded(
+                executor, read_file, self.paths, self.workers * 2, self.ordered
+            )
+
+    def iter_rows(self) -> Iterator[R]:
+        """
+        Read the rows of all the files one at a time.
+
+        :return: A generator of dictionaries each representing a processed
+            row.
+        """
+
+        for _, rows in self.iter_files():
+            yield from rows
+
+    def __iter__(self) -> Iterator[R]:
+        return self.iter_rows()
+
+    @property
+    def rows(self) -> RS:
+        """
+        :return: A list of the processed rows of all the files.
+        """
+
+        return list(self.iter_rows())
@@ -1,6 +1,8 @@
+import inspect
 from typing import List, Type, Union
 
-from ..utils.types import FP, R
+from ..records import Record
+from ..utils.types import DFP, FP, RS, R
 from .processor_base import ProcessorBase
 
 
@@ -100,12 +102,35 @@ class FieldProcessor(ProcessorBase):
 
         """
 
-        applied_handle = processor_handle or self.handle
+        return self.__apply(row, self._applied_processors(processor_handle))
 
-        if isinstance(applied_handle, ProcessorBase):
-            applied_handle = applied_handle.handle
+    def process_rows(self, rows: RS, processor_handle: str = None) -> RS:
+        """
+        Process a list of rows, looking up the processor functions to apply
+        once for the whole list instead of once for every row.
+
+        See :py:meth:`~csvio.processors.processor_base.ProcessorBase.process_rows`
+        """
+
+        processors = self._applied_processors(processor_handle)
+
+        return [self.__apply(row, processors) for row in rows]
+
+    async def process_rows_async(
+        self, rows: RS, processor_handle: str = None
+    ) -> RS:
+        """
+        Process a list of rows, awaiting the results of the processor
+        functions that are coroutine functions.
 
-        processors = ProcessorBase.processors[str(applied_handle)]
+        See :py:meth:`~csvio.processors.processor_base.ProcessorBase.process_rows_async`
+        """
+
+        processors = self._applied_processors(processor_handle)
+
+        return [await self.__apply_async(row, processors) for row in rows]
+
+    async def __apply_async(self, row: R, processors: DFP) -> R:
 
         ret_row: R = {}
 
@@ -114,8 +139,31 @@ class FieldProcessor(ProcessorBase):
                 ret_field = data
                 for processor in processors[field]:
                     ret_field = processor(ret_field)
+                    if inspect.isawaitable(ret_field):
+                        ret_field = await ret_field
                 ret_row[field] = ret_field
             else:
                 ret_row[field] = data
 
+        if isinstance(row, Record):
+            return row._make(ret_row.values())
+
+        return ret_row
+
+    def __apply(self, row: R, processors: DFP) -> R:
+
+        ret_row: R = {}
+
+        for field, data in row.items():
+            if field in processors:
+                ret_field = data
+                for processor in processors[field]:
+                    ret_field = processor(ret_field)
+                ret_row[field] = ret_field
+            else:
+                ret_row[field] = data
+
+        if isinstance(row, Record):
+            return row._make(ret_row.values())
+
         return ret_row
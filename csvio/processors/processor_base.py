@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import inspect
 from abc import ABC, abstractmethod
 from typing import Any, Dict, Type, Union
 
@@ -28,6 +29,17 @@ class ProcessorBase(ABC):
     ) -> R:
         pass
 
+    def _applied_processors(
+        self, processor_handle: Union[Type[ProcessorBase], str] = None
+    ) -> Any:
+
+        applied_handle = processor_handle or self.handle
+
+        if isinstance(applied_handle, ProcessorBase):
+            applied_handle = applied_handle.handle
+
+        return ProcessorBase.processors[str(applied_handle)]
+
     def process_rows(self, rows: RS, processor_handle: str = None) -> RS:
         """
         Process a list of rows
@@ -46,3 +58,27 @@ class ProcessorBase(ABC):
 
         """
         return [self.process_row(row, processor_handle) for row in rows]
+
+    def is_async(self, processor_handle: str = None) -> bool:
+        """
+        :return: :obj:`True` if any of the processor functions is a
+            coroutine function, in which case the rows must be processed
+            with :py:meth:`process_rows_async`.
+        """
+
+        functions = self._applied_processors(processor_handle)
+
+        if isinstance(functions, dict):
+            functions = [f for fs in functions.values() for f in fs]
+
+        return any(inspect.iscoroutinefunction(f) for f in functions)
+
+    async def process_rows_async(
+        self, rows: RS, processor_handle: str = None
+    ) -> RS:
+        """
+        Process a list of rows in the same way as :py:meth:`process_rows`,
+        awaiting the results of the processor functions that are coroutine
+        functions.
+        """
+        return self.process_rows(rows, processor_handle)
@@ -1,6 +1,8 @@
+import inspect
 from typing import List, Type, Union
 
-from ..utils.types import RP, R
+from ..records import Record
+from ..utils.types import LRP, RP, RS, R
 from .processor_base import ProcessorBase
 
 
@@ -95,16 +97,56 @@ class RowProcessor(ProcessorBase):
 
         """
 
-        applied_handle = processor_handle or self.handle
+        return self.__apply(row, self._applied_processors(processor_handle))
 
-        if isinstance(applied_handle, ProcessorBase):
-            applied_handle = applied_handle.handle
+    def process_rows(self, rows: RS, processor_handle: str = None) -> RS:
+        """
+        Process a list of rows, looking up the processor functions to apply
+        once for the whole list instead of once for every row.
+
+        See :py:meth:`~csvio.processors.processor_base.ProcessorBase.process_rows`
+        """
+
+        processors = self._applied_processors(processor_handle)
+
+        return [self.__apply(row, processors) for row in rows]
+
+    async def process_rows_async(
+        self, rows: RS, processor_handle: str = None
+    ) -> RS:
+        """
+        Process a list of rows, awaiting the results of the processor
+        functions that are coroutine functions.
+
+        See :py:meth:`~csvio.processors.processor_base.ProcessorBase.process_rows_async`
+        """
+
+        processors = self._applied_processors(processor_handle)
+
+        return [await self.__apply_async(row, processors) for row in rows]
 
-        processors = ProcessorBase.processors[str(applied_handle)]
+    async def __apply_async(self, row: R, processors: LRP) -> R:
 
         temp_row = dict(row)
 
         for processor_func in processors:
             temp_row = processor_func(temp_row)
+            if inspect.isawaitable(temp_row):
+                temp_row = await temp_row
+
+        if isinstance(row, Record) and temp_row.keys() == row.keys():
+            return row.from_mapping(temp_row)
+
+        return temp_row
+
+    def __apply(self, row: R, processors: LRP) -> R:
+
+        temp_row = dict(row)
+
+        for processor_func in processors:
+            temp_row = processor_func(temp_row)
+
+        if isinstance(row, Record) and temp_row.keys() == row.keys():
+            return row.from_mapping(temp_row)
 
         return temp_row
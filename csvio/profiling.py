@@ -0,0 +1,370 @@
+# MIT License
+#
+# csvio: A library for conveniently processing CSV files.
+#
+# Copyright (c) 2021 Salman Raza <raza.salman@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import heapq
+import math
+from collections import Counter
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+HLL_PRECISION = 12
+TOP_K = 10
+
+_HASH_MASK = (1 << 64) - 1
+
+
+class ColumnProfile(NamedTuple):
+    """
+    Statistics of the values of a column.
+    """
+
+    #: Number of rows read.
+    rows: int
+
+    #: Number of values that are :obj:`None`, for example the ``restval`` of
+    #: rows with missing fields.
+    nulls: int
+
+    #: Number of values that are empty strings.
+    empty: int
+
+    #: Number of values that are numbers, converted by a schema or the
+    #: processors.
+    numeric: int
+
+    #: Smallest value. Compared as numbers if all the other values are
+    #: numbers, otherwise the smallest of the other values.
+    min: Any
+
+    #: Largest value, compared in the same way as :py:attr:`min`.
+    max: Any
+
+    #: Mean of the numeric values.
+    mean: Optional[float]
+
+    #: Sample variance of the numeric values.
+    variance: Optional[float]
+
+    #: Approximate number of distinct values, other than :obj:`None` and
+    #: empty strings.
+    distinct: int
+
+    #: The most frequent values and their approximate counts, most frequent
+    #: first. A count may be overestimated by at most the number of values
+    #: read divided by the capacity of the :py:class:`SpaceSaving` summary.
+    top: List[Tuple[Any, int]]
+
+    @property
+    def stdev(self) -> Optional[float]:
+        """
+        :return: The sample standard deviation of the numeric values.
+        """
+        return None if self.variance is None else math.sqrt(self.variance)
+
+
+class HyperLogLog:
+    """
+    Estimate the number of distinct values added, using a fixed amount of
+    memory of ``2 ** precision`` bytes.
+
+    The relative error of the estimate is about ``1.04 / sqrt(2 **
+    precision)``, 1.6% with the default precision.
+
+    Values are hashed with :py:func:`hash`, so the estimates of different
+    processes can only be merged for values whose hashes are not randomized.
+
+    :param precision: Number of bits of the hash used to select a register,
+        between 4 and 16.
+    :type precision: optional
+    """
+
+    def __init__(self, precision: int = HLL_PRECISION) -> None:
+
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def update(self, values: Iterable[Any]) -> None:
+        """
+        Add the hashable ``values``.
+        """
+
+        registers = self.registers
+        precision = self.precision
+        mask = len(registers) - 1
+        width = 64 - precision + 1
+
+        for value in values:
+
+            # The hash of an integer is the integer itself, so its bits are
+            # mixed with the finalizer of SplitMix64.
+            h = hash(value) & _HASH_MASK
+            h = ((h ^ (h >> 30)) * 0xBF58476D1CE4E5B9) & _HASH_MASK
+            h = ((h ^ (h >> 27)) * 0x94D049BB133111EB) & _HASH_MASK
+            h ^= h >> 31
+            rank = width - (h >> precision).bit_length()
+            i = h & mask
+
+            if rank > registers[i]:
+                registers[i] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """
+        Add the values added to ``other``, of the same precision.
+        """
+
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge estimators of different precision")
+
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def count(self) -> int:
+        """
+        :return: The estimated number of distinct values added.
+        """
+
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / math.fsum(2.0**-r for r in self.registers)
+        zeros = self.registers.count(0)
+
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+
+        return int(round(estimate))
+
+
+class SpaceSaving:
+    """
+    Track the most frequent values added, using the Space-Saving algorithm
+    with at most ``capacity`` counters.
+
+    A value added without a counter gets the count of the least frequent
+    value with a counter, plus its own count, and the counters of the least
+    frequent values are discarded whenever there are more than
+    ``capacity``. Counts are therefore never underestimated, and every value
+    more frequent than the number of values added divided by ``capacity`` is
+    guaranteed to have a counter.
+
+    Values are added in batches, and the counters are trimmed once per
+    batch, which gives the same guarantees as adding the values one at a
+    time.
+
+    :param capacity: Maximum number of counters.
+    :type capacity: required
+    """
+
+    def __init__(self, capacity: int) -> None:
+
+        if capacity < 1:
+            raise ValueError("capacity must be a positive integer")
+
+        self.capacity = capacity
+        self.counts: Dict[Any, int] = {}
+        self.errors: Dict[Any, int] = {}
+
+    def update(self, counts: Dict[Any, int]) -> None:
+        """
+        Add values, given as a dictionary mapping each value to the number of
+        times it is added, for example a :py:class:`collections.Counter`.
+        """
+
+        counters = self.counts
+        errors = self.errors
+        floor = 0
+
+        if len(counters) >= self.capacity:
+            floor = min(counters.values())
+
+        for value, n in counts.items():
+            if value in counters:
+                counters[value] += n
+            else:
+                counters[value] = floor + n
+                errors[value] = floor
+
+        if len(counters) > self.capacity:
+            self.counts = dict(
+                heapq.nlargest(
+                    self.capacity, counters.items(), key=itemgetter(1)
+                )
+            )
+            self.errors = {value: errors[value] for value in self.counts}
+
+    def merge(self, other: "SpaceSaving") -> None:
+        """
+        Add the values added to ``other``.
+        """
+
+        self.update(other.counts)
+
+    def top(self, k: int) -> List[Tuple[Any, int]]:
+        """
+        :return: The ``k`` most frequent values and their counts, most
+            frequent first.
+        """
+
+        return heapq.nlargest(k, self.counts.items(), key=itemgetter(1))
+
+
+class ColumnProfiler:
+    """
+    Compute the :py:class:`ColumnProfile` of a column in a single pass over
+    its values, holding a fixed amount of state however many values are
+    added.
+
+    The mean and variance are updated with the algorithm of Welford,
+    generalized by Chan et al. to combine the statistics of a batch of values
+    with those of the values added before it.
+
+    :param top_k: Number of most frequent values reported.
+    :type top_k: optional
+
+    :param precision: Precision of the :py:class:`HyperLogLog` estimating the
+        number of distinct values.
+    :type precision: optional
+    """
+
+    def __init__(
+        self, top_k: int = TOP_K, precision: int = HLL_PRECISION
+    ) -> None:
+
+        self.top_k = top_k
+        self.rows = 0
+        self.nulls = 0
+        self.empty = 0
+        self.numeric = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.num_min: Any = None
+        self.num_max: Any = None
+        self.other_min: Any = None
+        self.other_max: Any = None
+        self.distinct = HyperLogLog(precision)
+        self.frequent = SpaceSaving(max(10 * top_k, 100))
+
+    def update(self, values: List[Any]) -> None:
+        """
+        Add a batch of ``values`` of the column.
+        """
+
+        self.rows += len(values)
+        self.nulls += values.count(None)
+        self.empty += values.count("")
+
+        try:
+            counts = Counter(values)
+        except TypeError:
+            counts = Counter(_hashable(value) for value in values)
+
+        counts.pop(None, None)
+        counts.pop("", None)
+
+        numbers: List[Any] = []
+        others: List[Any] = []
+
+        for value in counts:
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                numbers.append(value)
+            else:
+                others.append(value)
+
+        if numbers:
+            self.__update_numbers(numbers, counts)
+
+        if others:
+            self.other_min, self.other_max = _min_max(
+                others, self.other_min, self.other_max
+            )
+
+        self.distinct.update(counts)
+        self.frequent.update(counts)
+
+    def __update_numbers(
+        self, numbers: List[Any], counts: Dict[Any, int]
+    ) -> None:
+
+        self.num_min, self.num_max = _min_max(
+            numbers, self.num_min, self.num_max
+        )
+
+        n = sum(counts[x] for x in numbers)
+        mean = math.fsum(x * counts[x] for x in numbers) / n
+        m2 = math.fsum(counts[x] * (x - mean) ** 2 for x in numbers)
+
+        total = self.numeric + n
+        delta = mean - self.mean
+
+        self.m2 += m2 + delta * delta * self.numeric * n / total
+        self.mean += delta * n / total
+        self.numeric = total
+
+    def profile(self) -> ColumnProfile:
+        """
+        :return: The statistics of the values added.
+        """
+
+        if self.other_min is not None or self.num_min is None:
+            minimum, maximum = self.other_min, self.other_max
+        else:
+            minimum, maximum = self.num_min, self.num_max
+
+        return ColumnProfile(
+            self.rows,
+            self.nulls,
+            self.empty,
+            self.numeric,
+            minimum,
+            maximum,
+            self.mean if self.numeric else None,
+            self.m2 / (self.numeric - 1) if self.numeric > 1 else None,
+            self.distinct.count(),
+            self.frequent.top(self.top_k),
+        )
+
+
+def _min_max(values: List[Any], low: Any, high: Any) -> Tuple[Any, Any]:
+    """
+    :return: The smallest and largest of ``values``, ``low`` and ``high``,
+        compared by their text if they cannot be compared to each other.
+    """
+
+    if low is not None:
+        values = values + [low, high]
+
+    try:
+        return min(values), max(values)
+    except TypeError:
+        return min(values, key=str), max(values, key=str)
+
+
+def _hashable(value: Any) -> Any:
+
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+
+    return value
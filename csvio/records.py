@@ -0,0 +1,163 @@
+# MIT License
+#
+# csvio: A library for conveniently processing CSV files.
+#
+# Copyright (c) 2021 Salman Raza <raza.salman@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from functools import lru_cache
+from typing import (
+    Any,
+    Dict,
+    ItemsView,
+    Iterable,
+    KeysView,
+    List,
+    Mapping,
+    Tuple,
+    Type,
+)
+
+from .utils.types import R
+
+
+class Record(tuple):  # type: ignore
+    """
+    Base class for compact rows.
+
+    A record stores the values of a row in a tuple, and shares the column
+    headings with all the other records created from the same
+    :py:func:`record_class`, instead of storing them in every row like a
+    dictionary does.
+
+    The values of a record can be accessed by column heading like the values
+    of a dictionary, using ``row["column"]``, :py:meth:`get`, :py:meth:`keys`,
+    :py:meth:`values` and :py:meth:`items`, as well as by position like the
+    items of a tuple. Iterating over a record, and comparing it, behaves like
+    a tuple of its values.
+
+    Records are immutable. Processors applied to records return a new record
+    of the same class with the transformed values.
+    """
+
+    __slots__ = ()
+
+    _fields: Tuple[str, ...] = ()
+    _positions: Dict[str, int] = {}
+    _keys: KeysView = {}.keys()  # type: ignore
+
+    @classmethod
+    def _make(cls, values: Iterable[Any]) -> "Record":
+        """
+        :return: A new record with ``values`` in the order of the column
+            headings.
+        """
+        return tuple.__new__(cls, values)
+
+    @classmethod
+    def from_mapping(cls, row: Mapping[str, Any]) -> "Record":
+        """
+        :return: A new record with the values of ``row`` for each column
+            heading of the record class.
+        """
+        return tuple.__new__(cls, [row[field] for field in cls._fields])
+
+    def __getitem__(self, key: Any) -> Any:
+
+        if key.__class__ is str:
+            return tuple.__getitem__(self, self._positions[key])
+
+        return tuple.__getitem__(self, key)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (_rebuild_record, (self._fields, tuple(self)))
+
+    def __repr__(self) -> str:
+        return f"Record({self.as_dict()!r})"
+
+    def get(self, key: str, default: Any = None) -> Any:
+
+        position = self._positions.get(key)
+
+        if position is None:
+            return default
+
+        return tuple.__getitem__(self, position)
+
+    def keys(self) -> KeysView:  # type: ignore
+        return self._keys
+
+    def values(self) -> List[Any]:
+        return list(self)
+
+    def items(self) -> ItemsView:  # type: ignore
+        return dict(zip(self._fields, self)).items()
+
+    def as_dict(self) -> R:
+        """
+        :return: A dictionary mapping the column headings to the values of
+            the record.
+        """
+        return dict(zip(self._fields, self))
+
+    def replace(self, **kwargs: Any) -> "Record":
+        """
+        :return: A new record with the values of the column headings passed
+            as keyword arguments replaced.
+        """
+        values = list(self)
+
+        for key, value in kwargs.items():
+            values[self._positions[key]] = value
+
+        return tuple.__new__(type(self), values)
+
+
+@lru_cache(maxsize=None)
+def record_class(fields: Tuple[str, ...]) -> Type[Record]:
+    """
+    Create a :py:class:`Record` class for rows with the column headings in
+    ``fields``.
+
+    The same class is returned every time it is called with the same column
+    headings.
+
+    :param fields: A tuple of column headings.
+    :type fields: required
+
+    :return: A subclass of :py:class:`Record`.
+    """
+
+    return type(
+        "Record",
+        (Record,),
+        {
+            "__slots__": (),
+            "_fields": fields,
+            "_positions": {field: i for i, field in enumerate(fields)},
+            "_keys": dict.fromkeys(fields).keys(),
+        },
+    )
+
+
+def _rebuild_record(
+    fields: Tuple[str, ...], values: Tuple[Any, ...]
+) -> Record:
+
+    return record_class(fields)._make(values)
@@ -0,0 +1,474 @@
+# MIT License
+#
+# csvio: A library for conveniently processing CSV files.
+#
+# Copyright (c) 2021 Salman Raza <raza.salman@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import re
+from datetime import date, datetime
+from decimal import Decimal
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from .errors import CellError, SchemaError
+from .utils.types import FN
+
+STR = "str"
+INT = "int"
+FLOAT = "float"
+DECIMAL = "decimal"
+BOOL = "bool"
+DATE = "date"
+DATETIME = "datetime"
+
+TYPES = (STR, INT, FLOAT, DECIMAL, BOOL, DATE, DATETIME)
+
+ISO = "iso"
+
+DATE_FORMATS = (
+    ISO,
+    "%d/%m/%Y",
+    "%m/%d/%Y",
+    "%Y/%m/%d",
+    "%d-%m-%Y",
+    "%d.%m.%Y",
+)
+DATETIME_FORMATS = (
+    ISO,
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%d/%m/%Y %H:%M:%S",
+    "%d/%m/%Y %H:%M",
+    "%m/%d/%Y %H:%M:%S",
+    "%m/%d/%Y %H:%M",
+)
+
+BOOLS = {
+    "true": True,
+    "false": False,
+    "yes": True,
+    "no": False,
+    "t": True,
+    "f": False,
+    "y": True,
+    "n": False,
+}
+BOOL_LOOKUP = {
+    **BOOLS,
+    **{k.upper(): v for k, v in BOOLS.items()},
+    **{k.capitalize(): v for k, v in BOOLS.items()},
+}
+
+INT_RE = re.compile(r"[+-]?(0|[1-9]\d*)")
+LEADING_ZEROS_RE = re.compile(r"[+-]?0\d+")
+FLOAT_RE = re.compile(r"[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?")
+FIXED_POINT_RE = re.compile(r"[+-]?\d*\.\d+")
+ISO_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+ISO_DATETIME_RE = re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}")
+
+FLOAT_DIGITS = 15
+BATCH_SIZE = 1024
+
+Converter = Callable[[str], Any]
+Values = Sequence[Any]
+BatchConverter = Callable[[List[Any], List[int]], List[Values]]
+
+
+def _strptime_converter(type_: str, format_: str) -> Converter:
+
+    if type_ == DATE:
+        if format_ == ISO:
+            return date.fromisoformat
+
+        def to_date(value: str) -> date:
+            return datetime.strptime(value, format_).date()
+
+        return to_date
+
+    if format_ == ISO:
+        return datetime.fromisoformat
+
+    def to_datetime(value: str) -> datetime:
+        return datetime.strptime(value, format_)
+
+    return to_datetime
+
+
+def converter(type_: str, format_: str = None) -> Converter:
+    """
+    :return: The function that converts a text value to ``type_``, using the
+        :py:meth:`datetime.datetime.strptime` format ``format_`` for dates
+        and datetimes, or ISO 8601 if it is not provided.
+    """
+
+    if type_ == INT:
+        return int
+    if type_ == FLOAT:
+        return float
+    if type_ == DECIMAL:
+        return Decimal
+    if type_ == BOOL:
+        return BOOL_LOOKUP.__getitem__
+    if type_ in (DATE, DATETIME):
+        return _strptime_converter(type_, format_ or ISO)
+    if type_ == STR:
+        return str
+
+    raise ValueError(f"Unsupported schema type: {type_}")
+
+
+def _matches_format(values: List[str], type_: str, format_: str) -> bool:
+
+    convert = _strptime_converter(type_, format_)
+
+    if format_ == ISO:
+        pattern = ISO_DATE_RE if type_ == DATE else ISO_DATETIME_RE
+
+        if not all(pattern.match(v) for v in values):
+            return False
+
+    try:
+        for value in values:
+            convert(value)
+    except ValueError:
+        return False
+
+    return True
+
+
+def infer_type(values: Iterable[Any]) -> Tuple[str, Optional[str]]:
+    """
+    Infer the type of a column from a sample of its text values. Empty values
+    are ignored.
+
+    Integers with leading zeros are inferred as text, so that identifiers
+    such as postal codes keep their zeros. Numbers with a decimal point are
+    inferred as ``decimal`` if any of them has more significant digits than a
+    :obj:`float` can represent exactly, and as ``float`` otherwise.
+
+    :return: A tuple of the inferred type, and the format of the values for
+        ``date`` and ``datetime`` types, or :obj:`None` for other types.
+    """
+
+    sample = [v for v in values if v not in ("", None)]
+
+    if not sample:
+        return STR, None
+
+    if all(v in BOOL_LOOKUP for v in sample):
+        return BOOL, None
+
+    if all(INT_RE.fullmatch(v) for v in sample):
+        return INT, None
+
+    if any(LEADING_ZEROS_RE.fullmatch(v) for v in sample):
+        return STR, None
+
+    if all(FLOAT_RE.fullmatch(v) for v in sample):
+
+        if all(FIXED_POINT_RE.fullmatch(v) for v in sample) and any(
+            len(v.lstrip("+-0.").replace(".", "")) > FLOAT_DIGITS
+            for v in sample
+        ):
+            return DECIMAL, None
+
+        return FLOAT, None
+
+    for type_, formats in ((DATE, DATE_FORMATS), (DATETIME, DATETIME_FORMATS)):
+        for format_ in formats:
+            if _matches_format(sample, type_, format_):
+                return type_, format_
+
+    return STR, None
+
+
+class Schema:
+    """
+    Types of the columns of a CSV, used by :py:class:`~csvio.CSVReader` to
+    convert the text values of the columns as they are read.
+
+    The values are converted a batch of rows at a time, one column at a time,
+    using a converter specialized for each type. Empty values are converted
+    to :obj:`None` for every type except ``str``.
+
+    :param types: A dictionary mapping column headings to their types, one
+        of ``str``, ``int``, ``float``, ``decimal``, ``bool``, ``date`` or
+        ``datetime``. A :py:meth:`datetime.datetime.strptime` format can be
+        appended to ``date`` and ``datetime`` types after a colon, for example
+        ``date:%d/%m/%Y``. Dates and datetimes are expected in ISO 8601
+        format otherwise.
+    :type types: optional
+
+    :param infer: If :obj:`True` the types of the columns that are not in
+        ``types`` are inferred from the first ``sample_size`` rows of the
+        CSV, using :py:func:`infer_type`. Otherwise, columns that are not in
+        ``types`` are not converted.
+    :type infer: optional
+
+    :param sample_size: Number of rows to infer the types from.
+    :type sample_size: optional
+
+    :param on_error: What to do with values that cannot be converted.
+        ``raise`` raises a :py:class:`~csvio.errors.SchemaError` listing the
+        values that could not be converted in the batch of rows. ``null``
+        replaces them with :obj:`None`, and ``keep`` keeps the text value.
+        The values that could not be converted are recorded in
+        :py:attr:`errors` in all cases.
+    :type on_error: optional
+
+    :param max_errors: Maximum number of errors kept in :py:attr:`errors`.
+        :py:attr:`error_count` counts all of them.
+    :type max_errors: optional
+
+    Usage:
+
+    .. code-block:: python
+
+        >>> from csvio import CSVReader
+        >>> from csvio.schema import Schema
+        >>> reader = CSVReader("fruit_stock.csv", schema=Schema(infer=True))
+        >>> reader.schema.types
+        {'Supplier': 'str', 'Fruit': 'str', 'Quantity': 'int'}
+        >>> reader.rows[0]
+        {'Supplier': 'Big Apple', 'Fruit': 'Apple', 'Quantity': 1}
+    """
+
+    def __init__(
+        self,
+        types: Dict[str, str] = {},
+        infer: bool = False,
+        sample_size: int = 1000,
+        on_error: str = "raise",
+        max_errors: int = 1000,
+    ) -> None:
+
+        if on_error not in ("raise", "null", "keep"):
+            raise ValueError(f"Unsupported on_error value: {on_error}")
+
+        self.types: Dict[str, str] = {}
+        self.formats: Dict[str, str] = {}
+        self.infer = infer
+        self.sample_size = sample_size
+        self.on_error = on_error
+        self.max_errors = max_errors
+
+        self.errors: List[CellError] = []
+        self.error_count = 0
+
+        for column, type_spec in types.items():
+            self.set_type(column, type_spec)
+
+    def __repr__(self) -> str:
+        return f"Schema({self.type_specs()!r})"
+
+    def set_type(self, column: str, type_spec: str) -> None:
+        """
+        Set the type of ``column`` to ``type_spec``, which is given in the
+        same form as the values of the ``types`` parameter.
+        """
+
+        type_, _, format_ = type_spec.partition(":")
+
+        if type_ not in TYPES:
+            raise ValueError(f"Unsupported schema type: {type_}")
+
+        self.types[column] = type_
+
+        if format_:
+            self.formats[column] = format_
+        else:
+            self.formats.pop(column, None)
+
+    def type_specs(self) -> Dict[str, str]:
+        """
+        :return: The types of the columns in the same form as the ``types``
+            parameter.
+        """
+        return {
+            column: f"{type_}:{self.formats[column]}"
+            if column in self.formats
+            else type_
+            for column, type_ in self.types.items()
+        }
+
+    def infer_types(self, header: FN, sample: Iterable[Values]) -> None:
+        """
+        Infer the types of the columns in ``header`` that do not have a type
+        yet, from ``sample``, a list of rows tokenized by
+        :py:func:`csv.reader`.
+        """
+
+        sample = list(sample)
+
+        for i, column in enumerate(header):
+
+            if column in self.types:
+                continue
+
+            type_, format_ = infer_type(
+                row[i] for row in sample if len(row) > i
+            )
+            self.types[column] = type_
+
+            if format_ is not None and format_ != ISO:
+                self.formats[column] = format_
+
+        self.infer = False
+
+    def sample_rows(
+        self, header: FN, rows: Iterator[List[str]]
+    ) -> Iterator[List[str]]:
+        """
+        Infer the types of the columns from the first rows of ``rows`` if
+        required.
+
+        :return: An iterator over all of ``rows``, including the ones read
+            for the inference.
+        """
+
+        if not self.infer:
+            return rows
+
+        sample = list(islice(rows, self.sample_size))
+        self.infer_types(header, sample)
+
+        return _chain(sample, rows)
+
+    def add_errors(self, errors: List[CellError], count: int) -> None:
+        """
+        Add conversion errors recorded by a copy of this schema, such as the
+        one used by a worker process.
+        """
+
+        self.error_count += count
+        self.errors.extend(
+            errors[: max(0, self.max_errors - len(self.errors))]
+        )
+
+    def __record_error(self, error: CellError) -> None:
+
+        self.error_count += 1
+
+        if len(self.errors) < self.max_errors:
+            self.errors.append(error)
+
+    def batch_converter(self, columns: FN) -> Optional[BatchConverter]:
+        """
+        Compile a function that converts a batch of rows with the values of
+        ``columns``, in that order.
+
+        The function accepts a list of rows, each a list of values, and the
+        list of their record numbers in the CSV, and returns the list of
+        converted rows.
+
+        :return: The batch converter, or :obj:`None` if none of ``columns``
+            needs to be converted.
+        """
+
+        converters = [
+            (
+                i,
+                column,
+                self.types[column],
+                converter(self.types[column], self.formats.get(column)),
+            )
+            for i, column in enumerate(columns)
+            if self.types.get(column, STR) != STR
+        ]
+
+        if not converters:
+            return None
+
+        on_error = self.on_error
+        record_error = self.__record_error
+
+        def convert_slow(
+            values: Values,
+            column: str,
+            type_: str,
+            convert: Converter,
+            records: List[int],
+        ) -> List[Any]:
+
+            converted: List[Any] = []
+            cell_errors: List[CellError] = []
+
+            for record, value in zip(records, values):
+
+                if value == "" or value is None:
+                    converted.append(None)
+                    continue
+
+                try:
+                    converted.append(convert(value))
+                    continue
+                except (ValueError, TypeError, ArithmeticError, KeyError):
+                    pass
+
+                if type_ == BOOL and value.lower() in BOOLS:
+                    converted.append(BOOLS[value.lower()])
+                    continue
+
+                error = CellError(record, column, value, type_)
+                cell_errors.append(error)
+                record_error(error)
+                converted.append(None if on_error == "null" else value)
+
+            if cell_errors and on_error == "raise":
+                raise SchemaError(cell_errors)
+
+            return converted
+
+        def convert_batch(
+            batch: List[Any], records: List[int]
+        ) -> List[Values]:
+
+            transposed: List[Any] = list(zip(*batch))
+
+            for i, column, type_, convert in converters:
+
+                try:
+                    transposed[i] = list(map(convert, transposed[i]))
+                except (ValueError, TypeError, ArithmeticError, KeyError):
+                    transposed[i] = convert_slow(
+                        transposed[i], column, type_, convert, records
+                    )
+
+            return list(zip(*transposed))
+
+        return convert_batch
+
+
+def _chain(
+    sample: List[List[str]], rows: Iterator[List[str]]
+) -> Iterator[List[str]]:
+
+    yield from sample
+    yield from rows
@@ -0,0 +1,462 @@
+# MIT License
+#
+# csvio: A library for conveniently processing CSV files.
+#
+# Copyright (c) 2021 Salman Raza <raza.salman@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import heapq
+import os
+import pickle
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain, islice
+from operator import itemgetter
+from typing import Any, Callable, Iterable, Iterator, List, NamedTuple, Tuple
+
+from .csvreader import CSVReader
+from .csvwriter import CSVWriter
+from .utils.executors import map_bounded
+from .utils.types import FN, KW
+
+#: Default memory budget of a sorted run, in bytes.
+MEMORY_LIMIT = 256 * 1024 * 1024
+
+#: Default maximum number of runs merged at the same time.
+MERGE_WIDTH = 64
+
+#: Number of rows read to estimate the memory used per row and to detect the
+#: numeric key columns.
+SAMPLE_ROWS = 1000
+
+#: Number of rows read, stored in a run file or written at a time.
+BATCH_SIZE = 10000
+
+_END = object()
+
+Values = Tuple[Any, ...]
+Entry = Tuple[Tuple[Any, ...], Values]
+KeySpec = Tuple[Tuple[int, bool], ...]
+
+
+class SortResult(NamedTuple):
+    """
+    Summary of a sort performed by :py:func:`sort_csv`.
+    """
+
+    #: Number of rows written to the output CSV.
+    rows: int
+
+    #: Number of sorted runs the rows were split into. A single run means the
+    #: rows were sorted in memory without being spilled to temporary files.
+    runs: int
+
+
+def _is_number(value: Any) -> bool:
+
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return False
+
+    return number == number
+
+
+def _numeric_part(value: Any) -> Tuple[int, Any]:
+    """
+    :return: A key that orders empty values first, then numbers by their
+        value, then any other text.
+    """
+
+    if value.__class__ is not str:
+        return (0, 0) if value is None else (1, value)
+
+    if not value:
+        return (0, 0)
+
+    try:
+        return (1, int(value))
+    except ValueError:
+        pass
+
+    if _is_number(value):
+        return (1, float(value))
+
+    return (2, value)
+
+
+def _text_part(value: Any) -> Any:
+
+    return "" if value is None else value
+
+
+def _key_function(spec: KeySpec) -> Callable[[Values], Tuple[Any, ...]]:
+    """
+    :return: A function returning the sort key of the values of a row, from
+        the positions of the key columns and whether each of them is
+        compared as numbers.
+    """
+
+    parts = [
+        (position, _numeric_part if numeric else _text_part)
+        for position, numeric in spec
+    ]
+
+    def key(values: Values) -> Tuple[Any, ...]:
+        return tuple([part(values[position]) for position, part in parts])
+
+    return key
+
+
+def _key_spec(
+    sample: List[Values], positions: List[int], typed: bool
+) -> KeySpec:
+    """
+    Detect the key columns to compare as numbers, those whose non-empty
+    values in ``sample`` are all numbers.
+    """
+
+    spec = []
+
+    for position in positions:
+
+        numeric = typed and all(
+            value.__class__ is not str or not value or _is_number(value)
+            for value in (values[position] for values in sample)
+        )
+        spec.append((position, numeric))
+
+    return tuple(spec)
+
+
+def _entry_size(entry: Entry) -> int:
+
+    key, values = entry
+
+    return (
+        sys.getsizeof(entry)
+        + sys.getsizeof(key)
+        + sum(map(sys.getsizeof, key))
+        + sys.getsizeof(values)
+        + sum(map(sys.getsizeof, values))
+    )
+
+
+def _write_run(path: str, entries: Iterable[Entry], batch_size: int) -> None:
+
+    entries = iter(entries)
+
+    with open(path, "wb") as fh:
+        for batch in iter(lambda: list(islice(entries, batch_size)), []):
+            pickle.dump(batch, fh, pickle.HIGHEST_PROTOCOL)
+
+
+def _read_run(path: str) -> Iterator[Entry]:
+
+    with open(path, "rb") as fh:
+        while True:
+            try:
+                batch = pickle.load(fh)
+            except EOFError:
+                break
+
+            yield from batch
+
+
+def _sort_run(
+    spec: KeySpec,
+    reverse: bool,
+    batch_size: int,
+    path: str,
+    rows: List[Values],
+) -> str:
+    """
+    Sort the values of the rows of a run and write them, with their keys, to
+    the run file ``path``, in batches of ``batch_size`` rows.
+    """
+
+    key = _key_function(spec)
+    entries = [(key(values), values) for values in rows]
+    del rows
+
+    entries.sort(key=itemgetter(0), reverse=reverse)
+    _write_run(path, entries, batch_size)
+
+    return path
+
+
+def _merge(paths: List[str], reverse: bool) -> Iterator[Entry]:
+
+    return heapq.merge(
+        *map(_read_run, paths), key=itemgetter(0), reverse=reverse
+    )
+
+
+def sort_csv(
+    input: str,
+    output: str,
+    key: FN,
+    typed: bool = True,
+    reverse: bool = False,
+    memory_limit: int = MEMORY_LIMIT,
+    tmp_dir: str = None,
+    workers: int = 1,
+    merge_width: int = MERGE_WIDTH,
+    reader_kwargs: KW = None,
+    writer_kwargs: KW = None,
+) -> SortResult:
+    """
+    Sort the rows of a CSV by the values of the ``key`` columns and write
+    them to another CSV, using a bounded amount of memory regardless of the
+    size of the CSV.
+
+    The rows are read by a :py:class:`~csvio.CSVReader` in runs that fit in
+    ``memory_limit`` bytes. Each run is sorted and spilled to a temporary
+    file, and the runs are then merged with :py:func:`heapq.merge` and
+    written by a :py:class:`~csvio.CSVWriter`. A CSV that fits in a single
+    run is sorted in memory without temporary files. Since the rows are
+    parsed by the reader, values with quoted newlines are sorted as a whole.
+
+    The sort is stable, rows with equal keys are written in the order they
+    are read.
+
+    :param input: Full path to the CSV to sort.
+    :type input: required
+
+    :param output: Full path to the sorted CSV to write.
+    :type output: required
+
+    :param key: Column headings of the columns to sort the rows by, in order
+        of precedence.
+    :type key: required
+
+    :param typed: If :obj:`True` the key columns whose first values are all
+        numbers, or empty, are compared as numbers, with the empty values
+        first. Otherwise, and for the other columns, the values are compared
+        as text.
+    :type typed: optional
+
+    :param reverse: Sort the rows in descending order of their keys.
+    :type reverse: optional
+
+    :param memory_limit: Approximate memory used by the rows of a run, in
+        bytes, estimated from the first rows of the CSV.
+    :type memory_limit: optional
+
+    :param tmp_dir: Directory of the temporary run files. The default
+        temporary directory of :py:mod:`tempfile` if not provided.
+    :type tmp_dir: optional
+
+    :param workers: Number of processes that sort the runs. With more than
+        one worker the runs are sorted and spilled in worker processes while
+        the next runs are read, holding up to ``workers`` runs in memory.
+    :type workers: optional
+
+    :param merge_width: Maximum number of run files merged at the same time.
+        Larger numbers of runs are first merged in groups into longer runs.
+    :type merge_width: optional
+
+    :param reader_kwargs: Keyword arguments passed to the
+        :py:class:`~csvio.CSVReader` of the input CSV, for example
+        ``processors``, ``columns`` or ``where``.
+    :type reader_kwargs: optional
+
+    :param writer_kwargs: Keyword arguments passed to the
+        :py:class:`~csvio.CSVWriter` of the output CSV, for example
+        ``compression`` or ``csv_kwargs``.
+    :type writer_kwargs: optional
+
+    :return: A :py:class:`SortResult` with the number of rows written and
+        the number of runs.
+
+    Usage:
+
+    .. code-block:: python
+
+        >>> from csvio import sort_csv
+        >>> sort_csv(
+        ...     "export.csv",
+        ...     "export_sorted.csv",
+        ...     key=["Supplier", "Quantity"],
+        ...     memory_limit=1024 ** 3,
+        ... )
+        SortResult(rows=480000000, runs=41)
+    """
+
+    if memory_limit < 1:
+        raise ValueError("memory_limit must be a positive integer")
+
+    if merge_width < 2:
+        raise ValueError("merge_width must be at least 2")
+
+    reader_kwargs = {**(reader_kwargs or {}), "lazy": True}
+    reader = CSVReader(input, **reader_kwargs)
+    fieldnames = reader.fieldnames
+
+    missing = [c for c in key if c not in fieldnames]
+
+    if not key or missing:
+        raise ValueError(f"Key columns not found in the CSV: {missing}")
+
+    get_values = itemgetter(*fieldnames)
+
+    if len(fieldnames) == 1:
+        rows: Iterator[Values] = (
+            (get_values(row),)
+            for chunk in reader.iter_chunks(BATCH_SIZE)
+            for row in chunk
+        )
+    else:
+        rows = (
+            get_values(row)
+            for chunk in reader.iter_chunks(BATCH_SIZE)
+            for row in chunk
+        )
+
+    sample = list(islice(rows, SAMPLE_ROWS))
+    spec = _key_spec(sample, [fieldnames.index(c) for c in key], typed)
+
+    if sample:
+        row_key = _key_function(spec)
+        size = sum(_entry_size((row_key(v), v)) for v in sample) / len(sample)
+        run_rows = max(1, int(memory_limit / size))
+    else:
+        run_rows = 1
+
+    all_rows = chain(sample, rows)
+
+    writer = CSVWriter(
+        output, fieldnames, keep_rows=False, **(writer_kwargs or {})
+    )
+
+    with tempfile.TemporaryDirectory(prefix="csvio-sort-", dir=tmp_dir) as tmp:
+
+        first = list(islice(all_rows, run_rows))
+        peek: Any = next(all_rows, _END)
+
+        if peek is _END:
+            row_key = _key_function(spec)
+            first = [(row_key(values), values) for values in first]
+            first.sort(key=itemgetter(0), reverse=reverse)
+            merged: Iterator[Entry] = iter(first)
+            num_runs = 1 if first else 0
+        else:
+            rest = chain([peek], all_rows)
+            runs = chain(
+                [first], iter(lambda: list(islice(rest, run_rows)), [])
+            )
+            del first
+
+            batch_size = max(1, run_rows // merge_width)
+            paths = _spill_runs(runs, spec, reverse, batch_size, tmp, workers)
+            num_runs = len(paths)
+            merged = _merge(
+                _reduce_runs(paths, reverse, batch_size, tmp, merge_width),
+                reverse,
+            )
+
+        num_rows = 0
+
+        for batch in iter(lambda: list(islice(merged, BATCH_SIZE)), []):
+            writer.add_rows([dict(zip(fieldnames, v)) for _, v in batch])
+            writer.flush()
+            num_rows += len(batch)
+
+        if not num_rows:
+            writer.write_blank_csv()
+
+    return SortResult(num_rows, num_runs)
+
+
+def _spill_runs(
+    runs: Iterator[List[Values]],
+    spec: KeySpec,
+    reverse: bool,
+    batch_size: int,
+    tmp_dir: str,
+    workers: int,
+) -> List[str]:
+    """
+    Sort the runs and write each of them to a file in ``tmp_dir``.
+
+    :return: The paths of the run files in the order of the runs.
+    """
+
+    def named() -> Iterator[Tuple[str, List[Values]]]:
+        for number, run in enumerate(runs):
+            yield os.path.join(tmp_dir, f"run{number:06}"), run
+            del run
+
+    sort_run = partial(_sort_run_item, spec, reverse, batch_size)
+
+    if workers > 1:
+        with ProcessPoolExecutor(workers) as executor:
+            return list(map_bounded(executor, sort_run, named(), workers))
+
+    return list(map(sort_run, named()))
+
+
+def _sort_run_item(
+    spec: KeySpec,
+    reverse: bool,
+    batch_size: int,
+    item: Tuple[str, List[Values]],
+) -> str:
+
+    return _sort_run(spec, reverse, batch_size, *item)
+
+
+def _reduce_runs(
+    paths: List[str],
+    reverse: bool,
+    batch_size: int,
+    tmp_dir: str,
+    merge_width: int,
+) -> List[str]:
+    """
+    Merge groups of ``merge_width`` runs into longer runs until there are no
+    more than ``merge_width`` runs left.
+
+    :return: The paths of the remaining run files, in the order of the runs.
+    """
+
+    level = 0
+
+    while len(paths) > merge_width:
+
+        merged_paths = []
+
+        for number, start in enumerate(range(0, len(paths), merge_width)):
+
+            group = paths[start : start + merge_width]
+            path = os.path.join(tmp_dir, f"merge{level}-{number:06}")
+
+            _write_run(path, _merge(group, reverse), batch_size)
+
+            for run_path in group:
+                os.remove(run_path)
+
+            merged_paths.append(path)
+
+        paths = merged_paths
+        level += 1
+
+    return paths
@@ -0,0 +1,219 @@
+import gc
+import hashlib
+import os
+import pickle
+import tempfile
+from typing import Any, Optional
+
+from .types import KW
+
+CACHE_SUFFIX = ".csvio-rows"
+DEFAULT_MAX_BYTES = 1 << 30
+
+
+def default_cache_dir() -> str:
+    """
+    :return: The directory used by :py:class:`RowCache` when none is
+        provided, ``csvio`` in the user's cache directory.
+    """
+
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+
+    return os.path.join(base, "csvio")
+
+
+def fingerprint(obj: Any) -> Any:
+    """
+    :return: A representation of ``obj`` that changes when its value does,
+        for including it in a cache key. Functions are represented by their
+        qualified name, their byte code and constants, and the values they
+        close over, so that editing a function invalidates the cached results
+        it produced.
+    """
+
+    if isinstance(obj, dict):
+        return {str(k): fingerprint(v) for k, v in obj.items()}
+
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        items = [fingerprint(v) for v in obj]
+        return (
+            sorted(items, key=repr)
+            if isinstance(obj, (set, frozenset))
+            else items
+        )
+
+    if callable(obj):
+
+        parts = [
+            getattr(obj, "__module__", None),
+            getattr(obj, "__qualname__", type(obj).__qualname__),
+        ]
+        code = getattr(obj, "__code__", None)
+
+        if code is not None:
+            parts += [code.co_code.hex(), fingerprint(code.co_consts)]
+
+        for cell in getattr(obj, "__closure__", None) or ():
+            parts.append(fingerprint(cell.cell_contents))
+
+        return parts
+
+    if isinstance(obj, (str, int, float, bool, type(None))):
+        return obj
+
+    if hasattr(obj, "co_code"):
+        return [obj.co_code.hex(), fingerprint(obj.co_consts)]
+
+    return repr(obj)
+
+
+def fingerprint_digest(obj: Any) -> str:
+    """
+    :return: A SHA-256 hex digest of the :py:func:`fingerprint` of ``obj``.
+    """
+
+    text = repr(fingerprint(obj)).encode("utf-8", "replace")
+
+    return hashlib.sha256(text).hexdigest()
+
+
+class RowCache:
+    """
+    A directory of files storing the rows read from CSVs in binary form, to
+    load them instead of reading the CSVs again.
+
+    Each file is stored under a key computed from a dictionary describing the
+    CSV and how its rows are read, and holds the rows pickled with the
+    highest :py:mod:`pickle` protocol. Once the files in the directory take
+    more than ``max_bytes``, the least recently used are deleted.
+
+    :param directory: Directory to store the files in. It is created if it
+        does not exist. Defaults to ``csvio`` in the user's cache directory.
+    :type directory: optional
+
+    :param max_bytes: Maximum total size of the files in the directory.
+    :type max_bytes: optional
+    """
+
+    def __init__(
+        self, directory: str = None, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def key(self, description: KW) -> str:
+        """
+        :return: The key of the rows described by ``description``.
+        """
+
+        return fingerprint_digest(description)
+
+    def path(self, key: str) -> str:
+        """
+        :return: Path of the file storing the rows under ``key``.
+        """
+        return os.path.join(self.directory, key + CACHE_SUFFIX)
+
+    def load(self, key: str) -> Optional[Any]:
+        """
+        :return: The rows stored under ``key``, or :obj:`None` if there are
+            none or they cannot be loaded.
+        """
+
+        path = self.path(key)
+
+        gc_enabled = gc.isenabled()
+        gc.disable()
+
+        try:
+            with open(path, "rb") as fh:
+                rows = pickle.load(fh)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            self.__remove(path)
+            return None
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return rows
+
+    def save(self, key: str, rows: Any) -> bool:
+        """
+        Store ``rows`` under ``key``, and delete the least recently used
+        files if the directory takes more than ``max_bytes`` afterwards.
+
+        :return:
+            :obj:`True` If the rows are stored successfully.
+
+            :obj:`False` On failure.
+        """
+
+        tmp_path = None
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory)
+
+            with os.fdopen(fd, "wb") as fh:
+                pickle.dump(rows, fh, protocol=pickle.HIGHEST_PROTOCOL)
+
+            os.replace(tmp_path, self.path(key))
+
+        except (OSError, pickle.PicklingError, AttributeError, TypeError):
+            self.__remove(tmp_path)
+            return False
+
+        self.evict()
+
+        return True
+
+    def evict(self) -> None:
+        """
+        Delete the least recently used files until the files in the
+        directory take at most ``max_bytes``.
+        """
+
+        try:
+            entries = [
+                entry
+                for entry in os.scandir(self.directory)
+                if entry.name.endswith(CACHE_SUFFIX)
+            ]
+            files = sorted(
+                (
+                    (e.stat().st_mtime_ns, e.stat().st_size, e.path)
+                    for e in entries
+                ),
+            )
+        except OSError:
+            return
+
+        total = sum(size for _, size, _ in files)
+
+        for _, size, path in files:
+
+            if total <= self.max_bytes:
+                break
+
+            self.__remove(path)
+            total -= size
+
+    def __remove(self, path: Optional[str]) -> None:
+
+        if path is None:
+            return
+
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,99 @@
+import bz2
+import gzip
+import lzma
+from typing import IO, Any, Callable, Dict, Optional, Tuple
+
+from .types import KW
+
+TEXT_KWARGS = ("encoding", "errors", "newline")
+
+#: Supported compression formats, mapped to their file extension, the magic
+#: bytes at the start of their files, the function opening them, and the name
+#: of its compression level argument.
+COMPRESSIONS: Dict[str, Tuple[str, bytes, Callable[..., IO[Any]], str]] = {
+    "gzip": (".gz", b"\x1f\x8b", gzip.open, "compresslevel"),
+    "bz2": (".bz2", b"BZh", bz2.open, "compresslevel"),
+    "xz": (".xz", b"\xfd7zXZ\x00", lzma.open, "preset"),
+}
+
+
+def compression_from_ext(file_ext: str) -> Optional[str]:
+    """
+    :return: The compression format of a file with the ``file_ext``
+        extension, or :obj:`None` if it is not a compressed file extension.
+    """
+
+    for compression, (ext, _, _, _) in COMPRESSIONS.items():
+        if file_ext.lower() == ext:
+            return compression
+
+    return None
+
+
+def compression_from_magic(filepath: str) -> Optional[str]:
+    """
+    :return: The compression format of the file at ``filepath`` found from
+        the bytes it starts with, or :obj:`None` if it is not compressed or
+        cannot be read.
+    """
+
+    try:
+        with open(filepath, "rb") as fh:
+            head = fh.read(6)
+    except OSError:
+        return None
+
+    for compression, (_, magic, _, _) in COMPRESSIONS.items():
+        if head.startswith(magic):
+            return compression
+
+    return None
+
+
+def open_file(
+    filepath: str,
+    mode: str,
+    compression: str = None,
+    compresslevel: int = None,
+    **open_kwargs: Any,
+) -> IO[Any]:
+    """
+    Open the file at ``filepath``, compressing or decompressing its contents
+    on the fly if ``compression`` is one of the :py:data:`COMPRESSIONS`.
+
+    :param mode: Mode to open the file in, as for :py:func:`open`. Files are
+        opened in text mode unless ``mode`` contains ``b``.
+    :type mode: required
+
+    :param compression: Compression format of the file, or :obj:`None` for an
+        uncompressed file.
+    :type compression: optional
+
+    :param compresslevel: Compression level for writing the file, from ``1``
+        for the fastest to ``9`` for the smallest.
+    :type compresslevel: optional
+
+    :param open_kwargs: Keyword arguments to pass to :py:func:`open`. Only
+        ``encoding``, ``errors`` and ``newline`` are passed for compressed
+        files opened in text mode.
+
+    :return: A file object.
+    """
+
+    if compression is None:
+        return open(filepath, mode, **open_kwargs)
+
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unsupported compression: {compression!r}")
+
+    _, _, opener, level_arg = COMPRESSIONS[compression]
+    kwargs: KW = {}
+
+    if "b" not in mode:
+        mode = mode if "t" in mode else mode + "t"
+        kwargs = {k: v for k, v in open_kwargs.items() if k in TEXT_KWARGS}
+
+    if compresslevel is not None and "r" not in mode:
+        kwargs[level_arg] = compresslevel
+
+    return opener(filepath, mode, **kwargs)
@@ -0,0 +1,64 @@
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    as_completed,
+    wait,
+)
+from typing import Any, Callable, Deque, Iterable, Iterator, Set
+
+
+def map_bounded(
+    executor: Executor,
+    func_: Callable[..., Any],
+    items: Iterable[Any],
+    max_pending: int,
+    ordered: bool = True,
+) -> Iterator[Any]:
+    """
+    Apply ``func_`` to every item of ``items`` using ``executor``, yielding
+    the results as they become available.
+
+    Unlike :py:meth:`concurrent.futures.Executor.map`, at most
+    ``max_pending`` items are submitted ahead of the results being consumed,
+    so a slow consumer does not cause all the results to pile up in memory.
+
+    :param ordered: If :obj:`True` the results are yielded in the same order
+        as ``items``, otherwise in the order in which they are completed.
+    :type ordered: optional
+    """
+
+    items = iter(items)
+    max_pending = max(1, max_pending)
+
+    if ordered:
+
+        queue: Deque[Future[Any]] = deque()
+
+        for item in items:
+
+            queue.append(executor.submit(func_, item))
+
+            if len(queue) >= max_pending:
+                yield queue.popleft().result()
+
+        while queue:
+            yield queue.popleft().result()
+
+    else:
+
+        pending: Set[Future[Any]] = set()
+
+        for item in items:
+
+            pending.add(executor.submit(func_, item))
+
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    yield future.result()
+
+        for future in as_completed(pending):
+            yield future.result()
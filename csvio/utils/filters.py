@@ -0,0 +1,158 @@
+import operator
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple, Union
+
+from .types import FN
+
+Values = List[str]
+ValuesFilter = Callable[[Values], bool]
+Condition = Tuple[str, str, Any]
+
+OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "in": lambda cell, value: cell in value,
+    "not in": lambda cell, value: cell not in value,
+    "contains": operator.contains,
+    "startswith": lambda cell, value: cell.startswith(value),
+    "endswith": lambda cell, value: cell.endswith(value),
+}
+
+#: Operators that only compare the cells as text.
+STRING_OPERATORS = ("contains", "startswith", "endswith")
+
+
+class RowView(Mapping):  # type: ignore
+    """
+    Read only mapping of column headings to the values of a tokenized row,
+    without building a dictionary for it.
+
+    The same object is reused for every row, so it must not be stored by the
+    predicates it is passed to.
+    """
+
+    __slots__ = ("positions", "row_values")
+
+    def __init__(self, positions: Dict[str, int]) -> None:
+
+        self.positions = positions
+        self.row_values: Values = []
+
+    def __getitem__(self, key: str) -> str:
+        return self.row_values[self.positions[key]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.positions)
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+
+Where = Union[Callable[[RowView], bool], Condition, Sequence[Condition]]
+
+
+def _to_number(cell: str) -> Union[int, float]:
+    """
+    Convert the value of a cell to an :obj:`int`, or a :obj:`float` if it is
+    not an integer, so cells of any numeric format compare with numbers.
+    """
+
+    try:
+        return int(cell)
+    except ValueError:
+        return float(cell)
+
+
+def _compile_condition(
+    condition: Condition, positions: Dict[str, int]
+) -> ValuesFilter:
+
+    column, op, value = condition
+
+    if column not in positions:
+        raise ValueError(f"Column not found in the CSV: {column}")
+
+    if op not in OPERATORS:
+        raise ValueError(f"Unsupported filter operator: {op}")
+
+    if op in STRING_OPERATORS and not isinstance(value, str):
+        raise ValueError(f"The {op} filter operator needs a string value")
+
+    index = positions[column]
+    compare = OPERATORS[op]
+
+    sample = next(iter(value), None) if op in ("in", "not in") else value
+
+    if isinstance(sample, (int, float)) and not isinstance(sample, bool):
+
+        # A cell that is not a number is never equal to the value, and is
+        # neither less nor greater than it
+        mismatch = op in ("!=", "not in")
+
+        def numeric_filter(values: Values) -> bool:
+            try:
+                number = _to_number(values[index])
+            except ValueError:
+                return mismatch
+            return compare(number, value)
+
+        return numeric_filter
+
+    def filter_(values: Values) -> bool:
+        return compare(values[index], value)
+
+    return filter_
+
+
+def compile_where(where: Where, header: FN) -> ValuesFilter:
+    """
+    Compile the ``where`` argument of :py:class:`~csvio.CSVReader` to a
+    single function that accepts the list of values tokenized from a row and
+    returns :obj:`True` if the row should be kept.
+
+    :param where: Either a function that accepts a read only mapping of the
+        column headings to the unprocessed values of a row, a single
+        ``(column, operator, value)`` condition, or a list of such conditions
+        that must all be met.
+    :type where: required
+
+    :param header: Column headings of the CSV.
+    :type header: required
+    """
+
+    positions = {fieldname: i for i, fieldname in enumerate(header)}
+
+    if callable(where):
+
+        view = RowView(positions)
+        predicate = where
+
+        def predicate_filter(values: Values) -> bool:
+            view.row_values = values
+            return bool(predicate(view))
+
+        return predicate_filter
+
+    conditions: Sequence[Condition]
+
+    if len(where) == 3 and isinstance(where[0], str):
+        conditions = [where]  # type: ignore
+    else:
+        conditions = where  # type: ignore
+
+    filters = tuple(_compile_condition(c, positions) for c in conditions)
+
+    if len(filters) == 1:
+        return filters[0]
+
+    def conditions_filter(values: Values) -> bool:
+        for filter_ in filters:
+            if not filter_(values):
+                return False
+        return True
+
+    return conditions_filter
@@ -0,0 +1,226 @@
+from array import array
+from concurrent.futures import Executor
+from typing import BinaryIO, List, Optional, Tuple
+
+BLOCK_SIZE = 1 << 20
+
+ByteRange = Tuple[int, int]
+
+
+def count_quotes(
+    filepath: str, start: int, end: int, quotechar: Optional[bytes]
+) -> int:
+    """
+    Count the occurrences of ``quotechar`` in the byte range ``start`` to
+    ``end`` of the file at ``filepath``.
+
+    :return: Number of quote characters found, or ``0`` if ``quotechar`` is
+        :obj:`None`.
+    """
+
+    if not quotechar:
+        return 0
+
+    count = 0
+
+    with open(filepath, "rb") as fh:
+
+        fh.seek(start)
+        remaining = end - start
+
+        while remaining > 0:
+
+            block = fh.read(min(BLOCK_SIZE, remaining))
+
+            if not block:
+                break
+
+            count += block.count(quotechar)
+            remaining -= len(block)
+
+    return count
+
+
+def next_record_start(
+    fh: BinaryIO, offset: int, parity: int, quotechar: Optional[bytes]
+) -> int:
+    """
+    Find the byte position of the first record that starts after ``offset``.
+
+    A newline only ends a record if it is not enclosed in quotes, which is
+    the case when an even number of quote characters were seen since the
+    start of the first record, ``parity`` being that number modulo 2 at
+    ``offset``.
+
+    :return: Byte position right after the terminating newline, or the size
+        of the file if there is no record after ``offset``.
+    """
+
+    fh.seek(offset)
+    position = offset
+
+    while True:
+
+        block = fh.read(BLOCK_SIZE)
+
+        if not block:
+            return position
+
+        index = 0
+
+        while True:
+
+            newline = block.find(b"\n", index)
+
+            if newline == -1:
+                if quotechar:
+                    parity ^= block.count(quotechar, index) & 1
+                break
+
+            if quotechar:
+                parity ^= block.count(quotechar, index, newline) & 1
+
+            if parity == 0:
+                return position + newline + 1
+
+            index = newline + 1
+
+        position += len(block)
+
+
+def split_record_ranges(
+    filepath: str,
+    start: int,
+    end: int,
+    num_ranges: int,
+    quotechar: Optional[bytes],
+    executor: Executor = None,
+) -> List[ByteRange]:
+    """
+    Split the byte range ``start`` to ``end`` of a CSV file into at most
+    ``num_ranges`` consecutive ranges that each begin and end on a record
+    boundary.
+
+    The range is first cut into equally sized pieces, and the quote
+    characters in every piece are counted, in parallel if an ``executor`` is
+    provided. The quote parity at each cut is then known without parsing,
+    and each cut is moved forward to the next newline that is not enclosed
+    in quotes.
+
+    ``start`` must be the position at which a record begins. Quotes are
+    expected to be escaped by doubling them, which is the default for the
+    :py:mod:`csv` module, and the file encoding must represent newlines and
+    quote characters as single ASCII bytes.
+
+    :return: List of ``(start, end)`` byte ranges.
+    """
+
+    num_ranges = max(1, min(num_ranges, end - start))
+    step = (end - start) // num_ranges
+    cuts = [start + step * i for i in range(num_ranges)] + [end]
+    pieces = list(zip(cuts[:-1], cuts[1:]))
+
+    if executor is not None:
+        counts = list(
+            executor.map(
+                count_quotes,
+                *zip(*[(filepath, s, e, quotechar) for s, e in pieces]),
+            )
+        )
+    else:
+        counts = [count_quotes(filepath, s, e, quotechar) for s, e in pieces]
+
+    boundaries = [start]
+    parity = 0
+
+    with open(filepath, "rb") as fh:
+
+        for cut, count in zip(cuts[1:-1], counts):
+
+            parity ^= count & 1
+            boundary = next_record_start(fh, cut, parity, quotechar)
+
+            if boundary > boundaries[-1]:
+                boundaries.append(min(boundary, end))
+
+    if boundaries[-1] < end:
+        boundaries.append(end)
+
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def record_offsets(
+    fh: BinaryIO,
+    start: int,
+    quotechar: Optional[bytes],
+    stride: int = 1,
+    first: int = 0,
+    complete: bool = False,
+) -> Tuple["array[int]", int, int]:
+    """
+    Find the byte positions of the records of a CSV file, from the record
+    that begins at ``start``. Blank lines between records are skipped, in the
+    same way as they are skipped when the CSV is read.
+
+    :param stride: Only the byte positions of every ``stride``-th record are
+        returned, or none if it is ``0``.
+    :type stride: optional
+
+    :param first: Number of records before ``start``, for the records
+        whose byte positions are returned to be counted from the first record
+        of the CSV.
+    :type first: optional
+
+    :param complete: If :obj:`True` a last record that is not terminated by
+        a newline, such as one that is still being written, is ignored.
+    :type complete: optional
+
+    :return: A tuple of an :py:class:`array.array` of the byte positions of
+        every ``stride``-th record, the number of records found, and the byte
+        position at which the last record ends.
+    """
+
+    offsets = array("Q")
+    position = end = start
+    parity = 0
+    count = 0
+    record: Optional[int] = None
+
+    fh.seek(start)
+
+    for line in fh:
+
+        if (
+            parity == 0
+            and record is None
+            and line != b"\n"
+            and line != b"\r\n"
+        ):
+            record = position
+
+        if quotechar:
+            parity ^= line.count(quotechar) & 1
+
+        position += len(line)
+
+        if parity == 0 and line.endswith(b"\n"):
+
+            if record is not None:
+
+                if stride and (first + count) % stride == 0:
+                    offsets.append(record)
+
+                count += 1
+                record = None
+
+            end = position
+
+    if record is not None and not complete:
+
+        if stride and (first + count) % stride == 0:
+            offsets.append(record)
+
+        count += 1
+        end = position
+
+    return offsets, count, end
@@ -0,0 +1,64 @@
+import math
+import random
+from itertools import islice
+from typing import Iterable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+_END = object()
+
+
+def _log_random(rng: random.Random) -> float:
+    """
+    :return: The logarithm of a random number in the interval ``(0, 1)``.
+    """
+    return math.log(rng.random() or 1e-300)
+
+
+def reservoir_sample(
+    items: Iterable[T], k: int, rng: Optional[random.Random] = None
+) -> List[T]:
+    """
+    Select a uniform random sample of ``k`` items from ``items`` in a single
+    pass, holding only the ``k`` selected items in memory.
+
+    Uses Algorithm L, which draws the number of items to skip between
+    replacements instead of a random number for every item, so the skipped
+    items are only consumed by :py:func:`itertools.islice`.
+
+    :return: The selected items, in the order they appear in ``items``.
+        All the items if there are ``k`` or fewer.
+    """
+
+    if k < 0:
+        raise ValueError("k must not be negative")
+
+    if k == 0:
+        return []
+
+    rng = rng or random.Random()
+    it = iter(items)
+
+    reservoir: List[Tuple[int, T]] = list(enumerate(islice(it, k)))
+
+    if len(reservoir) < k:
+        return [item for _, item in reservoir]
+
+    position = k - 1
+    w = math.exp(_log_random(rng) / k)
+
+    while True:
+
+        skip = int(_log_random(rng) / math.log(1.0 - w))
+        item = next(islice(it, skip, None), _END)
+
+        if item is _END:
+            break
+
+        position += skip + 1
+        reservoir[rng.randrange(k)] = (position, item)  # type: ignore
+        w *= math.exp(_log_random(rng) / k)
+
+    reservoir.sort(key=lambda entry: entry[0])
+
+    return [item for _, item in reservoir]
@@ -0,0 +1,141 @@
+import json
+import os
+import sys
+from array import array
+from typing import Any, Dict, Optional, Tuple
+
+from .types import KW
+
+
+def file_signature(filepath: str) -> KW:
+    """
+    :return: A dictionary identifying the current contents of the file at
+        ``filepath`` by its absolute path, size and modification time.
+    """
+
+    stat = os.stat(filepath)
+
+    return {
+        "path": os.path.abspath(filepath),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+
+
+def sidecar_path(filepath: str, suffix: str) -> str:
+    """
+    :return: Path of the sidecar file with the ``suffix`` extension, stored
+        next to the file at ``filepath``.
+    """
+    return f"{filepath}.{suffix}"
+
+
+def load_json_sidecar(filepath: str, suffix: str) -> Optional[Dict[str, Any]]:
+    """
+    Load the data saved with :py:func:`save_json_sidecar` for the file at
+    ``filepath``.
+
+    :return: The saved data, or :obj:`None` if there is no sidecar file, it
+        cannot be read, or the file at ``filepath`` has changed since the data
+        was saved.
+    """
+
+    try:
+        with open(sidecar_path(filepath, suffix), "r") as fh:
+            sidecar = json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+    if sidecar.get("signature") != file_signature(filepath):
+        return None
+
+    return sidecar.get("data")
+
+
+def save_json_sidecar(
+    filepath: str, suffix: str, data: Dict[str, Any]
+) -> bool:
+    """
+    Save ``data`` to a sidecar file next to the file at ``filepath``, along
+    with the signature of its current contents. Nothing is written if
+    ``data`` cannot be serialized to JSON.
+
+    :return:
+        :obj:`True` If the sidecar file is written successfully.
+
+        :obj:`False` On failure.
+    """
+
+    sidecar = {"signature": file_signature(filepath), "data": data}
+
+    try:
+        contents = json.dumps(sidecar)
+    except (TypeError, ValueError):
+        return False
+
+    try:
+        with open(sidecar_path(filepath, suffix), "w") as fh:
+            fh.write(contents)
+    except OSError:
+        return False
+
+    return True
+
+
+def load_array_sidecar(
+    filepath: str, suffix: str, typecode: str
+) -> Optional[Tuple[Dict[str, Any], "array[Any]"]]:
+    """
+    Load the data and the array saved with :py:func:`save_array_sidecar` for
+    the file at ``filepath``.
+
+    :return: A tuple of the saved data and array, or :obj:`None` if there is
+        no sidecar file, it cannot be read, or the file at ``filepath`` has
+        changed since they were saved.
+    """
+
+    try:
+        with open(sidecar_path(filepath, suffix), "rb") as fh:
+            sidecar = json.loads(fh.readline())
+            values = array(typecode)
+            values.frombytes(fh.read())
+    except (OSError, ValueError):
+        return None
+
+    if sidecar.get("signature") != file_signature(filepath):
+        return None
+
+    if sidecar.get("byteorder") != sys.byteorder:
+        values.byteswap()
+
+    return sidecar.get("data"), values
+
+
+def save_array_sidecar(
+    filepath: str, suffix: str, data: Dict[str, Any], values: "array[Any]"
+) -> bool:
+    """
+    Save ``data`` and the contents of ``values`` in binary form to a sidecar
+    file next to the file at ``filepath``, along with the signature of its
+    current contents.
+
+    :return:
+        :obj:`True` If the sidecar file is written successfully.
+
+        :obj:`False` On failure.
+    """
+
+    sidecar = {
+        "signature": file_signature(filepath),
+        "byteorder": sys.byteorder,
+        "data": data,
+    }
+
+    try:
+        with open(sidecar_path(filepath, suffix), "wb") as fh:
+            fh.write(json.dumps(sidecar).encode() + b"\n")
+            values.tofile(fh)
+    except (OSError, TypeError, ValueError):
+        return False
+
+    return True
@@ -0,0 +1,221 @@
+# MIT License
+#
+# csvio: A library for conveniently processing CSV files.
+#
+# Copyright (c) 2021 Salman Raza <raza.salman@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import os
+from statistics import mean
+
+import pytest
+
+from csvio import CSVReader, CSVWriter
+
+FIELDNAMES = ["region", "product", "amount"]
+
+
+def sample_rows(num_rows):
+
+    return [
+        {
+            "region": f"r{i % 3}",
+            "product": f"p{i % 40}",
+            "amount": str(i % 17) if i % 11 else "",
+        }
+        for i in range(num_rows)
+    ]
+
+
+def expected_groups(rows, columns):
+
+    groups = {}
+
+    for row in rows:
+        groups.setdefault(tuple(row[c] for c in columns), []).append(row)
+
+    expected = []
+
+    for key, group in groups.items():
+
+        amounts = [int(row["amount"]) for row in group if row["amount"]]
+        expected.append(
+            {
+                **dict(zip(columns, key)),
+                "count": len(group),
+                "count_amount": len(amounts),
+                "sum_amount": sum(amounts),
+                "mean_amount": mean(amounts),
+                "min_amount": min(amounts),
+                "max_amount": max(amounts),
+            }
+        )
+
+    return expected
+
+
+def write_csv(tmp_path, rows):
+
+    path = str(tmp_path / "sales.csv")
+    writer = CSVWriter(path, fieldnames=FIELDNAMES)
+    writer.add_rows(rows)
+    writer.flush()
+
+    return path
+
+
+@pytest.mark.parametrize("lazy", [True, False])
+def test_group_by_agg(tmp_path, lazy):
+
+    rows = sample_rows(600)
+    reader = CSVReader(write_csv(tmp_path, rows), lazy=lazy)
+    groups = reader.group_by(["region", "product"])
+
+    result = groups.agg(
+        count=True,
+        sum="amount",
+        mean=["amount"],
+        min="amount",
+        max="amount",
+    )
+    expected = expected_groups(rows, ["region", "product"])
+
+    assert groups.spills == 0
+    assert [
+        {k: row[k] for k in expected[0] if k != "count_amount"}
+        for row in expected
+    ] == result
+
+    assert reader.group_by("region").agg(count="amount") == [
+        {"region": row["region"], "count_amount": row["count_amount"]}
+        for row in expected_groups(rows, ["region"])
+    ]
+
+
+def test_group_by_spills(tmp_path):
+
+    rows = sample_rows(600)
+    reader = CSVReader(write_csv(tmp_path, rows), lazy=True)
+
+    spill_dir = tmp_path / "spill"
+    spill_dir.mkdir()
+
+    groups = reader.group_by(
+        ["region", "product"],
+        max_groups=7,
+        partitions=4,
+        tmp_dir=str(spill_dir),
+    )
+    result = groups.agg(
+        count=["amount"],
+        sum="amount",
+        mean="amount",
+        min="amount",
+        max="amount",
+    )
+    expected = [
+        {k: v for k, v in row.items() if k != "count"}
+        for row in expected_groups(rows, ["region", "product"])
+    ]
+
+    def ordered(groups):
+        return sorted(groups, key=lambda row: (row["region"], row["product"]))
+
+    assert groups.spills > 1
+    assert ordered(result) == ordered(expected)
+    assert os.listdir(spill_dir) == []
+
+
+def test_group_by_rows_and_errors(tmp_path):
+
+    rows = [
+        {"region": "a", "product": "x", "amount": "1.5"},
+        {"region": "a", "product": "y", "amount": "2"},
+        {"region": "b", "product": "z", "amount": ""},
+    ]
+    reader = CSVReader(write_csv(tmp_path, rows))
+
+    assert reader.group_by("region", rows=rows[1:]).agg(
+        sum="amount", mean="amount", min="product"
+    ) == [
+        {
+            "region": "a",
+            "sum_amount": 2,
+            "mean_amount": 2.0,
+            "min_product": "y",
+        },
+        {
+            "region": "b",
+            "sum_amount": 0,
+            "mean_amount": None,
+            "min_product": "z",
+        },
+    ]
+
+    assert reader.group_by("region").agg(max="amount") == [
+        {"region": "a", "max_amount": 2},
+        {"region": "b", "max_amount": None},
+    ]
+
+    mixed = [
+        {"region": region, "product": "x", "amount": amount}
+        for region, amount in [
+            ("a", "n/a"),
+            ("a", "10"),
+            ("b", "9.5"),
+            ("a", "2"),
+            ("b", "abc"),
+            ("c", "n/a"),
+            ("a", "zero"),
+            ("b", "-1"),
+        ]
+    ]
+    expected = [
+        {"region": "a", "min_amount": 2, "max_amount": "zero"},
+        {"region": "b", "min_amount": -1, "max_amount": "abc"},
+        {"region": "c", "min_amount": "n/a", "max_amount": "n/a"},
+    ]
+    groups = CSVReader(write_csv(tmp_path, mixed)).group_by(
+        "region", max_groups=1, tmp_dir=str(tmp_path)
+    )
+
+    assert (
+        sorted(
+            groups.agg(min="amount", max="amount"),
+            key=lambda row: row["region"],
+        )
+        == expected
+    )
+    assert groups.spills > 0
+    assert (
+        reader.group_by("region", rows=mixed).agg(min="amount", max="amount")
+        == expected
+    )
+
+    with pytest.raises(ValueError):
+        reader.group_by("missing")
+
+    with pytest.raises(ValueError):
+        reader.group_by("region").agg(median="amount")
+
+    with pytest.raises(ValueError):
+        reader.group_by("region").agg(sum="missing")
+
+    with pytest.raises(ValueError):
+        reader.group_by("region").agg(sum="product")
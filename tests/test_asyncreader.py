@@ -0,0 +1,157 @@
+# MIT License
+#
+# csvio: A library for conveniently processing CSV files.
+#
+# Copyright (c) 2021 Salman Raza <raza.salman@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import asyncio
+
+import pytest
+
+from csvio import AsyncCSVReader
+from csvio.processors import FieldProcessor, RowProcessor
+
+from .csv_contents_generator import CSVContentGenerator
+
+NUM_FIELDS = 10
+NUM_ROWS = 1000
+
+test_csv = CSVContentGenerator(NUM_FIELDS, NUM_ROWS)
+
+
+async def collect_rows(reader):
+    return [row async for row in reader]
+
+
+async def collect_chunks(reader):
+    return [chunk async for chunk in reader.iter_chunks()]
+
+
+def test_async_reader_rows(tmp_path):
+
+    path_obj = test_csv.get_tmp_path_obj(tmp_path)
+    reader = AsyncCSVReader(path_obj, chunk_size=300)
+
+    assert reader.fieldnames == []
+    assert asyncio.run(collect_rows(reader)) == test_csv.get_row_dict_list()
+    assert reader.fieldnames == test_csv.fieldnames_list
+    assert asyncio.run(reader.read_rows()) == test_csv.get_row_dict_list()
+
+
+def test_async_reader_chunks(tmp_path):
+
+    path_obj = test_csv.get_tmp_path_obj(tmp_path)
+    reader = AsyncCSVReader(path_obj, chunk_size=300, columns=["f1"])
+
+    chunks = asyncio.run(collect_chunks(reader))
+
+    assert [len(chunk) for chunk in chunks] == [300, 300, 300, 100]
+    assert chunks[1][0] == {"f1": "r301:v1"}
+
+
+def test_async_reader_processors(tmp_path):
+
+    path_obj = test_csv.get_tmp_path_obj(tmp_path)
+
+    async def upper(value):
+        await asyncio.sleep(0)
+        return value.upper()
+
+    async def add_total(row):
+        await asyncio.sleep(0)
+        row["total"] = row["f1"] + row["f2"]
+        return row
+
+    sync_proc = FieldProcessor("async_test_sync")
+    sync_proc.add_processor("f1", lambda value: value + "!")
+
+    async_proc = FieldProcessor("async_test_async")
+    async_proc.add_processor("f1", upper)
+
+    row_proc = RowProcessor("async_test_row")
+    row_proc.add_processor(add_total)
+
+    assert not sync_proc.is_async()
+    assert async_proc.is_async()
+    assert row_proc.is_async()
+
+    reader = AsyncCSVReader(
+        path_obj, processors=[sync_proc, async_proc, row_proc], chunk_size=64
+    )
+    rows = asyncio.run(reader.read_rows())
+
+    assert len(rows) == NUM_ROWS
+    assert rows[0]["f1"] == "R1:V1!"
+    assert rows[999]["total"] == "R1000:V1!r1000:v2"
+
+
+def test_async_reader_read_ahead(tmp_path):
+
+    path_obj = test_csv.get_tmp_path_obj(tmp_path)
+    read = []
+
+    def count_row(row):
+        read.append(row)
+        return row
+
+    proc = RowProcessor("async_test_count")
+    proc.add_processor(count_row)
+
+    async def consume_slowly():
+
+        reader = AsyncCSVReader(
+            path_obj, processors=[proc], chunk_size=10, read_ahead=2
+        )
+        rows = reader.iter_rows()
+
+        first = await rows.__anext__()
+
+        for _ in range(20):
+            await asyncio.sleep(0.001)
+
+        read_before_close = len(read)
+        await rows.aclose()
+
+        return first, read_before_close
+
+    first, read_before_close = asyncio.run(consume_slowly())
+
+    assert first["f1"] == "r1:v1"
+    assert read_before_close <= 40
+
+
+def test_async_reader_errors(tmp_path):
+
+    path_obj = test_csv.get_tmp_path_obj(tmp_path)
+
+    with pytest.raises(ValueError):
+        AsyncCSVReader(path_obj, chunk_size=0)
+
+    with pytest.raises(ValueError):
+        AsyncCSVReader(path_obj, read_ahead=0)
+
+    async def fail(row):
+        raise RuntimeError("failed")
+
+    proc = RowProcessor("async_test_fail")
+    proc.add_processor(fail)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(AsyncCSVReader(path_obj, processors=[proc]).read_rows())
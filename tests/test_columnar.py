@@ -0,0 +1,128 @@
+# MIT License
+#
+# csvio: A library for conveniently processing CSV files.
+#
+# Copyright (c) 2021 Salman Raza <raza.salman@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from array import array
+
+import pytest
+
+from csvio import CSVReader
+from csvio.columnar import ColumnStore
+from csvio.processors import FieldProcessor
+from csvio.records import Record
+
+from .csv_data import get_csv_reader_writer, test_rows
+from .test_csvbase import origin
+
+
+def test_column_store():
+
+    store = ColumnStore()
+    store.extend([{"a": 1, "b": "x"}, {"a": 2, "b": "y"}, {"a": 3, "b": "x"}])
+
+    assert len(store) == 3
+    assert store[1] == {"a": 2, "b": "y"}
+    assert store[-1] == {"a": 3, "b": "x"}
+    assert list(store) == [
+        {"a": 1, "b": "x"},
+        {"a": 2, "b": "y"},
+        {"a": 3, "b": "x"},
+    ]
+
+    assert store.column("a").kind == "int"
+    assert isinstance(store.column("a").data, array)
+    assert store.column("a").sum() == 6
+    assert store.column("b").kind == "encoded"
+    assert store.column("b").unique() == ["x", "y"]
+
+    store.append({"a": 1.5, "b": ["z"]})
+
+    assert store.column("a").kind == "float"
+    assert store.column("a").sum() == 7.5
+    assert store.column("b").kind == "object"
+    assert store[3] == {"a": 1.5, "b": ["z"]}
+
+    with pytest.raises(TypeError):
+        store.column("b").sum()
+
+
+def test_column_missing_values(tmp_path):
+
+    store = ColumnStore()
+    store.extend([{"a": None}, {"a": 2}, {"a": None}, {"a": 4}])
+
+    assert store.column("a").kind == "int"
+    assert list(store.column("a")) == [None, 2, None, 4]
+    assert store[2] == {"a": None}
+    assert store.column("a").sum() == 6
+    assert store.column("a").mean() == 3
+    assert store.column("a").unique() == [None, 2, 4]
+
+    store.append({"a": 0.5})
+
+    assert store.column("a").kind == "float"
+    assert list(store.column("a")) == [None, 2, None, 4, 0.5]
+    assert store.column("a").mean() == 6.5 / 3
+
+    path_obj = tmp_path / "prices.csv"
+    path_obj.write_text("name,price\na,1.5\nb,\nc,2\n")
+
+    reader = CSVReader(path_obj, columnar=True, schema={"price": "float"})
+
+    assert reader.column("price").kind == "float"
+    assert reader.rows[1] == {"name": "b", "price": None}
+    assert reader.column("price").sum() == 3.5
+    assert reader.column("price").mean() == 1.75
+
+
+def test_columnar_csv_reader(tmp_path):
+
+    proc = FieldProcessor("quantity")
+    proc.add_processor("Quantity", int)
+
+    _, reader = get_csv_reader_writer(
+        tmp_path, {"processors": [proc], "columnar": True}
+    )
+
+    assert isinstance(reader.rows, ColumnStore)
+    assert reader.num_rows == len(test_rows)
+    assert reader.rows[0] == {**test_rows[0], "Quantity": 1}
+    assert reader.column("Quantity").sum() == 55
+    assert reader.column("Origin").unique() == [
+        "Spain",
+        "Italy",
+        "India",
+        "France",
+        "Australia",
+    ]
+
+    (tmp_path / "compact").mkdir()
+
+    _, reader = get_csv_reader_writer(
+        tmp_path / "compact", {"columnar": True, "compact_rows": True}
+    )
+
+    assert isinstance(reader.rows[0], Record)
+    assert {
+        key: [row.as_dict() for row in rows]
+        for key, rows in reader.rows_from_column_key("Origin").items()
+    } == origin
@@ -23,9 +23,10 @@
 # SOFTWARE.
 from csvio.csvreader import CSVReader
 from csvio.csvwriter import CSVWriter
+from csvio.indexes import NestedGroups
 
 from .csv_contents_generator import get_tmp_path_obj
-from .csv_data import test_columns, test_rows
+from .csv_data import get_csv_reader_writer, test_columns, test_rows
 
 origin_supplier = {
     "Spain": {
@@ -335,3 +336,40 @@ def test_rows_to_nested_dicts(tmp_path):
         reader.rows_to_nested_dicts(["Fruit", "Supplier", "Origin"])
         == fruit_supplier_origin
     )
+
+
+def test_rows_to_nested_dicts_rows_and_lazy(tmp_path):
+
+    _, reader = get_csv_reader_writer(tmp_path)
+
+    assert reader.rows_to_nested_dicts(["Origin", "Supplier"], rows=[]) == {}
+    assert reader.rows_from_column_key("Origin", rows=[]) == {}
+    assert reader.rows_to_nested_dicts(
+        ["Origin", "Supplier"], rows=iter(test_rows[:1])
+    ) == {"Spain": {"Big Apples": [test_rows[0]]}}
+
+    nested = reader.rows_to_nested_dicts(["Origin", "Supplier"], lazy=True)
+
+    assert nested == origin_supplier
+    assert nested.to_dict() == origin_supplier
+    assert list(nested) == list(origin_supplier)
+
+    nested = reader.rows_to_nested_dicts(["Origin"], lazy=True)
+
+    assert isinstance(nested, NestedGroups)
+    assert nested == origin
+    assert nested.to_dict() == origin
+    assert reader.rows_to_nested_dicts(
+        ["Origin"], rows=iter(test_rows[:1]), lazy=True
+    ) == {"Spain": [test_rows[0]]}
+
+    reader.create_index("Origin")
+
+    assert reader.rows_to_nested_dicts(["Origin"], lazy=True) == origin
+
+    lazy_reader = CSVReader(reader.filepath, lazy=True)
+
+    assert (
+        lazy_reader.rows_to_nested_dicts(["Fruit", "Supplier", "Origin"])
+        == fruit_supplier_origin
+    )
@@ -21,9 +21,20 @@
 # LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
+import gzip
+import os
+
+import pytest
+
 from csvio.csvreader import CSVReader
+from csvio.csvwriter import CSVWriter
+from csvio.errors import BadRowError
+from csvio.processors import FieldProcessor
+from csvio.records import Record
+from csvio.utils.cache import RowCache
 
-from .csv_contents_generator import CSVContentGenerator
+from .csv_contents_generator import CSVContentGenerator, get_tmp_path_obj
+from .csv_data import csv_data, get_csv_reader_writer, test_rows
 
 NUM_FIELDS = 100
 NUM_ROWS = 1000
@@ -40,3 +51,589 @@ def test_csv_reader(tmp_path):
     assert reader.fieldnames == test_csv.fieldnames_list
     assert reader.rows[0]["f1"] == "r1:v1"
     assert reader.rows[50]["f10"] == "r51:v10"
+
+
+def test_csv_reader_lazy(tmp_path):
+
+    path_obj = test_csv.get_tmp_path_obj(tmp_path)
+    reader = CSVReader(path_obj, lazy=True)
+
+    assert reader.fieldnames == test_csv.fieldnames_list
+    assert reader._rows == []
+
+    rows = reader.iter_rows()
+    assert next(rows)["f1"] == "r1:v1"
+    assert next(rows)["f10"] == "r2:v10"
+
+    assert reader.num_rows == NUM_ROWS
+    assert len(reader.rows_from_column_key("f1")) == NUM_ROWS
+    assert reader._rows == []
+
+    assert reader.rows == test_csv.get_row_dict_list()
+
+
+def test_csv_reader_chunks(tmp_path):
+
+    path_obj = test_csv.get_tmp_path_obj(tmp_path)
+    reader = CSVReader(path_obj, lazy=True)
+
+    chunks = list(reader.iter_chunks(300))
+
+    assert [len(chunk) for chunk in chunks] == [300, 300, 300, 100]
+    assert chunks[1][0]["f1"] == "r301:v1"
+    assert [row for chunk in chunks for row in chunk] == (
+        test_csv.get_row_dict_list()
+    )
+
+
+def test_csv_reader_parallel(tmp_path):
+
+    path_obj = get_tmp_path_obj(tmp_path)
+
+    writer = CSVWriter(path_obj, fieldnames=["id", "text"])
+    writer.add_rows(
+        [
+            {"id": i, "text": f'line "{i}"\nnext, line' if i % 3 else i}
+            for i in range(500)
+        ]
+    )
+    writer.flush()
+
+    serial_rows = CSVReader(path_obj).rows
+
+    reader = CSVReader(path_obj, lazy=True, workers=2)
+    reader.parallel_range_size = 512
+
+    assert reader.rows == serial_rows
+
+    reader = CSVReader(path_obj, lazy=True, workers=2, ordered=False)
+    reader.parallel_range_size = 512
+
+    assert sorted(reader.rows, key=lambda r: int(r["id"])) == serial_rows
+
+
+def test_csv_reader_sniff_header_cache(tmp_path):
+
+    path_obj = get_tmp_path_obj(tmp_path)
+    path_obj.write_text("a;b;c\n1;2;3\n4;5;6\n")
+
+    reader = CSVReader(path_obj, sniff=True, header_cache=True)
+
+    assert reader.fieldnames == ["a", "b", "c"]
+    assert reader.csv_kwargs["delimiter"] == ";"
+    assert reader.rows == [
+        {"a": "1", "b": "2", "c": "3"},
+        {"a": "4", "b": "5", "c": "6"},
+    ]
+
+    cache_path = tmp_path / "sub" / "test.csv.csvio-header.json"
+    assert cache_path.exists()
+
+    cached = CSVReader(path_obj, sniff=True, header_cache=True, lazy=True)
+
+    assert cached.fieldnames == ["a", "b", "c"]
+    assert cached.csv_kwargs["delimiter"] == ";"
+    assert cached.rows == reader.rows
+
+    path_obj.write_text("x;y\n1;2\n")
+
+    changed = CSVReader(path_obj, sniff=True, header_cache=True)
+
+    assert changed.fieldnames == ["x", "y"]
+
+
+def test_csv_reader_columns(tmp_path):
+
+    path_obj = test_csv.get_tmp_path_obj(tmp_path)
+    reader = CSVReader(path_obj, columns=["f10", "f2"])
+
+    assert reader.fieldnames == ["f10", "f2"]
+    assert reader.rows[0] == {"f10": "r1:v10", "f2": "r1:v2"}
+    assert len(reader.rows_from_column_key("f2")) == NUM_ROWS
+    assert reader.rows_to_nested_dicts(["f2", "f10"])["r3:v2"] == {
+        "r3:v10": [{"f10": "r3:v10", "f2": "r3:v2"}]
+    }
+
+
+def test_csv_reader_where(tmp_path):
+
+    path_obj = test_csv.get_tmp_path_obj(tmp_path)
+
+    reader = CSVReader(path_obj, where=("f1", "==", "r5:v1"))
+    assert [row["f2"] for row in reader.rows] == ["r5:v2"]
+
+    reader = CSVReader(
+        path_obj,
+        columns=["f2"],
+        where=[("f1", "startswith", "r1"), ("f3", "endswith", "0:v3")],
+    )
+    assert reader.rows == [
+        {"f2": "r10:v2"},
+        {"f2": "r100:v2"},
+        {"f2": "r110:v2"},
+        {"f2": "r120:v2"},
+        {"f2": "r130:v2"},
+        {"f2": "r140:v2"},
+        {"f2": "r150:v2"},
+        {"f2": "r160:v2"},
+        {"f2": "r170:v2"},
+        {"f2": "r180:v2"},
+        {"f2": "r190:v2"},
+        {"f2": "r1000:v2"},
+    ]
+
+    reader = CSVReader(
+        path_obj, where=lambda row: int(row["f1"].split(":")[0][1:]) > 995
+    )
+    assert reader.num_rows == 5
+
+
+def test_csv_reader_where_numeric(tmp_path):
+
+    _, reader = get_csv_reader_writer(
+        tmp_path,
+        {
+            "where": [
+                ("Origin", "in", {"Italy", "Spain"}),
+                ("Quantity", ">=", 6),
+            ]
+        },
+    )
+
+    assert [row["Supplier"] for row in reader.rows] == [
+        "Sweet Strawberries",
+        "Square Apples",
+        "Small Melons",
+    ]
+
+
+def test_csv_reader_where_mixed_numbers(tmp_path):
+
+    path_obj = get_tmp_path_obj(tmp_path)
+    path_obj.write_text("name,price\na,9\nb,10.5\nc,n/a\nd,10\ne,1e2\n")
+
+    def names(where):
+        return [row["name"] for row in CSVReader(path_obj, where=where).rows]
+
+    assert names(("price", ">", 10)) == ["b", "e"]
+    assert names(("price", "<=", 10.0)) == ["a", "d"]
+    assert names(("price", "==", 10)) == ["d"]
+    assert names(("price", "!=", 10)) == ["a", "b", "c", "e"]
+    assert names(("price", "in", [9, 100])) == ["a", "e"]
+    assert names(("price", "not in", [9, 100])) == ["b", "c", "d"]
+    assert names([("price", ">", 9), ("price", "<", 100)]) == ["b", "d"]
+    assert names(("price", "startswith", "1")) == ["b", "d", "e"]
+
+    for op in ("contains", "startswith", "endswith"):
+        with pytest.raises(ValueError):
+            names(("price", op, 10))
+
+
+def test_intern_columns(tmp_path):
+
+    _, reader = get_csv_reader_writer(
+        tmp_path, {"intern_columns": ["Fruit", "Origin"]}
+    )
+
+    assert reader.rows == test_rows
+    assert reader.rows[0]["Fruit"] is reader.rows[6]["Fruit"]
+    assert reader.rows[0]["Origin"] is reader.rows[5]["Origin"]
+    assert reader.rows[0]["Supplier"] is not reader.rows[6]["Supplier"]
+    assert reader.cardinality == {
+        "Fruit": (5, 10, True),
+        "Origin": (5, 10, True),
+    }
+    assert reader.cardinality["Fruit"].ratio == 0.5
+
+    reader = CSVReader(
+        reader.filepath,
+        lazy=True,
+        intern_columns=True,
+        schema={"Quantity": "int"},
+    )
+    reader.intern_max_cardinality = 5
+
+    assert reader.rows[-1]["Quantity"] == 10
+    assert reader.cardinality == {
+        "Supplier": (6, 10, False),
+        "Fruit": (5, 10, True),
+        "Origin": (5, 10, True),
+    }
+
+
+def test_read_page_and_tail(tmp_path):
+
+    path_obj = get_tmp_path_obj(tmp_path)
+    path_obj.write_text(
+        'a,b\n0,x\n\n1,"multi\nline"\n2,y\n3,z\n4,"q""\n"\n5,w\n'
+    )
+    expected = [
+        {"a": "0", "b": "x"},
+        {"a": "1", "b": "multi\nline"},
+        {"a": "2", "b": "y"},
+        {"a": "3", "b": "z"},
+        {"a": "4", "b": 'q"\n'},
+        {"a": "5", "b": "w"},
+    ]
+
+    reader = CSVReader(path_obj, lazy=True)
+
+    assert reader.read_page(1, 3) == expected[1:4]
+    assert reader.tail(2) == expected[-2:]
+
+    for stride in (1, 4):
+
+        index = reader.create_offset_index(stride=stride, persist=True)
+
+        assert len(index) == 6
+        assert len(index.offsets) == -(-6 // stride)
+
+        for start in range(7):
+            assert reader.read_page(start, 2) == expected[start : start + 2]
+
+        assert reader.tail(2) == expected[-2:]
+        assert reader.tail(10) == expected
+
+    reader = CSVReader(path_obj, lazy=True, where=("a", "!=", "3"))
+    index = reader.create_offset_index(stride=4, persist=True)
+
+    assert index.offsets.tolist() == [4, 32]
+    assert reader.read_page(2, 3) == [expected[2], expected[4]]
+
+
+def test_read_page_keeps_reader_state(tmp_path):
+
+    _, reader = get_csv_reader_writer(
+        tmp_path, {"intern_columns": ["Fruit", "Origin"], "dedup": ["Fruit"]}
+    )
+    cardinality = reader.cardinality
+    num_rows = reader.num_rows
+    duplicates = reader.dedup.duplicates
+
+    assert reader.read_page(0, 1) == [test_rows[0]]
+    assert reader.tail(1) == [test_rows[-1]]
+
+    reader.create_offset_index(stride=2)
+
+    assert reader.read_page(1, 2) == test_rows[1:3]
+    assert reader.cardinality == cardinality
+    assert reader.dedup.duplicates == duplicates
+    assert reader.num_rows == num_rows
+
+    path_obj = tmp_path / "bad.csv"
+    path_obj.write_text('id,name\n1,a\n2,"b\n3,c\n4,d\n5,"e\n')
+
+    reader = CSVReader(
+        path_obj, csv_kwargs={"strict": True}, on_bad_row="quarantine"
+    )
+    quarantine = CSVReader(reader.bad_rows.path).rows
+
+    assert reader.num_rows == 3
+    assert reader.bad_rows.error_count == 2
+    assert len(quarantine) == 2
+
+    assert reader.read_page(0, 3) == reader.rows
+    assert reader.tail(3) == reader.rows
+    assert reader.sample(3) == reader.rows
+
+    reader.create_offset_index(stride=2)
+
+    assert reader.read_page(1, 2) == reader.rows[1:]
+    assert reader.bad_rows.error_count == 2
+    assert len(reader.bad_rows.errors) == 2
+    assert CSVReader(reader.bad_rows.path).rows == quarantine
+
+
+def test_sample_keeps_reader_state(tmp_path):
+
+    path_obj = get_tmp_path_obj(tmp_path)
+    path_obj.write_text("a,b\n0,xx\n1,yy\n1,zz\n")
+
+    reader = CSVReader(path_obj, lazy=True, intern_columns=["b"], dedup=["a"])
+
+    assert reader.head(1) == [{"a": "0", "b": "xx"}]
+
+    cardinality = reader.cardinality
+
+    assert reader.sample(3, seed=1) == [
+        {"a": "0", "b": "xx"},
+        {"a": "1", "b": "yy"},
+    ]
+    assert reader.cardinality == cardinality
+    assert reader.dedup.duplicates == 0
+
+
+def test_follow(tmp_path):
+
+    path_obj = get_tmp_path_obj(tmp_path)
+    path_obj.write_text("a,b\n0,x\n1,y")
+
+    reader = CSVReader(path_obj, follow=True)
+    index = reader.create_index("b")
+
+    assert reader.rows == [{"a": "0", "b": "x"}]
+    assert reader.refresh() == []
+
+    with open(path_obj, "a") as fh:
+        fh.write('\n2,"partial\n')
+
+    assert reader.refresh() == [{"a": "1", "b": "y"}]
+    assert index["y"] == [{"a": "1", "b": "y"}]
+
+    with open(path_obj, "a") as fh:
+        fh.write('value"\n3,z\n')
+
+    assert reader.refresh() == [
+        {"a": "2", "b": "partial\nvalue"},
+        {"a": "3", "b": "z"},
+    ]
+    assert reader.num_rows == 4
+    assert [row["a"] for row in reader.tail(2)] == ["2", "3"]
+
+    path_obj.write_text("a,b\n9,q\n")
+
+    assert reader.refresh() == [{"a": "9", "b": "q"}]
+    assert reader.rows == [{"a": "9", "b": "q"}]
+
+
+def test_follow_lazy_partial_record(tmp_path):
+
+    path_obj = get_tmp_path_obj(tmp_path)
+    path_obj.write_text('a,b\n0,x\n\n1,"par')
+
+    reader = CSVReader(path_obj, follow=True, lazy=True, workers=2)
+    complete = [{"a": "0", "b": "x"}]
+
+    assert list(reader) == complete
+    assert list(reader.iter_rows()) == complete
+    assert reader.num_rows == 1
+    assert list(reader.iter_chunks(5)) == [complete]
+    assert reader.head(5) == complete
+    assert reader.sample(5) == complete
+    assert reader.tail(5) == complete
+    assert reader.read_page(0, 5) == complete
+
+    reader.create_offset_index(stride=1)
+
+    assert reader.read_page(0, 5) == complete
+    assert reader.refresh() == complete
+
+    with open(path_obj, "a") as fh:
+        fh.write('tial"\n')
+
+    assert reader.refresh() == [{"a": "1", "b": "partial"}]
+    assert reader.refresh() == []
+    assert reader.num_rows == 2
+
+
+def test_follow_rows(tmp_path):
+
+    path_obj = get_tmp_path_obj(tmp_path)
+    path_obj.write_text("a,b")
+
+    reader = CSVReader(path_obj, lazy=True, follow=True)
+
+    assert reader.refresh() == []
+
+    path_obj.write_text("a,b\n0,x\n")
+    index = reader.create_offset_index(stride=2)
+
+    with open(path_obj, "a") as fh:
+        fh.write("1,y\n2,z\n")
+
+    rows = reader.follow_rows(interval=0.01, timeout=0.05)
+
+    assert [row["a"] for row in rows] == ["0", "1", "2"]
+    assert len(index) == 3
+    assert index.offsets.tolist() == [4, 12]
+    assert reader.read_page(2, 1) == [{"a": "2", "b": "z"}]
+
+
+def test_row_cache(tmp_path):
+
+    cache = RowCache(str(tmp_path / "cache"))
+    proc = FieldProcessor("cache_quantity")
+    proc.add_processor("Quantity", int)
+
+    _, reader = get_csv_reader_writer(
+        tmp_path,
+        {
+            "processors": [proc],
+            "cache": cache,
+            "schema": "infer",
+            "compact_rows": True,
+        },
+    )
+    path = reader.filepath
+
+    assert len(os.listdir(cache.directory)) == 1
+
+    cached = CSVReader(
+        path, processors=[proc], cache=cache, schema="infer", compact_rows=True
+    )
+
+    assert cached.rows == reader.rows
+    assert cached.schema.types == reader.schema.types
+    assert isinstance(cached.rows[0], Record)
+    assert len(os.listdir(cache.directory)) == 1
+
+    proc.add_processor("Origin", lambda value: value.upper())
+    changed = CSVReader(
+        path, processors=[proc], cache=cache, schema="infer", compact_rows=True
+    )
+
+    assert changed.rows[0]["Origin"] == "SPAIN"
+    assert len(os.listdir(cache.directory)) == 2
+
+    columnar = CSVReader(path, processors=[proc], cache=cache, columnar=True)
+    cached = CSVReader(path, processors=[proc], cache=cache, columnar=True)
+
+    assert cached.column("Quantity").sum() == columnar.column("Quantity").sum()
+    assert len(os.listdir(cache.directory)) == 3
+
+    cache.max_bytes = 1
+    cache.evict()
+
+    assert os.listdir(cache.directory) == []
+
+
+def test_compressed_csv(tmp_path):
+
+    path_obj = get_tmp_path_obj(tmp_path)
+
+    with gzip.open(path_obj, "wt") as fh:
+        fh.write(csv_data)
+
+    reader = CSVReader(path_obj, workers=2, sniff=True)
+
+    assert reader.compression == "gzip"
+    assert reader.rows == test_rows
+
+    with pytest.raises(ValueError):
+        reader.create_offset_index()
+
+    with pytest.raises(ValueError):
+        CSVReader(path_obj, follow=True)
+
+
+def test_head_skip_sample(tmp_path):
+
+    path_obj = test_csv.get_tmp_path_obj(tmp_path)
+    all_rows = test_csv.get_row_dict_list()
+
+    processed = []
+
+    proc = FieldProcessor("sample_count")
+    proc.add_processor("f1", lambda value: processed.append(value) or value)
+
+    reader = CSVReader(path_obj, processors=[proc], lazy=True)
+
+    assert reader.head(3) == all_rows[:3]
+    assert reader.head(0) == []
+    assert list(reader.skip(NUM_ROWS - 2)) == all_rows[-2:]
+    assert len(processed) == 5
+
+    processed.clear()
+    sample = reader.sample(10, seed=1)
+
+    assert len(sample) == 10
+    assert len(processed) == 10
+    assert all(row in all_rows for row in sample)
+    assert sample == sorted(sample, key=all_rows.index)
+    assert reader.sample(10, seed=1) == sample
+    assert reader.sample(NUM_ROWS + 1) == all_rows
+
+    eager = CSVReader(path_obj)
+
+    assert eager.sample(10, seed=1) == sample
+    assert eager.head(3) == all_rows[:3]
+    assert list(eager.skip(NUM_ROWS - 2)) == all_rows[-2:]
+
+    filtered = CSVReader(
+        path_obj,
+        lazy=True,
+        columns=["f1"],
+        where=lambda row: row["f2"].endswith("0:v2"),
+        schema={"f1": "str"},
+        compact_rows=True,
+    )
+    sample = filtered.sample(5, seed=2)
+
+    assert len(sample) == 5
+    assert all(int(row["f1"][1:].split(":")[0]) % 10 == 0 for row in sample)
+
+    with pytest.raises(ValueError):
+        reader.sample(-1)
+
+
+def test_bad_rows(tmp_path):
+
+    path_obj = get_tmp_path_obj(tmp_path)
+
+    with open(path_obj, "w") as fh:
+        fh.write('id,name\n1,a\n2,"b\n3,c\n4,d\n5,"e\n')
+
+    csv_kwargs = {"strict": True}
+    expected = [
+        {"id": str(i), "name": n} for i, n in [(1, "a"), (3, "c"), (4, "d")]
+    ]
+
+    stopped = CSVReader(path_obj, csv_kwargs=csv_kwargs)
+
+    assert stopped.rows == expected[:1]
+    assert stopped.bad_rows is None
+
+    with pytest.raises(BadRowError) as error:
+        CSVReader(path_obj, csv_kwargs=csv_kwargs, on_bad_row="raise")
+
+    assert error.value.bad_row.line == 3
+
+    skipped = CSVReader(path_obj, csv_kwargs=csv_kwargs, on_bad_row="skip")
+
+    assert skipped.rows == expected
+    assert skipped.bad_rows.error_count == 2
+    assert [(e.line, e.text) for e in skipped.bad_rows.errors] == [
+        (3, '2,"b\n'),
+        (6, '5,"e\n'),
+    ]
+
+    quarantined = CSVReader(
+        path_obj, csv_kwargs=csv_kwargs, on_bad_row="quarantine", lazy=True
+    )
+
+    assert list(quarantined.iter_chunks(2)) == [expected[:2], expected[2:]]
+    assert quarantined.bad_rows.error_count == 2
+
+    quarantine = CSVReader(quarantined.bad_rows.path)
+
+    assert quarantine.rows == [
+        {"line": "3", "error": "',' expected after '\"'", "text": '2,"b'},
+        {"line": "6", "error": "unexpected end of data", "text": '5,"e'},
+    ]
+
+    assert list(quarantined.iter_rows()) == expected
+    assert quarantined.bad_rows.error_count == 2
+    assert CSVReader(quarantined.bad_rows.path).rows == quarantine.rows
+
+    parallel = CSVReader(
+        path_obj,
+        csv_kwargs=csv_kwargs,
+        on_bad_row="quarantine",
+        quarantine_path=str(tmp_path / "rejected.csv"),
+        workers=2,
+        lazy=True,
+    )
+    parallel.parallel_range_size = 8
+
+    assert list(parallel.iter_rows()) == expected
+    assert parallel.bad_rows.error_count == 2
+    assert CSVReader(tmp_path / "rejected.csv").num_rows == 2
+
+    assert list(parallel.iter_rows()) == expected
+    assert CSVReader(tmp_path / "rejected.csv").num_rows == 2
+
+    path_obj.write_text("id,name\n1,a\n")
+
+    assert list(parallel.iter_rows()) == expected[:1]
+    assert parallel.bad_rows.error_count == 0
+    assert CSVReader(tmp_path / "rejected.csv").num_rows == 0
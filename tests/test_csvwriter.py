@@ -21,6 +21,12 @@
 # LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
+import bz2
+import csv
+import gzip
+import lzma
+
+from csvio.csvreader import CSVReader
 from csvio.csvwriter import CSVWriter
 
 from .csv_contents_generator import CSVContentGenerator
@@ -41,3 +47,50 @@ def test_csv_writer(tmp_path):
     writer.flush()
 
     assert test_csv.contents == open(path_obj, mode="r").read()
+
+
+def test_csv_writer_compression(tmp_path):
+
+    for file_name, opener in (
+        ("test.csv.gz", gzip.open),
+        ("test.csv.bz2", bz2.open),
+        ("test.csv.xz", lzma.open),
+    ):
+
+        path_obj = tmp_path / file_name
+        rows = test_csv.get_row_dict_list()
+
+        writer = CSVWriter(
+            path_obj, fieldnames=test_csv.fieldnames_list, compresslevel=1
+        )
+        writer.add_rows(rows[:10])
+        writer.flush()
+        writer.add_rows(rows[10:])
+        writer.flush()
+
+        with opener(path_obj, "rt", newline="") as fh:
+            assert list(csv.DictReader(fh)) == rows
+
+        reader = CSVReader(path_obj, lazy=True)
+
+        assert reader.compression == writer.compression
+        assert reader.read_page(10, 2) == rows[10:12]
+        assert reader.tail(1) == rows[-1:]
+        assert reader.rows == rows
+
+
+def test_csv_writer_keep_rows(tmp_path):
+
+    path_obj = test_csv.get_tmp_path_obj(tmp_path, add_contents=False)
+    rows = test_csv.get_row_dict_list()
+
+    writer = CSVWriter(
+        path_obj, fieldnames=test_csv.fieldnames_list, keep_rows=False
+    )
+    writer.add_rows(rows[:10])
+    writer.flush()
+    writer.add_rows(rows[10:15])
+    writer.flush()
+
+    assert writer.rows == []
+    assert CSVReader(path_obj).rows == rows[:15]
@@ -0,0 +1,180 @@
+# MIT License
+#
+# csvio: A library for conveniently processing CSV files.
+#
+# Copyright (c) 2021 Salman Raza <raza.salman@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import pytest
+
+from csvio.csvreader import CSVReader
+from csvio.csvwriter import CSVWriter
+from csvio.dedup import BloomFilter, Deduplicator, DigestSet, key_digest
+
+from .csv_data import get_csv_reader_writer, test_columns, test_rows
+
+
+def test_digest_set():
+
+    digests = DigestSet(4)
+
+    assert all(digests.add(i * 7919) for i in range(1, 1001))
+    assert not any(digests.add(i * 7919) for i in range(1, 1001))
+    assert len(digests) == 1000
+    assert 7919 in digests
+    assert 7920 not in digests
+    assert digests.add(0)
+    assert not digests.add(0)
+    assert len(digests.table) * 7 >= len(digests) * 10
+
+
+def test_bloom_filter():
+
+    bloom = BloomFilter(10000, 0.01)
+
+    assert bloom.num_hashes == 7
+    assert all(bloom.add(hash(("a", i))) for i in range(100))
+    assert not any(bloom.add(hash(("a", i))) for i in range(10000) if i < 100)
+
+    for i in range(100, 10000):
+        bloom.add(hash(("a", i)))
+
+    false_positives = sum(hash(("b", i)) in bloom for i in range(10000))
+
+    assert false_positives < 200
+    assert hash(("a", 5)) in bloom
+
+    with pytest.raises(ValueError):
+        BloomFilter(error_rate=0)
+
+
+def test_deduplicator():
+
+    rows = [{"a": 1, "b": 2}, {"b": 2, "a": 1}, {"a": 1, "b": 3}]
+
+    assert list(Deduplicator().filter_rows(rows, ["a", "b"])) == [
+        rows[0],
+        rows[2],
+    ]
+
+    dedup = Deduplicator(["a"], mode="bloom", capacity=100)
+
+    assert list(dedup.filter_rows(rows)) == [rows[0]]
+    assert (dedup.unique, dedup.duplicates) == (1, 2)
+
+    dedup.reset()
+
+    assert (dedup.unique, dedup.duplicates) == (0, 0)
+    assert dedup.add((1,))
+
+    with pytest.raises(ValueError):
+        Deduplicator(mode="fuzzy")
+
+
+def test_deduplicator_colliding_keys(tmp_path):
+
+    assert hash(-1) == hash(-2)
+
+    dedup = Deduplicator()
+
+    assert [
+        dedup.add(key) for key in [(-1,), (-2,), (1,), (1.0,), (True,)]
+    ] == [True] * 5
+    assert not dedup.add((-2,))
+    assert key_digest(("a", 1)) == key_digest(("a", 1))
+
+    writer = CSVWriter(
+        str(tmp_path / "ids.csv"), fieldnames=["id"], dedup=["id"]
+    )
+    writer.add_rows([{"id": -1}, {"id": -2}, {"id": -1}])
+    writer.flush()
+
+    assert CSVReader(writer.filepath).rows == [{"id": "-1"}, {"id": "-2"}]
+    assert writer.dedup.duplicates == 1
+
+
+def test_reader_dedup(tmp_path):
+
+    writer, reader = get_csv_reader_writer(tmp_path)
+    writer.add_rows(test_rows)
+    writer.flush()
+
+    assert CSVReader(reader.filepath).rows == test_rows * 2
+
+    deduped = CSVReader(reader.filepath, dedup=True, lazy=True)
+
+    assert list(deduped.iter_rows()) == test_rows
+    assert [row for rows in deduped.iter_chunks(4) for row in rows] == (
+        test_rows
+    )
+    assert deduped.dedup.duplicates == len(test_rows)
+
+    by_origin = CSVReader(reader.filepath, dedup=["Origin"], columns=["Fruit"])
+    origins = []
+
+    for row in test_rows:
+        if row["Origin"] not in origins:
+            origins.append(row["Origin"])
+
+    assert by_origin.num_rows == len(origins)
+
+    shared = Deduplicator()
+    first = CSVReader(reader.filepath, dedup=shared)
+
+    assert first.rows == test_rows
+    assert CSVReader(reader.filepath, dedup=shared).rows == []
+
+    with pytest.raises(ValueError):
+        CSVReader(reader.filepath, dedup=["Missing"])
+
+
+def test_follow_dedup(tmp_path):
+
+    path = tmp_path / "follow.csv"
+    path.write_text("a,b\n1,2\n3,4\n")
+
+    reader = CSVReader(str(path), follow=True, dedup=True)
+
+    assert reader.rows == [{"a": "1", "b": "2"}, {"a": "3", "b": "4"}]
+
+    with open(path, "a") as fh:
+        fh.write("3,4\n1,2\n5,6\n")
+
+    assert reader.refresh() == [{"a": "5", "b": "6"}]
+    assert reader.dedup.duplicates == 2
+    assert reader.num_rows == 3
+
+    path.write_text("a,b\n1,2\n")
+
+    assert reader.refresh() == [{"a": "1", "b": "2"}]
+
+
+def test_writer_dedup(tmp_path):
+
+    writer, _ = get_csv_reader_writer(
+        tmp_path, writer_kwargs={"dedup": ["Supplier", "Fruit"]}
+    )
+    writer.add_rows(test_rows)
+    writer.add_rows(test_rows[0])
+    writer.flush()
+
+    assert writer.rows == test_rows
+    assert CSVReader(writer.filepath).rows == test_rows
+    assert writer.dedup.duplicates == len(test_rows) + 1
+    assert writer.fieldnames == test_columns
@@ -121,3 +121,11 @@ def test_delete_non_existent_file():
 
     if fb.path_obj.exists() is True:
         fb.path_obj.unlink()
+
+
+def test_file_compression():
+
+    assert FileBase("/a/b/c.csv").file_compression is None
+    assert FileBase("/a/b/c.csv.gz").file_compression == "gzip"
+    assert FileBase("/a/b/c.csv.BZ2").file_compression == "bz2"
+    assert FileBase("/a/b/c.csv.xz").file_compression == "xz"
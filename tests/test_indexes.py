@@ -0,0 +1,209 @@
+# MIT License
+#
+# csvio: A library for conveniently processing CSV files.
+#
+# Copyright (c) 2021 Salman Raza <raza.salman@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import os
+
+from csvio.csvreader import CSVReader
+from csvio.indexes import HashIndex, NestedGroups, SortedIndex
+from csvio.processors import FieldProcessor
+
+from .csv_data import get_csv_reader_writer, test_rows
+
+
+def test_hash_index():
+
+    rows = [{"a": 1, "b": "x"}, {"a": 2, "b": "y"}, {"a": 1, "b": "y"}]
+    index = HashIndex(rows, ["a"])
+
+    assert len(index) == 2
+    assert index[1] == [rows[0], rows[2]]
+    assert index.get(3) is None
+    assert 2 in index
+    assert index.keys() == [1, 2]
+
+    rows.append({"a": 3, "b": "x"})
+
+    assert index[3] == [rows[3]]
+
+    composite = HashIndex(rows, ["a", "b"])
+
+    assert composite[(1, "y")] == [rows[2]]
+    assert composite.get((2, "x"), []) == []
+
+    rows[0]["a"] = 2
+    index.rebuild()
+
+    assert index[2] == [rows[0], rows[1]]
+
+    restored = HashIndex.from_dict(rows, composite.to_dict())
+
+    assert restored.groups() == composite.groups()
+
+
+def test_nested_groups():
+
+    rows = [
+        {"a": 1, "b": "x", "c": True},
+        {"a": 2, "b": "y", "c": True},
+        {"a": 1, "b": "y", "c": False},
+        {"a": 1, "b": "x", "c": True},
+    ]
+    index = HashIndex([], ["a", "b", "c"])
+    index.rows = rows[:2]
+    index.extend(rows[:2])
+    index.rows = rows
+    nested = index.nested()
+
+    assert index.size == 4
+    assert isinstance(nested[1], NestedGroups)
+    assert nested[1]._children is None
+    assert nested[1]["x"][True] == [rows[0], rows[3]]
+    assert nested[2]._children is None
+    assert len(nested) == 2 and len(nested[1]) == 2
+    assert nested.to_dict() == {
+        1: {"x": {True: [rows[0], rows[3]]}, "y": {False: [rows[2]]}},
+        2: {"y": {True: [rows[1]]}},
+    }
+
+
+def test_reader_index_columns(tmp_path):
+
+    _, reader = get_csv_reader_writer(tmp_path)
+    indexed = CSVReader(
+        reader.filepath, index_columns=["Origin", ["Origin", "Supplier"]]
+    )
+
+    assert indexed.index("Origin").rows is indexed.rows
+    assert indexed.index(["Origin", "Supplier"]).groups() == (
+        HashIndex(reader.rows, ["Origin", "Supplier"]).groups()
+    )
+    assert indexed.rows_to_nested_dicts(
+        ["Origin", "Supplier"]
+    ) == reader.rows_to_nested_dicts(["Origin", "Supplier"])
+
+    columnar = CSVReader(
+        reader.filepath, columnar=True, index_columns=[["Fruit", "Origin"]]
+    )
+
+    assert columnar.rows_to_nested_dicts(["Fruit", "Origin"], lazy=True) == (
+        reader.rows_to_nested_dicts(["Fruit", "Origin"])
+    )
+
+
+def test_reader_create_index(tmp_path):
+
+    _, reader = get_csv_reader_writer(tmp_path)
+
+    index = reader.create_index("Origin")
+
+    assert reader.index("Origin") is index
+    assert reader.index(["Origin", "Fruit"]) is None
+    assert index["Spain"] == [test_rows[0], test_rows[5]]
+    assert reader.rows_from_column_key("Origin") == index.groups()
+
+    new_row = {**test_rows[0], "Supplier": "Another Apple"}
+    reader.rows.append(new_row)
+
+    assert index["Spain"] == [test_rows[0], test_rows[5], new_row]
+
+    reader.rows = reader.rows[:2]
+
+    assert index.keys() == ["Spain", "Italy"]
+
+
+def test_reader_persist_index(tmp_path):
+
+    _, reader = get_csv_reader_writer(tmp_path)
+    index = reader.create_index(["Fruit", "Origin"], persist=True)
+
+    assert os.path.exists(f"{reader.filepath}.csvio-index.json")
+
+    reader = CSVReader(reader.filepath)
+    restored = reader.create_index(["Fruit", "Origin"], persist=True)
+
+    assert restored.positions == index.positions
+    assert restored[("Mango", "India")] == [test_rows[2]]
+
+    reader = CSVReader(reader.filepath, where=("Fruit", "==", "Apple"))
+    filtered = reader.create_index(["Fruit", "Origin"], persist=True)
+
+    assert filtered.keys() == [("Apple", "Spain"), ("Apple", "Italy")]
+
+    reader = CSVReader(reader.filepath)
+    reader.create_index("Quantity", persist=True)
+
+    proc = FieldProcessor("persist_index_prefix")
+    proc.add_processor("Quantity", lambda value: f"Q{value}")
+
+    processed = CSVReader(reader.filepath, processors=[proc])
+
+    assert processed.create_index("Quantity", persist=True).get("Q3") == [
+        {**test_rows[2], "Quantity": "Q3"}
+    ]
+
+    typed = CSVReader(reader.filepath, schema={"Quantity": "int"})
+
+    assert typed.create_index("Quantity", persist=True).get(3) == [
+        {**test_rows[2], "Quantity": 3}
+    ]
+    assert CSVReader(reader.filepath).create_index(
+        "Quantity", persist=True
+    ).get("3") == [test_rows[2]]
+
+
+def test_sorted_index():
+
+    rows = [{"a": "3"}, {"a": "10"}, {"a": ""}, {"a": "2"}, {"a": "10"}]
+    index = SortedIndex(rows, "a", key=int)
+
+    assert len(index) == 4
+    assert index.range(3, 10) == [rows[0], rows[1], rows[4]]
+    assert index.range(3, 10, include_low=False) == [rows[1], rows[4]]
+    assert index.range(3, 10, include_high=False) == [rows[0]]
+    assert index.range(high=2) == [rows[3]]
+    assert index.range(11) == []
+    assert index.range(5, 4) == []
+
+    rows.append({"a": "4"})
+
+    assert index.range(4, 4) == [rows[5]]
+
+    words = [{"w": w} for w in ["banana", "apple", "band", "ban", "bz"]]
+    index = SortedIndex(words, "w")
+
+    assert index.prefix("ban") == [words[3], words[0], words[2]]
+    assert index.prefix("c") == []
+    assert index.prefix("") == index.range()
+
+
+def test_reader_create_sorted_index(tmp_path):
+
+    _, reader = get_csv_reader_writer(tmp_path, {"schema": "infer"})
+    index = reader.create_sorted_index("Quantity")
+
+    assert reader.sorted_index("Quantity") is index
+    assert [row["Quantity"] for row in index.range(4, 6)] == [4, 5, 6]
+    assert [
+        row["Origin"]
+        for row in reader.create_sorted_index("Origin").prefix("It")
+    ] == ["Italy"] * 3
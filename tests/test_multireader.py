@@ -0,0 +1,139 @@
+# MIT License
+#
+# csvio: A library for conveniently processing CSV files.
+#
+# Copyright (c) 2021 Salman Raza <raza.salman@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import gzip
+import os
+
+import pytest
+
+from csvio import MultiCSVReader
+from csvio.csvwriter import CSVWriter
+from csvio.multireader import expand_paths
+from csvio.processors import FieldProcessor
+
+FIELDNAMES = ["id", "name"]
+
+
+def write_shards(directory, num_shards=3, rows_per_shard=50):
+
+    os.mkdir(directory)
+    rows = []
+
+    for shard in range(num_shards):
+
+        shard_rows = [
+            {"id": str(shard * rows_per_shard + i), "name": f"name {i}"}
+            for i in range(rows_per_shard)
+        ]
+        fieldnames = FIELDNAMES if shard % 2 else FIELDNAMES[::-1]
+
+        writer = CSVWriter(
+            str(directory / f"shard{shard}.csv"), fieldnames=fieldnames
+        )
+        writer.add_rows(shard_rows)
+        writer.flush()
+
+        rows.extend(shard_rows)
+
+    return rows
+
+
+def test_expand_paths(tmp_path):
+
+    write_shards(tmp_path / "drop")
+
+    with gzip.open(tmp_path / "drop" / "shard3.csv.gz", "wt") as fh:
+        fh.write("id,name\n150,name 0\n")
+
+    (tmp_path / "drop" / "notes.txt").write_text("not a csv")
+
+    names = ["shard0.csv", "shard1.csv", "shard2.csv", "shard3.csv.gz"]
+    expected = [str(tmp_path / "drop" / name) for name in names]
+
+    assert expand_paths(tmp_path / "drop") == expected
+    assert expand_paths(str(tmp_path / "drop" / "*.csv")) == expected[:3]
+    assert expand_paths(str(tmp_path / "**" / "shard1.csv")) == [expected[1]]
+    assert expand_paths([expected[1], str(tmp_path / "drop" / "*")]) == [
+        expected[1],
+        str(tmp_path / "drop" / "notes.txt"),
+        expected[0],
+        expected[2],
+        expected[3],
+    ]
+
+
+def test_multi_reader(tmp_path):
+
+    rows = write_shards(tmp_path / "drop")
+
+    reader = MultiCSVReader(str(tmp_path / "drop"), workers=2)
+
+    assert len(reader.paths) == 3
+    assert reader.fieldnames == FIELDNAMES[::-1]
+    assert reader.rows == rows
+
+    proc = FieldProcessor("multi_upper")
+    proc.add_processor("name", str.upper)
+
+    unordered = MultiCSVReader(
+        str(tmp_path / "drop" / "*.csv"),
+        processors=[proc],
+        ordered=False,
+        columns=["name"],
+    )
+
+    assert unordered.fieldnames == ["name"]
+    assert sorted(row["name"] for row in unordered) == sorted(
+        row["name"].upper() for row in rows
+    )
+
+    threaded = MultiCSVReader(
+        str(tmp_path / "drop"), executor="thread", where=("id", "==", "60")
+    )
+    files = list(threaded.iter_files())
+
+    assert [len(file_rows) for _, file_rows in files] == [0, 1, 0]
+    assert files[1][1] == [{"id": "60", "name": "name 10"}]
+
+    predicate = MultiCSVReader(
+        str(tmp_path / "drop"), workers=2, where=lambda row: row["id"] == "60"
+    )
+
+    assert predicate.rows == [{"id": "60", "name": "name 10"}]
+
+
+def test_multi_reader_errors(tmp_path):
+
+    write_shards(tmp_path / "drop")
+    (tmp_path / "drop" / "zother.csv").write_text("id,title\n1,x\n")
+
+    with pytest.raises(ValueError, match="zother.csv"):
+        MultiCSVReader(str(tmp_path / "drop"))
+
+    assert MultiCSVReader(str(tmp_path / "drop"), columns=["id"]).paths
+
+    with pytest.raises(ValueError):
+        MultiCSVReader(str(tmp_path / "missing" / "*.csv"))
+
+    with pytest.raises(ValueError):
+        MultiCSVReader(str(tmp_path / "drop"), executor="cluster")
@@ -0,0 +1,131 @@
+# MIT License
+#
+# csvio: A library for conveniently processing CSV files.
+#
+# Copyright (c) 2021 Salman Raza <raza.salman@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import random
+import statistics
+
+import pytest
+
+from csvio.csvreader import CSVReader
+from csvio.profiling import ColumnProfiler, HyperLogLog, SpaceSaving
+
+from .csv_contents_generator import get_tmp_path_obj
+
+
+def test_hyperloglog():
+
+    hll = HyperLogLog()
+    hll.update(range(50000))
+    hll.update(range(10000))
+
+    assert abs(hll.count() - 50000) / 50000 < 0.05
+
+    small = HyperLogLog()
+    small.update([1, 2, 3, 1])
+
+    assert small.count() == 3
+
+    other = HyperLogLog()
+    other.update(range(50000, 100000))
+    hll.merge(other)
+
+    assert abs(hll.count() - 100000) / 100000 < 0.05
+
+    with pytest.raises(ValueError):
+        hll.merge(HyperLogLog(10))
+
+
+def test_space_saving():
+
+    rng = random.Random(1)
+    summary = SpaceSaving(20)
+
+    for _ in range(100):
+        values = [rng.randrange(1000) for _ in range(90)] + ["x"] * 10
+        summary.update({v: values.count(v) for v in set(values)})
+
+    assert len(summary.counts) == 20
+    assert summary.top(1) == [("x", summary.counts["x"])]
+    assert 1000 <= summary.counts["x"] <= 1000 + summary.errors["x"]
+
+
+def test_column_profiler():
+
+    values = [1, 2.5, None, "", 4, 4, -3]
+    profiler = ColumnProfiler(top_k=2)
+    profiler.update(values[:3])
+    profiler.update(values[3:])
+
+    profile = profiler.profile()
+    numbers = [1, 2.5, 4, 4, -3]
+
+    assert profile.rows == 7
+    assert profile.nulls == 1
+    assert profile.empty == 1
+    assert profile.numeric == 5
+    assert (profile.min, profile.max) == (-3, 4)
+    assert profile.mean == pytest.approx(statistics.mean(numbers))
+    assert profile.variance == pytest.approx(statistics.variance(numbers))
+    assert profile.stdev == pytest.approx(statistics.stdev(numbers))
+    assert profile.distinct == 4
+    assert profile.top[0] == (4, 2)
+
+    text = ColumnProfiler()
+    text.update(["b", "a", 3, [1]])
+
+    assert (text.profile().min, text.profile().max) == ("[1]", "b")
+    assert text.profile().mean == 3
+    assert text.profile().variance is None
+
+
+def test_csv_reader_profile(tmp_path):
+
+    path_obj = get_tmp_path_obj(tmp_path)
+
+    with open(path_obj, "w") as fh:
+        fh.write("id,name,score\n")
+
+        for i in range(1000):
+            fh.write(f"{i},name {i % 7},{'' if i % 10 == 0 else i % 50}\n")
+
+    reader = CSVReader(path_obj, lazy=True, schema={"id": "int"})
+    profile = reader.profile(chunk_size=128)
+
+    assert reader._rows == []
+    assert profile["id"].mean == pytest.approx(499.5)
+    assert profile["id"].variance == pytest.approx(
+        statistics.variance(range(1000))
+    )
+    assert (profile["id"].min, profile["id"].max) == (0, 999)
+    assert abs(profile["name"].distinct - 7) <= 1
+    assert profile["name"].numeric == 0
+    assert profile["name"].top[0] == ("name 0", 143)
+    assert profile["score"].empty == 100
+    assert abs(profile["score"].distinct - 45) <= 2
+
+    eager = CSVReader(path_obj, schema={"id": "int"})
+
+    assert eager.profile(["id", "score"]) == reader.profile(["id", "score"])
+
+    with pytest.raises(ValueError):
+        reader.profile(["missing"])
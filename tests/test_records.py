@@ -0,0 +1,93 @@
+# MIT License
+#
+# csvio: A library for conveniently processing CSV files.
+#
+# Copyright (c) 2021 Salman Raza <raza.salman@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import pickle
+
+from csvio.csvreader import CSVReader
+from csvio.csvwriter import CSVWriter
+from csvio.processors import FieldProcessor, RowProcessor
+from csvio.records import Record, record_class
+
+from .csv_contents_generator import get_tmp_path_obj
+from .csv_data import get_csv_reader_writer, test_columns, test_rows
+
+
+def test_record():
+
+    Row = record_class(("a", "b"))
+    row = Row._make(["1", "2"])
+
+    assert record_class(("a", "b")) is Row
+    assert isinstance(row, Record)
+    assert row["a"] == "1"
+    assert row[1] == "2"
+    assert row.get("c", "3") == "3"
+    assert dict(row) == {"a": "1", "b": "2"}
+    assert row.replace(b="4").as_dict() == {"a": "1", "b": "4"}
+    assert pickle.loads(pickle.dumps(row)) == row
+
+
+def test_compact_rows_csv_reader(tmp_path):
+
+    _, reader = get_csv_reader_writer(tmp_path, {"compact_rows": True})
+
+    assert all(isinstance(row, Record) for row in reader.rows)
+    assert [row.as_dict() for row in reader.rows] == test_rows
+    assert [
+        row.as_dict() for row in reader.rows_from_column_key("Origin")["Italy"]
+    ] == [row for row in test_rows if row["Origin"] == "Italy"]
+
+
+def test_compact_rows_processors(tmp_path):
+
+    field_proc = FieldProcessor("field_proc")
+    field_proc.add_processor("Quantity", int)
+
+    row_proc = RowProcessor("row_proc")
+    row_proc.add_processor(lambda row: {**row, "Fruit": row["Fruit"].upper()})
+
+    _, reader = get_csv_reader_writer(
+        tmp_path,
+        {"compact_rows": True, "processors": [field_proc, row_proc]},
+    )
+
+    assert isinstance(reader.rows[0], Record)
+    assert reader.rows[0].as_dict() == {
+        "Supplier": "Big Apples",
+        "Fruit": "APPLE",
+        "Origin": "Spain",
+        "Quantity": 1,
+    }
+
+
+def test_compact_rows_csv_writer(tmp_path):
+
+    Row = record_class(tuple(test_columns))
+    path_obj = get_tmp_path_obj(tmp_path)
+
+    writer = CSVWriter(path_obj, fieldnames=test_columns)
+    writer.add_rows(Row.from_mapping(test_rows[0]))
+    writer.add_rows([Row.from_mapping(row) for row in test_rows[1:]])
+    writer.flush()
+
+    assert CSVReader(path_obj).rows == test_rows
@@ -0,0 +1,128 @@
+# MIT License
+#
+# csvio: A library for conveniently processing CSV files.
+#
+# Copyright (c) 2021 Salman Raza <raza.salman@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+from csvio.csvreader import CSVReader
+from csvio.errors import CellError, SchemaError
+from csvio.schema import Schema, infer_type
+
+from .csv_contents_generator import get_tmp_path_obj
+
+csv_data = """id,code,price,total,active,day,stamp,name
+1,007,1.5,12345678901234567.25,true,2021-01-31,2021-01-31 10:00:00,a
+2,010,2.25,1.10,False,2021-02-28,2021-02-28 11:30:00,b
+3,,,,,,,c
+"""
+
+
+def test_infer_type():
+
+    assert infer_type(["1", "-2", ""]) == ("int", None)
+    assert infer_type(["007", "1"]) == ("str", None)
+    assert infer_type(["1.5", "2e3"]) == ("float", None)
+    assert infer_type(["0.12345678901234567"]) == ("decimal", None)
+    assert infer_type(["yes", "No"]) == ("bool", None)
+    assert infer_type(["2021-01-31"]) == ("date", "iso")
+    assert infer_type(["31/01/2021", "28/02/2021"]) == ("date", "%d/%m/%Y")
+    assert infer_type(["2021-01-31T10:00:00"]) == ("datetime", "iso")
+    assert infer_type(["", ""]) == ("str", None)
+
+
+def test_schema_infer(tmp_path):
+
+    path_obj = get_tmp_path_obj(tmp_path)
+    path_obj.write_text(csv_data)
+
+    reader = CSVReader(path_obj, schema="infer")
+
+    assert reader.schema.types == {
+        "id": "int",
+        "code": "str",
+        "price": "float",
+        "total": "decimal",
+        "active": "bool",
+        "day": "date",
+        "stamp": "datetime",
+        "name": "str",
+    }
+    assert reader.rows[0] == {
+        "id": 1,
+        "code": "007",
+        "price": 1.5,
+        "total": Decimal("12345678901234567.25"),
+        "active": True,
+        "day": date(2021, 1, 31),
+        "stamp": datetime(2021, 1, 31, 10),
+        "name": "a",
+    }
+    assert reader.rows[1]["active"] is False
+    assert reader.rows[2] == {
+        "id": 3,
+        "code": "",
+        "price": None,
+        "total": None,
+        "active": None,
+        "day": None,
+        "stamp": None,
+        "name": "c",
+    }
+
+
+def test_schema_errors(tmp_path):
+
+    path_obj = get_tmp_path_obj(tmp_path)
+    path_obj.write_text("a,b\n1,x\ny,2\n3,4\n")
+
+    with pytest.raises(SchemaError) as exc_info:
+        CSVReader(path_obj, schema={"a": "int", "b": "int"})
+
+    assert exc_info.value.cell_errors == [CellError(2, "a", "y", "int")]
+
+    schema = Schema({"a": "int", "b": "int"}, on_error="null")
+    reader = CSVReader(path_obj, schema=schema, columns=["b", "a"])
+
+    assert reader.rows == [
+        {"b": None, "a": 1},
+        {"b": 2, "a": None},
+        {"b": 4, "a": 3},
+    ]
+    assert schema.error_count == 2
+    assert schema.errors == [
+        CellError(1, "b", "x", "int"),
+        CellError(2, "a", "y", "int"),
+    ]
+
+
+def test_schema_formats(tmp_path):
+
+    path_obj = get_tmp_path_obj(tmp_path)
+    path_obj.write_text("day\n31/01/2021\n")
+
+    reader = CSVReader(path_obj, schema={"day": "date:%d/%m/%Y"})
+
+    assert reader.rows == [{"day": date(2021, 1, 31)}]
+    assert reader.schema.type_specs() == {"day": "date:%d/%m/%Y"}
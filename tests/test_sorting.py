@@ -0,0 +1,197 @@
+# MIT License
+#
+# csvio: A library for conveniently processing CSV files.
+#
+# Copyright (c) 2021 Salman Raza <raza.salman@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import csv
+import gzip
+import os
+import random
+
+import pytest
+
+from csvio import CSVReader, CSVWriter, sort_csv
+from csvio.processors import FieldProcessor
+
+FIELDNAMES = ["id", "name", "amount"]
+
+
+def write_rows(path, rows, fieldnames=FIELDNAMES):
+
+    writer = CSVWriter(str(path), fieldnames=fieldnames)
+    writer.add_rows(rows)
+    writer.flush()
+
+
+def shuffled_rows(num_rows):
+
+    rows = [
+        {
+            "id": str(i),
+            "name": f"name {i % 7}",
+            "amount": str(i % 13) if i % 5 else "",
+        }
+        for i in range(num_rows)
+    ]
+    random.Random(7).shuffle(rows)
+
+    return rows
+
+
+def typed_key(row):
+
+    amount = row["amount"]
+
+    return (amount != "", int(amount) if amount else 0)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_sort_csv_spills_runs(tmp_path, workers):
+
+    rows = shuffled_rows(3000)
+    input, output = tmp_path / "input.csv", tmp_path / "output.csv"
+    write_rows(input, rows)
+
+    tmp_dir = tmp_path / "runs"
+    tmp_dir.mkdir()
+
+    result = sort_csv(
+        str(input),
+        str(output),
+        key=["amount", "name"],
+        memory_limit=50000,
+        tmp_dir=str(tmp_dir),
+        workers=workers,
+        merge_width=3,
+    )
+
+    expected = sorted(rows, key=lambda row: (typed_key(row), row["name"]))
+
+    assert result.rows == 3000
+    assert result.runs > 3
+    assert CSVReader(str(output)).rows == expected
+    assert os.listdir(tmp_dir) == []
+
+
+def test_sort_csv_in_memory(tmp_path):
+
+    rows = shuffled_rows(200)
+    input, output = tmp_path / "input.csv", tmp_path / "output.csv"
+    write_rows(input, rows)
+
+    result = sort_csv(str(input), str(output), key=["amount"], reverse=True)
+
+    assert result == (200, 1)
+    assert CSVReader(str(output)).rows == sorted(
+        rows, key=typed_key, reverse=True
+    )
+
+    sort_csv(str(input), str(output), key=["amount"], typed=False)
+
+    assert CSVReader(str(output)).rows == sorted(
+        rows, key=lambda row: row["amount"]
+    )
+
+
+def test_sort_csv_stable_and_quoted(tmp_path):
+
+    rows = [
+        {"id": str(i), "name": f"line {i % 3}\nnext, line", "amount": "1"}
+        for i in range(100)
+    ]
+    input, output = tmp_path / "input.csv", tmp_path / "output.csv"
+    write_rows(input, rows)
+
+    sort_csv(str(input), str(output), key=["name"], memory_limit=2000)
+
+    assert CSVReader(str(output)).rows == sorted(
+        rows, key=lambda row: row["name"]
+    )
+
+
+def test_sort_csv_mixed_and_processed(tmp_path):
+
+    rows = [
+        {"id": "1", "name": "b", "amount": "10"},
+        {"id": "2", "name": "a", "amount": "n/a"},
+        {"id": "3", "name": "c", "amount": "9.5"},
+        {"id": "4", "name": "d", "amount": "10"},
+    ]
+    input, output = tmp_path / "input.csv", tmp_path / "output.csv"
+    write_rows(input, rows)
+
+    sort_csv(str(input), str(output), key=["amount"])
+
+    assert [row["id"] for row in CSVReader(str(output)).rows] == [
+        "1",
+        "4",
+        "3",
+        "2",
+    ]
+
+    rows[1]["amount"] = ""
+    write_rows(input, rows)
+    sort_csv(str(input), str(output), key=["amount"])
+
+    assert [row["id"] for row in CSVReader(str(output)).rows] == [
+        "2",
+        "3",
+        "1",
+        "4",
+    ]
+
+    upper = FieldProcessor("sort_upper")
+    upper.add_processor("name", str.upper)
+
+    sort_csv(
+        str(input),
+        str(output),
+        key=["name"],
+        reader_kwargs={
+            "processors": [upper],
+            "columns": ["id", "name"],
+            "where": lambda row: row["id"] != "3",
+        },
+        writer_kwargs={"compression": "gzip"},
+    )
+
+    with gzip.open(output, "rt", newline="") as fh:
+        assert list(csv.reader(fh)) == [
+            ["id", "name"],
+            ["2", "A"],
+            ["1", "B"],
+            ["4", "D"],
+        ]
+
+
+def test_sort_csv_empty_and_errors(tmp_path):
+
+    input, output = tmp_path / "input.csv", tmp_path / "output.csv"
+    CSVWriter(str(input), fieldnames=FIELDNAMES).write_blank_csv()
+
+    assert sort_csv(str(input), str(output), key=["id"]) == (0, 0)
+    assert output.read_text().splitlines() == [",".join(FIELDNAMES)]
+
+    with pytest.raises(ValueError):
+        sort_csv(str(input), str(output), key=["missing"])
+
+    with pytest.raises(ValueError):
+        sort_csv(str(input), str(output), key=["id"], memory_limit=0)